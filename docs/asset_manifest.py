@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Asset manifest verifier for the Flutter app.
+
+Compares three views of the bundled assets:
+  - the files actually under assets/ (walked once, with sizes)
+  - the asset and font declarations in pubspec.yaml
+  - the asset paths used as string literals in lib/
+
+and reports missing (declared or referenced but absent), undeclared (on disk
+or referenced but not bundled) and unreferenced (bundled but never used)
+assets, per-directory byte totals, and byte budgets per category (the first
+directory under assets/). Missing assets and budget overruns fail the check.
+
+Example:
+    python asset_manifest.py --budget logo=512KB --budget intro=1MB --max-file-size 1MB
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from dart_index import strip_comments, walk_dart_files
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+STRING_LITERAL_PATTERN = re.compile(r'''r?(?:'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")''')
+INTERPOLATION_PATTERN = re.compile(r'\$\{[^}]*\}|\$[A-Za-z_]\w*')
+SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*$', re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+# Resolution-aware variant directory right above the file (logo/2.0x/logo.png)
+VARIANT_PATTERN = re.compile(r'/\d+(?:\.\d+)?x/(?=[^/]+$)')
+
+
+def parse_size(text: str) -> int:
+    """Parse '512KB', '1.5M' or '2048' into bytes (binary units)"""
+    match = SIZE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f"{size:,} B" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
+
+
+def _strip_yaml_comment(line: str) -> str:
+    quote = None
+    for i, ch in enumerate(line):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '\'"':
+            quote = ch
+        elif ch == '#' and (i == 0 or line[i - 1] in ' \t'):
+            return line[:i].rstrip()
+    return line.rstrip()
+
+
+def _yaml_scalar(text: str):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '\'"':
+        return text[1:-1]
+    if text.startswith('[') and text.endswith(']'):
+        return [_yaml_scalar(item) for item in text[1:-1].split(',') if item.strip()]
+    return text
+
+
+def _is_sequence_item(text: str) -> bool:
+    return text == '-' or text.startswith('- ')
+
+
+def _parse_yaml_block(lines: List[list], i: int, indent: int):
+    if _is_sequence_item(lines[i][1]):
+        items = []
+        while i < len(lines) and lines[i][0] == indent and _is_sequence_item(lines[i][1]):
+            rest = lines[i][1][1:].strip()
+            if not rest:
+                i += 1
+                value = None
+                if i < len(lines) and lines[i][0] > indent:
+                    value, i = _parse_yaml_block(lines, i, lines[i][0])
+            elif re.match(r'^[^\'"\[{][^:]*:(\s|$)', rest):
+                # "- key: value" opens a mapping at the column of "key"
+                lines[i] = [indent + len(lines[i][1]) - len(rest), rest]
+                value, i = _parse_yaml_block(lines, i, lines[i][0])
+            else:
+                value, i = _yaml_scalar(rest), i + 1
+            items.append(value)
+        return items, i
+
+    mapping = {}
+    while i < len(lines) and lines[i][0] == indent and not _is_sequence_item(lines[i][1]):
+        key, _, rest = lines[i][1].partition(':')
+        rest = rest.strip()
+        i += 1
+        if rest[:1] in ('|', '>'):
+            block = []
+            while i < len(lines) and lines[i][0] > indent:
+                block.append(lines[i][1])
+                i += 1
+            value = '\n'.join(block)
+        elif rest:
+            value = _yaml_scalar(rest)
+        elif i < len(lines) and (lines[i][0] > indent
+                                 or (lines[i][0] == indent and _is_sequence_item(lines[i][1]))):
+            value, i = _parse_yaml_block(lines, i, lines[i][0])
+        else:
+            value = None
+        mapping[_yaml_scalar(key)] = value
+    return mapping, i
+
+
+def load_yaml_subset(text: str) -> dict:
+    """
+    Parse the block-style YAML subset used by pubspec.yaml
+
+    Handles nested mappings, block sequences (of scalars or mappings),
+    quoted scalars, flow lists and comments. Used when PyYAML is missing.
+    """
+    lines = []
+    for raw in text.splitlines():
+        line = _strip_yaml_comment(raw.replace('\t', '    '))
+        if line.strip() and line.strip() != '---':
+            lines.append([len(line) - len(line.lstrip()), line.strip()])
+    if not lines:
+        return {}
+    value, _ = _parse_yaml_block(lines, 0, lines[0][0])
+    return value if isinstance(value, dict) else {}
+
+
+def load_pubspec(path: Path) -> dict:
+    text = path.read_text(encoding='utf-8')
+    if yaml is not None:
+        return yaml.safe_load(text) or {}
+    return load_yaml_subset(text)
+
+
+class AssetReference(NamedTuple):
+    pattern: str  # path relative to the project, '*' for interpolations
+    source: str  # "lib/file.dart:line" or a pubspec.yaml key path
+
+
+def scan_asset_references(lib_dir: Path, assets_prefix: str = 'assets/'
+                          ) -> Tuple[List[AssetReference], List[Tuple[str, str]]]:
+    """
+    Collect asset paths and quoted identifiers used in Dart sources
+
+    Returns:
+        (asset path references, every other short string literal with its
+        source), the latter used to tell whether a font family is used
+    """
+    references, literals = [], []
+    for file_path, _ in walk_dart_files(lib_dir):
+        code = strip_comments(file_path.read_text(encoding='utf-8', errors='replace'))
+        rel = file_path.relative_to(lib_dir.parent).as_posix()
+        for match in STRING_LITERAL_PATTERN.finditer(code):
+            literal = match.group().lstrip('r')[1:-1]
+            source = f"{rel}:{code.count(chr(10), 0, match.start()) + 1}"
+            if assets_prefix in literal:
+                pattern = literal[literal.index(assets_prefix):]
+                references.append(AssetReference(INTERPOLATION_PATTERN.sub('*', pattern), source))
+            elif literal and len(literal) <= 64:
+                literals.append((literal, source))
+    return references, literals
+
+
+def _config_references(value, assets_prefix: str, where: str) -> List[AssetReference]:
+    """Asset paths among the scalar values of parsed YAML, with their key path"""
+    if isinstance(value, dict):
+        return [reference for key, item in value.items()
+                for reference in _config_references(item, assets_prefix, f"{where}:{key}")]
+    if isinstance(value, list):
+        return [reference for i, item in enumerate(value)
+                for reference in _config_references(item, assets_prefix, f"{where}[{i}]")]
+    if isinstance(value, str) and value.startswith(assets_prefix):
+        return [AssetReference(value, where)]
+    return []
+
+
+class AssetManifest:
+    """Files under assets/, pubspec declarations and lib/ usage, cross-checked"""
+
+    def __init__(self, project_dir: Path = PROJECT_DIR, assets_dir: str = 'assets'):
+        self.project_dir = Path(project_dir)
+        self.assets_dir = assets_dir
+        self.files: Dict[str, int] = {}  # project-relative path -> bytes
+        self.declared_dirs: List[str] = []
+        self.declared_files: List[str] = []
+        self.fonts: Dict[str, List[str]] = {}  # family -> font files
+        self.references: List[AssetReference] = []
+        self.used_families: Dict[str, str] = {}  # family -> first use
+
+    def load(self) -> "AssetManifest":
+        root = self.project_dir / self.assets_dir
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file():
+                    rel = Path(entry.path).relative_to(self.project_dir).as_posix()
+                    self.files[rel] = entry.stat().st_size
+
+        pubspec = load_pubspec(self.project_dir / 'pubspec.yaml')
+        flutter = pubspec.get('flutter') or {}
+        for entry in flutter.get('assets') or []:
+            # Flutter 3.19+ also accepts {"path": ..., "flavors": [...]}
+            path = entry.get('path') if isinstance(entry, dict) else entry
+            if path:
+                (self.declared_dirs if path.endswith('/') else self.declared_files).append(path)
+        for family in flutter.get('fonts') or []:
+            self.fonts[family.get('family', '')] = [font['asset'] for font in family.get('fonts') or []
+                                                   if isinstance(font, dict) and font.get('asset')]
+
+        self.references, literals = scan_asset_references(self.project_dir / 'lib', self.assets_dir + '/')
+        # Build tooling (launcher icons, native splash) reads assets straight from pubspec.yaml
+        self.references.extend(_config_references(
+            {key: value for key, value in pubspec.items() if key != 'flutter'},
+            self.assets_dir + '/', 'pubspec.yaml'))
+        for literal, source in literals:
+            if literal in self.fonts:
+                self.used_families.setdefault(literal, source)
+        return self
+
+    def is_declared(self, path: str) -> bool:
+        """Bundled by pubspec: listed, in a listed directory (not recursive), or a font"""
+        if path in self.declared_files:
+            return True
+        if any(path in fonts for fonts in self.fonts.values()):
+            return True
+        parent = path.rsplit('/', 1)[0] + '/'
+        # Resolution-aware variants ride on their base directory
+        base = VARIANT_PATTERN.sub('/', path).rsplit('/', 1)[0] + '/'
+        return parent in self.declared_dirs or base in self.declared_dirs
+
+    def _reference_matches(self, reference: AssetReference) -> List[str]:
+        pattern = reference.pattern.rstrip('/')
+        if '*' in pattern:
+            return [path for path in self.files if fnmatch.fnmatchcase(path, pattern)]
+        if pattern in self.files:
+            return [pattern]
+        # A directory reference such as the translations path covers its files
+        return [path for path in self.files if path.startswith(pattern + '/')]
+
+    def referenced_files(self) -> Dict[str, str]:
+        """Asset file -> first lib/ location that uses it"""
+        used: Dict[str, str] = {}
+        for reference in self.references:
+            for path in self._reference_matches(reference):
+                used.setdefault(path, reference.source)
+        for family, source in self.used_families.items():
+            for path in self.fonts[family]:
+                used.setdefault(path, source)
+        # Flutter picks resolution variants through the base asset path
+        for path in self.files:
+            base = VARIANT_PATTERN.sub('/', path)
+            if base != path and base in used:
+                used.setdefault(path, used[base])
+        return used
+
+    def missing(self) -> List[Tuple[str, str]]:
+        """(path, why) for declarations and references that point at nothing"""
+        problems = []
+        for path in self.declared_files:
+            if path not in self.files:
+                problems.append((path, 'declared in pubspec.yaml'))
+        for path in self.declared_dirs:
+            if not any(file.startswith(path) for file in self.files):
+                problems.append((path, 'declared directory is empty or absent'))
+        for family, fonts in self.fonts.items():
+            for path in fonts:
+                if path not in self.files:
+                    problems.append((path, f'font {family} in pubspec.yaml'))
+        for reference in self.references:
+            if not self._reference_matches(reference):
+                problems.append((reference.pattern, f'referenced at {reference.source}'))
+        return problems
+
+    def undeclared(self) -> List[Tuple[str, str]]:
+        """(path, why) for files or references that pubspec.yaml does not bundle"""
+        problems = [(path, 'on disk') for path in self.files if not self.is_declared(path)]
+        seen = {path for path, _ in problems}
+        for reference in self.references:
+            for path in self._reference_matches(reference):
+                if path not in seen and not self.is_declared(path):
+                    problems.append((path, f'referenced at {reference.source}'))
+                    seen.add(path)
+        return problems
+
+    def unreferenced(self) -> List[str]:
+        """Bundled files that nothing in lib/ uses"""
+        used = self.referenced_files()
+        return [path for path in sorted(self.files) if self.is_declared(path) and path not in used]
+
+    def category(self, path: str) -> str:
+        parts = path.split('/')
+        return parts[1] if len(parts) > 2 else '(root)'
+
+    def totals(self, key) -> Dict[str, Tuple[int, int]]:
+        """Group -> (file count, bytes), largest first"""
+        totals: Dict[str, List[int]] = {}
+        for path, size in self.files.items():
+            entry = totals.setdefault(key(path), [0, 0])
+            entry[0] += 1
+            entry[1] += size
+        return {k: tuple(v) for k, v in sorted(totals.items(), key=lambda item: -item[1][1])}
+
+    def check_budgets(self, budgets: Dict[str, int], max_file_size: Optional[int]) -> List[str]:
+        """Messages for every category or file over its byte budget"""
+        failures = []
+        by_category = self.totals(self.category)
+        for category, limit in budgets.items():
+            size = sum(self.files.values()) if category == 'total' else by_category.get(category, (0, 0))[1]
+            if size > limit:
+                failures.append(f"{category}: {format_size(size)} exceeds budget {format_size(limit)}")
+        if max_file_size is not None:
+            for path, size in sorted(self.files.items(), key=lambda item: -item[1]):
+                if size > max_file_size:
+                    failures.append(f"{path}: {format_size(size)} exceeds per-file limit "
+                                    f"{format_size(max_file_size)}")
+        return failures
+
+
+def _parse_budget(text: str) -> Tuple[str, int]:
+    category, sep, size = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected CATEGORY=SIZE, got {text!r}")
+    try:
+        return category.strip(), parse_size(size)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify assets/ against pubspec.yaml and lib/ usage")
+    parser.add_argument('project', nargs='?', default=str(PROJECT_DIR), help="Flutter project directory")
+    parser.add_argument('--budget', action='append', type=_parse_budget, default=[],
+                        metavar='CATEGORY=SIZE',
+                        help="Byte budget for a directory under assets/ ('total' for all), e.g. logo=512KB")
+    parser.add_argument('--max-file-size', type=parse_size, default=None, help="Per-file byte limit")
+    parser.add_argument('--strict', action='store_true',
+                        help="Also fail on undeclared and unreferenced assets")
+    parser.add_argument('--report', help="Write the findings to this JSON file")
+    args = parser.parse_args()
+
+    manifest = AssetManifest(Path(args.project)).load()
+    missing, undeclared, unreferenced = manifest.missing(), manifest.undeclared(), manifest.unreferenced()
+    failures = manifest.check_budgets(dict(args.budget), args.max_file_size)
+
+    print("📦 Asset manifest check")
+    print("=" * 50)
+    print(f"{len(manifest.files)} files, {format_size(sum(manifest.files.values()))} under "
+          f"{manifest.assets_dir}/; {len(manifest.declared_dirs)} directories, "
+          f"{len(manifest.declared_files)} files and {len(manifest.fonts)} font families declared")
+
+    print("\n📁 Per-directory totals:")
+    for directory, (count, size) in manifest.totals(lambda path: path.rsplit('/', 1)[0]).items():
+        print(f"  {directory + '/':<30} {count:>4} files {format_size(size):>12}")
+
+    sections = [
+        ("✗ Missing", [f"{path} ({why})" for path, why in missing]),
+        ("⚠️  Undeclared", [f"{path} ({why})" for path, why in undeclared]),
+        ("⚠️  Unreferenced", [f"{path} ({format_size(manifest.files[path])})" for path in unreferenced]),
+        ("✗ Over budget", failures),
+    ]
+    for title, lines in sections:
+        print(f"\n{title}: {len(lines)}")
+        for line in lines:
+            print(f"  - {line}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'files': manifest.files,
+                'missing': [{'path': p, 'reason': why} for p, why in missing],
+                'undeclared': [{'path': p, 'reason': why} for p, why in undeclared],
+                'unreferenced': unreferenced,
+                'budget_failures': failures,
+                'categories': {k: {'files': c, 'bytes': s}
+                               for k, (c, s) in manifest.totals(manifest.category).items()},
+            }, f, indent=2)
+
+    failed = bool(missing or failures or (args.strict and (undeclared or unreferenced)))
+    print(f"\n{'✗ Asset check failed' if failed else '🎉 Asset check passed'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Build every docs chart in one command.
+
+Discovers the chart scripts (chart_script*.py under docs/), runs them in a
+process pool and exports their figures through one warm image export
+engine per worker instead of a cold engine per script. The scripts stay
+runnable on their own: while a script runs here, Figure.write_image (and
+Diagram.write_image of the plotly-free svg_diagram backend) only records
+the figure and its target, and the runner does the export once the script
+is done. Diagrams render themselves, so they never need plotly or the
+export engine.
+
+Exports go through a content-addressed render cache keyed by the figure
+spec (canonical JSON), the export options and the renderer versions: an
+output that already holds the cached render is skipped, a missing or stale
+one is restored from the cache, and only changed figures are rendered. The
+export engine starts on the first real render, so a no-op build never
+launches a browser.
+
+Example:
+    python chart_build.py               # build and export everything
+    python chart_build.py --dry-run     # build figures only, no export engine
+    python chart_build.py compnent/chart_script.py --workers 1
+    python chart_build.py --force       # re-render even unchanged figures
+    python chart_build.py --formats png,png@2x,png@3x,svg,html
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from svg_diagram import Diagram
+
+DOCS_DIR = Path(__file__).resolve().parent
+CHART_GLOB = 'chart_script*.py'
+DEFAULT_CACHE_DIR = DOCS_DIR / '.chart-cache'
+
+# Bump to invalidate every cached render after a change to the export path
+CACHE_VERSION = 1
+
+
+class CapturedFigure(NamedTuple):
+    figure: object  # plotly.graph_objects.Figure or svg_diagram.Diagram
+    path: Path  # absolute output path
+    options: dict  # remaining write_image keyword arguments (scale, width, ...)
+
+
+class ChartOutput(NamedTuple):
+    path: str
+    status: str  # "hit", "restored", "rendered" or "built" (dry run)
+    render_s: float
+
+
+class ChartResult(NamedTuple):
+    script: str
+    outputs: List[ChartOutput]
+    build_s: float
+    export_s: float
+    error: Optional[str]
+    log: str
+
+
+def discover_chart_scripts(root: Path = DOCS_DIR) -> List[Path]:
+    """Chart scripts in the subdirectories of root, in a stable order"""
+    return sorted(path for path in root.glob(f'*/{CHART_GLOB}') if path.is_file())
+
+
+@contextlib.contextmanager
+def capture_write_image() -> Iterator[List[CapturedFigure]]:
+    """
+    Make Figure.write_image and Diagram.write_image record instead of render
+
+    Relative output paths are resolved against the current directory at
+    the time of the call, exactly where the script would have written.
+    Without plotly installed only diagrams are captured.
+    """
+    try:
+        from plotly.basedatatypes import BaseFigure
+    except ImportError:
+        BaseFigure = None
+
+    captured: List[CapturedFigure] = []
+    classes = [cls for cls in (BaseFigure, Diagram) if cls is not None]
+    originals = [cls.write_image for cls in classes]
+
+    def record(fig, file, *args, **kwargs):
+        if args:
+            kwargs.update(zip(('format', 'scale', 'width', 'height', 'validate', 'engine'), args))
+        captured.append(CapturedFigure(fig, Path(file).resolve(), kwargs))
+
+    for cls in classes:
+        cls.write_image = record
+    try:
+        yield captured
+    finally:
+        for cls, original in zip(classes, originals):
+            cls.write_image = original
+
+
+def build_figures(script: Path) -> List[CapturedFigure]:
+    """Run a chart script from its own directory and return the figures it writes"""
+    cwd = os.getcwd()
+    os.chdir(script.parent)
+    try:
+        with capture_write_image() as captured:
+            runpy.run_path(str(script), run_name='__main__')
+    finally:
+        os.chdir(cwd)
+    return captured
+
+
+def check_export_engine():
+    """
+    Fail fast when Kaleido 1.x has no browser to render with
+
+    Its sync server runs in a background thread and would otherwise wait
+    forever for a browser that never starts. The lookup is best effort:
+    when it cannot be performed the export is simply attempted.
+    """
+    try:
+        from choreographer.browsers.chromium import Chromium
+        found = Chromium.find_browser(skip_local=False)
+    except (ImportError, AttributeError, TypeError):
+        return
+    if found is None:
+        raise RuntimeError("No Chrome/Chromium found for image export; "
+                           "run plotly_get_chrome or build with --dry-run")
+
+
+_engine_started = False
+
+
+def start_export_engine():
+    """
+    Start the image export engine of this process once
+
+    With Kaleido 1.x every plotly export otherwise launches and tears down
+    its own headless browser; the sync server keeps one open and plotly
+    routes all exports through it. Older Kaleido keeps its own subprocess
+    alive after the first export, so nothing needs starting.
+    """
+    global _engine_started
+    if _engine_started:
+        return
+    check_export_engine()
+    _engine_started = True
+    try:
+        import kaleido
+    except ImportError:
+        return
+    if hasattr(kaleido, 'start_sync_server'):
+        kaleido.start_sync_server(silence_warnings=True)
+
+
+def renderer_version() -> str:
+    """Versions of everything that affects the rendered bytes"""
+    from importlib import metadata
+
+    versions = [f"cache={CACHE_VERSION}", f"diagram={Diagram.VERSION}"]
+    for package in ('plotly', 'kaleido', 'Pillow'):
+        try:
+            versions.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}=none")
+    return ';'.join(versions)
+
+
+def _atomic_write(path: Path, data: bytes):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ExportTarget(NamedTuple):
+    format: str  # "png", "jpeg", "webp", "svg", "pdf" or "html"
+    scale: Optional[float]  # None: whatever the chart script asked for
+
+    @property
+    def label(self) -> str:
+        return self.format if self.scale is None else f"{self.format}@{self.scale:g}x"
+
+
+VECTOR_FORMATS = ('svg', 'pdf', 'html')
+
+# What a plain run produces: each figure exactly as its script writes it
+SCRIPT_TARGETS = (ExportTarget('', None),)
+
+
+def parse_targets(text: str) -> List[ExportTarget]:
+    """Parse 'png,png@2x,png@3x,svg,html' into export targets"""
+    targets = []
+    for item in text.split(','):
+        fmt, _, scale = item.strip().lower().partition('@')
+        if not fmt:
+            continue
+        if fmt not in ('png', 'jpg', 'jpeg', 'webp', 'svg', 'pdf', 'html'):
+            raise ValueError(f"Unsupported export format: {fmt!r}")
+        targets.append(ExportTarget('jpeg' if fmt == 'jpg' else fmt,
+                                    float(scale.rstrip('x')) if scale else None))
+    return targets
+
+
+def export_format(captured: CapturedFigure, target: ExportTarget = SCRIPT_TARGETS[0]) -> str:
+    return (target.format or captured.options.get('format')
+            or captured.path.suffix.lstrip('.') or 'png').lower()
+
+
+def target_path(captured: CapturedFigure, target: ExportTarget) -> Path:
+    """Output file for a target: chart.png, chart@2x.png, chart.svg, chart.html, ..."""
+    fmt = export_format(captured, target)
+    suffix = captured.path.suffix if not target.format else f".{'jpg' if fmt == 'jpeg' else fmt}"
+    scale = f"@{target.scale:g}x" if target.scale not in (None, 1) else ''
+    return captured.path.with_name(f"{captured.path.stem}{scale}{suffix}")
+
+
+def target_options(captured: CapturedFigure, target: ExportTarget) -> dict:
+    """Export options for one target; the target's scale overrides the script's"""
+    options = {k: v for k, v in captured.options.items() if k not in ('format', 'engine', 'validate')}
+    if target.scale is not None:
+        options['scale'] = target.scale
+    if export_format(captured, target) in VECTOR_FORMATS:
+        # Scale means nothing here; dropping it lets all scales share one cache entry
+        options.pop('scale', None)
+    return options
+
+
+class RenderCache:
+    """
+    Rendered outputs stored by a hash of everything that determines them
+
+    Files are named <key>.<format> inside the cache directory. Keys cover
+    the figure spec as canonical JSON (sorted keys, so dict order cannot
+    cause a miss; hashed once per figure), the format and export options,
+    and renderer_version().
+    Entries are written atomically, so concurrent workers can share the
+    directory.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR):
+        self.directory = Path(directory)
+        self.renderer = renderer_version()
+
+    @staticmethod
+    def figure_key(spec: dict) -> str:
+        """Hash of the figure spec alone, shared by all of its outputs"""
+        canonical = json.dumps(spec, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def key(self, figure_key: str, fmt: str, options: dict) -> str:
+        payload = json.dumps({
+            'figure': figure_key,
+            'format': fmt,
+            'options': options,
+            'renderer': self.renderer,
+        }, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def entry(self, key: str, fmt: str) -> Path:
+        return self.directory / f"{key}.{fmt}"
+
+    def fetch(self, key: str, fmt: str, target: Path) -> Optional[str]:
+        """'hit' if target already holds the cached render, 'restored' if copied in, else None"""
+        entry = self.entry(key, fmt)
+        try:
+            cached = entry.read_bytes()
+        except OSError:
+            return None
+        try:
+            if target.stat().st_size == len(cached) and target.read_bytes() == cached:
+                return 'hit'
+        except OSError:
+            pass
+        _atomic_write(target, cached)
+        return 'restored'
+
+    def store(self, key: str, fmt: str, data: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.entry(key, fmt), data)
+
+
+def render_figure(spec: dict, fmt: str, options: dict, name: str = 'chart') -> bytes:
+    """
+    Render a serialized figure in one format
+
+    Images go through the warm export engine; HTML is written by plotly
+    itself (plotly.js from the CDN, a fixed div id so output is stable).
+    Diagram specs are drawn by svg_diagram, without plotly.
+    """
+    if 'diagram' in spec:
+        return Diagram.from_dict(spec).to_image(fmt, **options)
+
+    import plotly.io as pio
+
+    if fmt == 'html':
+        return pio.to_html(spec, include_plotlyjs='cdn', full_html=True, validate=False,
+                           div_id=re.sub(r'\W+', '-', name)).encode('utf-8')
+    start_export_engine()
+    return pio.to_image(spec, format=fmt, validate=False, **options)
+
+
+def export_figure(captured: CapturedFigure, targets: Sequence[ExportTarget] = SCRIPT_TARGETS,
+                  cache: Optional[RenderCache] = None, force: bool = False) -> List[ChartOutput]:
+    """
+    Write one captured figure in every target format, through the render cache
+
+    The figure is serialized and hashed once; every target reuses that
+    spec and the same export engine session.
+
+    Args:
+        captured: Figure and target recorded from a chart script
+        targets: Formats and scales to produce (default: what the script asked for)
+        cache: Render cache to consult and fill (None renders every time)
+        force: Render even when the cache has the output
+    """
+    if isinstance(captured.figure, Diagram):
+        spec = captured.figure.to_dict()
+    else:
+        spec = json.loads(captured.figure.to_json())
+    figure_key = cache.figure_key(spec) if cache is not None else None
+    outputs = []
+    for target in targets:
+        start = time.perf_counter()
+        fmt = export_format(captured, target)
+        path = target_path(captured, target)
+        options = target_options(captured, target)
+        key = cache.key(figure_key, fmt, options) if cache is not None else None
+        status = cache.fetch(key, fmt, path) if key is not None and not force else None
+        if status is None:
+            data = render_figure(spec, fmt, options, captured.path.stem)
+            _atomic_write(path, data)
+            if key is not None:
+                cache.store(key, fmt, data)
+            status = 'rendered'
+        outputs.append(ChartOutput(str(path), status, time.perf_counter() - start))
+    return outputs
+
+
+def _build_chart_script(args) -> ChartResult:
+    """Process-pool worker: build one script's figures and export them"""
+    script, dry_run, cache_dir, force, targets = args
+    targets = [ExportTarget(*target) for target in targets]
+    cache = RenderCache(Path(cache_dir)) if cache_dir else None
+    log = io.StringIO()
+    outputs: List[ChartOutput] = []
+    build_s = export_s = 0.0
+    error = None
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(log):
+            captured = build_figures(Path(script))
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for item in captured:
+            if dry_run:
+                outputs.extend(ChartOutput(str(target_path(item, target)), 'built', 0.0)
+                               for target in targets)
+            else:
+                outputs.extend(export_figure(item, targets, cache, force))
+        export_s = time.perf_counter() - start
+    except Exception:
+        error = traceback.format_exc(limit=-3)
+    return ChartResult(str(script), outputs, build_s, export_s, error, log.getvalue())
+
+
+def build_charts(scripts: Sequence[Path], workers: Optional[int] = None, dry_run: bool = False,
+                 cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, force: bool = False,
+                 targets: Sequence[ExportTarget] = SCRIPT_TARGETS) -> Iterator[ChartResult]:
+    """
+    Build and export the given chart scripts, yielding results in order
+
+    Args:
+        scripts: Chart scripts to run
+        workers: Process pool size; each worker starts at most one export
+            engine (default: CPU count, capped at the number of scripts)
+        dry_run: Build the figures but skip the export engine entirely
+        cache_dir: Render cache directory (None disables the cache)
+        force: Re-render every figure, refreshing the cache
+        targets: Formats and scales to export each figure in
+    """
+    jobs = [(str(script), dry_run, str(cache_dir) if cache_dir else None, force, list(map(tuple, targets)))
+            for script in scripts]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield _build_chart_script(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_build_chart_script, jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and export all docs charts")
+    parser.add_argument('scripts', nargs='*', help=f"Chart scripts (default: every docs/*/{CHART_GLOB})")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--dry-run', action='store_true', help="Build figures without exporting images")
+    parser.add_argument('--list', action='store_true', help="List the discovered scripts and exit")
+    parser.add_argument('--verbose', action='store_true', help="Show the scripts' own output")
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help="Render cache directory")
+    parser.add_argument('--no-cache', action='store_true', help="Render every figure, bypassing the cache")
+    parser.add_argument('--force', action='store_true', help="Re-render every figure and refresh the cache")
+    parser.add_argument('--formats', default=None,
+                        help="Export matrix, e.g. 'png,png@2x,png@3x,svg,html' "
+                             "(default: the format each script writes)")
+    args = parser.parse_args()
+    try:
+        targets = parse_targets(args.formats) if args.formats else list(SCRIPT_TARGETS)
+    except ValueError as e:
+        parser.error(str(e))
+
+    scripts = [Path(script).resolve() for script in args.scripts] or discover_chart_scripts()
+    if args.list:
+        for script in scripts:
+            print(script.relative_to(DOCS_DIR) if script.is_relative_to(DOCS_DIR) else script)
+        return
+
+    print(f"📊 Building {len(scripts)} chart scripts{' (dry run)' if args.dry_run else ''}")
+    start = time.perf_counter()
+    failed = 0
+    counts: Dict[str, int] = {}
+    render_s = 0.0
+    cache_dir = None if args.no_cache else Path(args.cache_dir)
+    for result in build_charts(scripts, args.workers, args.dry_run, cache_dir, args.force, targets):
+        name = os.path.relpath(result.script, DOCS_DIR)
+        if args.verbose and result.log:
+            print(result.log.rstrip())
+        if result.error:
+            failed += 1
+            print(f"✗ {name}\n{result.error}")
+            continue
+        print(f"✓ {name}: build {result.build_s:.2f}s, export {result.export_s:.2f}s")
+        for output in result.outputs:
+            counts[output.status] = counts.get(output.status, 0) + 1
+            if output.status == 'rendered':
+                render_s += output.render_s
+            print(f"    {output.status:<8} {output.render_s:>6.2f}s  {os.path.relpath(output.path, DOCS_DIR)}")
+
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"\n{'🎉' if not failed else '✗'} {len(scripts) - failed}/{len(scripts)} scripts built "
+          f"in {time.perf_counter() - start:.2f}s ({summary or 'no outputs'}; {render_s:.2f}s rendering)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
-import plotly.graph_objects as go
-import plotly.io as pio
+import sys
+from pathlib import Path
 
-# Create a structured architecture diagram using scatter plot with shapes
-fig = go.Figure()
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from svg_diagram import Diagram
+
+# Boxes, arrows and text only, so the lightweight SVG backend draws it
 
 # Define positions for different layers
 # Frontend Layer (top)
@@ -47,56 +49,22 @@ dataflow_components = [
     ("Real-time", 4.5, dataflow_y)
 ]
 
-# Add all components as scatter points
-all_components = frontend_components + integration_components + backend_components + dataflow_components
-
-# Frontend layer
-fig.add_trace(go.Scatter(
-    x=[comp[1] for comp in frontend_components],
-    y=[comp[2] for comp in frontend_components],
-    mode='markers+text',
-    text=[comp[0] for comp in frontend_components],
-    textposition='middle center',
-    marker=dict(size=60, color='#1FB8CD', symbol='square'),
-    name='Frontend',
-    showlegend=True
-))
-
-# Integration layer
-fig.add_trace(go.Scatter(
-    x=[comp[1] for comp in integration_components],
-    y=[comp[2] for comp in integration_components],
-    mode='markers+text',
-    text=[comp[0] for comp in integration_components],
-    textposition='middle center',
-    marker=dict(size=60, color='#FFC185', symbol='square'),
-    name='Integration',
-    showlegend=True
-))
-
-# Backend layer
-fig.add_trace(go.Scatter(
-    x=[comp[1] for comp in backend_components],
-    y=[comp[2] for comp in backend_components],
-    mode='markers+text',
-    text=[comp[0] for comp in backend_components],
-    textposition='middle center',
-    marker=dict(size=60, color='#ECEBD5', symbol='square'),
-    name='Backend',
-    showlegend=True
-))
+# Layers with their legend names and brand colors
+layers = [
+    ('Frontend', '#1FB8CD', frontend_components),
+    ('Integration', '#FFC185', integration_components),
+    ('Backend', '#ECEBD5', backend_components),
+    ('Data Flow', '#5D878F', dataflow_components),
+]
 
-# Data flow layer
-fig.add_trace(go.Scatter(
-    x=[comp[1] for comp in dataflow_components],
-    y=[comp[2] for comp in dataflow_components],
-    mode='markers+text',
-    text=[comp[0] for comp in dataflow_components],
-    textposition='middle center',
-    marker=dict(size=60, color='#5D878F', symbol='square'),
-    name='Data Flow',
-    showlegend=True
-))
+diagram = Diagram(
+    title="AI Tailoring Platform Architecture",
+    width=1000,
+    height=600,
+    x_range=(0, 7),
+    y_range=(0.5, 4.5),
+    font_size=11
+)
 
 # Add arrows showing data flow connections
 arrow_connections = [
@@ -118,42 +86,14 @@ arrow_connections = [
     (4, backend_y, 4.5, dataflow_y),    # ML Services -> Real-time
 ]
 
-# Add arrows as shapes
+# Arrows first so they run under the boxes; boxes are keyed by position
 for start_x, start_y, end_x, end_y in arrow_connections:
-    fig.add_shape(
-        type="line",
-        x0=start_x, y0=start_y-0.1,
-        x1=end_x, y1=end_y+0.1,
-        line=dict(color="#D2BA4C", width=2),
-    )
-    
-    # Add arrowhead
-    fig.add_shape(
-        type="circle",
-        x0=end_x-0.05, y0=end_y+0.05,
-        x1=end_x+0.05, y1=end_y+0.15,
-        fillcolor="#D2BA4C",
-        line=dict(color="#D2BA4C", width=1)
-    )
+    diagram.edge(f"{start_x},{start_y}", f"{end_x},{end_y}", color="#D2BA4C", width=2)
 
-# Update layout
-fig.update_layout(
-    title="AI Tailoring Platform Architecture",
-    xaxis=dict(
-        showgrid=False,
-        showticklabels=False,
-        zeroline=False,
-        range=[0, 7]
-    ),
-    yaxis=dict(
-        showgrid=False,
-        showticklabels=False,
-        zeroline=False,
-        range=[0.5, 4.5]
-    ),
-    plot_bgcolor='white',
-    legend=dict(orientation='h', yanchor='bottom', y=1.05, xanchor='center', x=0.5),
-    font=dict(size=10)
-)
+for name, color, components in layers:
+    diagram.legend(name, color)
+    for label, x, y in components:
+        diagram.node(x, y, label, shape='rect', width=112, height=50, radius=6, fill=color,
+                     text_color='white' if color == '#5D878F' else '#13343B', key=f"{x},{y}")
 
-fig.write_image("ai_tailoring_architecture.png")
\ No newline at end of file
+diagram.write_image("ai_tailoring_architecture.png", scale=2)
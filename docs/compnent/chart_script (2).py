@@ -2,87 +2,36 @@ import plotly.graph_objects as go
 import plotly.express as px
 import json
 import numpy as np
+import sys
+from pathlib import Path
 
-# Create comprehensive widget hierarchy based on user instructions
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dart_index import DartIndex
+from graph_layout import layered_layout
+from graph_render import aggregate, edge_trace as render_edges, node_trace as render_nodes
+from label_layout import Box, Label, place_labels, point_candidates, polyline_boxes
+from widget_tree import WidgetTree
+
+# Widget hierarchy extracted from lib/ (incremental: only changed files are re-parsed)
+tree = WidgetTree(DartIndex().build()).build()
 widgets = {
-    # Root Level
-    "MyApp": {"parent": None, "category": "App Root", "type": "MaterialApp", "level": 0},
-    "ThemeData": {"parent": "MyApp", "category": "App Root", "type": "Configuration", "level": 1},
-    "Routes": {"parent": "MyApp", "category": "App Root", "type": "Configuration", "level": 1},
-    
-    # Authentication Flow
-    "AuthWrapper": {"parent": "MyApp", "category": "Authentication", "type": "StatelessWidget", "level": 1},
-    "LoginScreen": {"parent": "AuthWrapper", "category": "Authentication", "type": "StatefulWidget", "level": 2},
-    "SignUpScreen": {"parent": "AuthWrapper", "category": "Authentication", "type": "StatefulWidget", "level": 2},
-    "ProfileSetupScreen": {"parent": "AuthWrapper", "category": "Authentication", "type": "StatefulWidget", "level": 2},
-    
-    # Main App Widgets
-    "HomeScreen": {"parent": "AuthWrapper", "category": "Main App", "type": "StatefulWidget", "level": 2},
-    "BottomNavigationBar": {"parent": "HomeScreen", "category": "Main App", "type": "Widget", "level": 3},
-    "AppDrawer": {"parent": "HomeScreen", "category": "Main App", "type": "Widget", "level": 3},
-    
-    # Design Studio Widgets
-    "DesignStudioScreen": {"parent": "HomeScreen", "category": "Design Studio", "type": "StatefulWidget", "level": 3},
-    "CustomPainter": {"parent": "DesignStudioScreen", "category": "Design Studio", "type": "Widget", "level": 4},
-    "ToolsPalette": {"parent": "DesignStudioScreen", "category": "Design Studio", "type": "Widget", "level": 4},
-    "ColorPicker": {"parent": "DesignStudioScreen", "category": "Design Studio", "type": "Widget", "level": 4},
-    "PatternLibrary": {"parent": "DesignStudioScreen", "category": "Design Studio", "type": "Widget", "level": 4},
-    
-    # Virtual Fitting Widgets
-    "VirtualFittingScreen": {"parent": "HomeScreen", "category": "Virtual Fitting", "type": "StatefulWidget", "level": 3},
-    "ARView": {"parent": "VirtualFittingScreen", "category": "Virtual Fitting", "type": "Widget", "level": 4},
-    "CameraPreview": {"parent": "VirtualFittingScreen", "category": "Virtual Fitting", "type": "Widget", "level": 4},
-    "DesignOverlay": {"parent": "VirtualFittingScreen", "category": "Virtual Fitting", "type": "Widget", "level": 4},
-    
-    # Order Management Widgets
-    "OrderSummaryScreen": {"parent": "HomeScreen", "category": "Order Management", "type": "StatefulWidget", "level": 3},
-    "PaymentScreen": {"parent": "OrderSummaryScreen", "category": "Order Management", "type": "StatefulWidget", "level": 4},
-    "OrderTrackingScreen": {"parent": "OrderSummaryScreen", "category": "Order Management", "type": "StatefulWidget", "level": 4},
-    
-    # Profile Widgets
-    "ProfileScreen": {"parent": "HomeScreen", "category": "Profile", "type": "StatefulWidget", "level": 3},
-    "SettingsScreen": {"parent": "ProfileScreen", "category": "Profile", "type": "StatefulWidget", "level": 4},
-    "MyDesignsScreen": {"parent": "ProfileScreen", "category": "Profile", "type": "StatefulWidget", "level": 4}
+    name: {"category": tree.category(name), "type": tree.role(name), "path": declaration.path}
+    for name, declaration in tree.widgets.items()
 }
 
-# Improved tree layout with better spacing
-def create_improved_tree_layout(widgets):
-    pos = {}
-    
-    # Group nodes by level
-    levels = {}
-    for widget_name, info in widgets.items():
-        level = info["level"]
-        if level not in levels:
-            levels[level] = []
-        levels[level].append(widget_name)
-    
-    # Calculate positions with improved spacing
-    y_spacing = 150  # Increased vertical spacing
-    max_level = max(levels.keys())
-    
-    for level, nodes in levels.items():
-        y = (max_level - level) * y_spacing
-        
-        # Better horizontal spacing calculation
-        if len(nodes) == 1:
-            x_positions = [0]
-        elif len(nodes) == 2:
-            x_positions = [-200, 200]
-        else:
-            # Distribute nodes more evenly across width
-            total_width = 1200  # Increased total width
-            x_positions = []
-            for i in range(len(nodes)):
-                x = -total_width/2 + (i * total_width / (len(nodes) - 1))
-                x_positions.append(x)
-        
-        for i, node in enumerate(nodes):
-            pos[node] = (x_positions[i], y)
-    
-    return pos
-
-pos = create_improved_tree_layout(widgets)
+# Layered layout: pages reached from several parents (and navigation cycles)
+# are drawn once, with crossings between levels kept low
+def create_widget_layout(tree):
+    y_spacing = 150
+    label_width = {name: min(len(name), 15) * 7 for name in tree.widgets}
+    layout = layered_layout(tree.widgets, tree.edges, width=label_width.get, node_gap=30, dummy_width=10)
+    max_level = max(layer for _, layer in layout.positions.values())
+    pos = {name: (x, (max_level - layer) * y_spacing) for name, (x, layer) in layout.positions.items()}
+    edge_paths = {edge: [(x, (max_level - layer) * y_spacing) for x, layer in points]
+                  for edge, points in layout.edges.items()}
+    return pos, edge_paths
+
+pos, edge_paths = create_widget_layout(tree)
 
 # Define more saturated colors for better distinction
 category_colors = {
@@ -92,84 +41,116 @@ category_colors = {
     "Design Studio": "#5D878F",
     "Virtual Fitting": "#D2BA4C",
     "Order Management": "#B4413C",
-    "Profile": "#964325"
+    "Profile": "#964325",
+    "Onboarding": "#944454",
+    "Shared Components": "#13343B"
 }
+# Features added after this palette was chosen share the accent color
+for info in widgets.values():
+    category_colors.setdefault(info["category"], "#DB4545")
+category_colors = {category: color for category, color in category_colors.items()
+                   if any(info["category"] == category for info in widgets.values())}
+
+# Graphs generated from big codebases are merged per grid cell past this size
+MAX_NODES = 400
+clusters = aggregate(pos, edge_paths, max_nodes=MAX_NODES)
+if len(clusters.members) == len(pos):
+    # Nothing merged: edges bend through the layers they cross
+    edge_lines = list(edge_paths.values())
+else:
+    edge_lines = [[clusters.positions[a], clusters.positions[b]] for a, b in clusters.edges]
 
-# Create edge traces for connections
-edge_traces = []
-for widget_name, info in widgets.items():
-    if info["parent"] and info["parent"] in pos:
-        x0, y0 = pos[info["parent"]]
-        x1, y1 = pos[widget_name]
-        
-        edge_trace = go.Scatter(
-            x=[x0, x1, None],
-            y=[y0, y1, None],
-            mode='lines',
-            line=dict(width=2, color='#666'),
-            hoverinfo='none',
-            showlegend=False
-        )
-        edge_traces.append(edge_trace)
+# All connections in one trace (WebGL for big graphs)
+edge_trace = render_edges(edge_lines, line=dict(width=2, color='#666'))
 
 # Create node trace with improved text positioning
 node_x = []
 node_y = []
 node_colors = []
+node_sizes = []
 hover_text = []
 
-for widget_name, info in widgets.items():
-    x, y = pos[widget_name]
+for cluster, members in enumerate(clusters.members):
+    x, y = clusters.positions[cluster]
     node_x.append(x)
     node_y.append(y)
+    info = widgets[members[0]]
     node_colors.append(category_colors[info["category"]])
-    hover_text.append(f"{widget_name}<br>Type: {info['type']}<br>Category: {info['category']}")
+    if len(members) == 1:
+        node_sizes.append(30)  # Increased size
+        hover_text.append(f"{members[0]}<br>Type: {info['type']}<br>Category: {info['category']}<br>lib/{info['path']}")
+    else:
+        node_sizes.append(30 + 4 * len(members) ** 0.5)
+        names = "<br>".join(members[:10]) + ("<br>..." if len(members) > 10 else "")
+        hover_text.append(f"{len(members)} widgets<br>{names}")
 
 # Create nodes without text (text will be separate)
-node_trace = go.Scatter(
-    x=node_x,
-    y=node_y,
-    mode='markers',
+node_trace = render_nodes(
+    node_x,
+    node_y,
     marker=dict(
-        size=30,  # Increased size
+        size=node_sizes,
         color=node_colors,
         line=dict(width=2, color='white')
     ),
     hovertext=hover_text,
-    hoverinfo='text',
-    showlegend=False
+    hoverinfo='text'
 )
 
-# Create separate text trace positioned below nodes
-text_x = []
-text_y = []
-text_labels = []
+# Fixed figure size and axis ranges, so label sizes in pixels map to data units
+WIDTH, HEIGHT = 1200, 800
+MARGIN = dict(l=40, r=40, t=120, b=40)
+FONT_SIZE = 12
+all_x = [x for x, _ in clusters.positions]
+all_y = [y for _, y in clusters.positions]
+x_range = [min(all_x) - 60, max(all_x) + 60]
+y_range = [min(all_y) - 60, max(all_y) + 60]
+plot_width = WIDTH - MARGIN['l'] - MARGIN['r']
+plot_height = HEIGHT - MARGIN['t'] - MARGIN['b']
+x_scale = plot_width / (x_range[1] - x_range[0])
+y_scale = plot_height / (y_range[1] - y_range[0])
+
+def to_pixels(x, y):
+    return (x - x_range[0]) * x_scale, (y_range[1] - y) * y_scale
 
-for widget_name, info in widgets.items():
-    x, y = pos[widget_name]
-    text_x.append(x)
-    text_y.append(y - 25)  # Position text below the node
-    
+# Labels are placed around their nodes (below first) clear of nodes, edges
+# and each other, instead of at a fixed offset
+obstacles = [Box.around(*to_pixels(x, y), size + 4, size + 4)
+             for x, y, size in zip(node_x, node_y, node_sizes)]
+for line in edge_lines:
+    obstacles.extend(polyline_boxes([to_pixels(x, y) for x, y in line], 2, step=2))
+
+text_labels = []
+labels = []
+for cluster in range(len(clusters.members)):
     # Truncate long names but keep readable
-    display_name = widget_name
+    display_name = clusters.label(cluster, "widgets")
     if len(display_name) > 15:
         display_name = display_name[:13] + ".."
-    
     text_labels.append(display_name)
 
-text_trace = go.Scatter(
-    x=text_x,
-    y=text_y,
+    label_width, label_height = len(display_name) * FONT_SIZE * 0.58 + 4, FONT_SIZE * 1.2 + 4
+    candidates = point_candidates(*to_pixels(node_x[cluster], node_y[cluster]), label_width, label_height,
+                                  radius=node_sizes[cluster] / 2 + 2, gap=1, y_down=True,
+                                  positions=('S', 'N', 'E', 'W', 'SE', 'NE', 'SW', 'NW'))
+    labels.append(Label(candidates, label_width, label_height))
+
+placements = place_labels(labels, obstacles, bounds=Box(0, 0, plot_width, plot_height), anneal=20)
+text_x = [x_range[0] + placement.x / x_scale for placement in placements]
+text_y = [y_range[1] - placement.y / y_scale for placement in placements]
+
+text_trace = render_nodes(
+    text_x,
+    text_y,
     mode='text',
     text=text_labels,
     textposition="middle center",
-    textfont=dict(size=12, color='#333'),  # Increased font size and better contrast
-    hoverinfo='none',
-    showlegend=False
+    textfont=dict(size=FONT_SIZE, color='#333'),  # Increased font size and better contrast
+    hoverinfo='none'
 )
 
 # Create the figure
-fig = go.Figure(data=[node_trace, text_trace] + edge_traces)
+fig = go.Figure(data=[node_trace, text_trace, edge_trace])
 
 # Add legend traces for categories
 for category, color in category_colors.items():
@@ -194,10 +175,13 @@ fig.update_layout(
         x=0.5
     ),
     hovermode='closest',
-    xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-    yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+    xaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=x_range),
+    yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=y_range),
     plot_bgcolor='white',
-    font=dict(size=12)
+    font=dict(size=12),
+    width=WIDTH,
+    height=HEIGHT,
+    margin=MARGIN
 )
 
 # Save the chart
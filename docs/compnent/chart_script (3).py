@@ -1,7 +1,8 @@
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from svg_diagram import Diagram
 
 # Create data for the BLoC architecture diagram
 components = []
@@ -95,73 +96,33 @@ for i, repo in enumerate(repo_components):
     sizes.append(18)
     labels.append(repo)
 
-# Create the scatter plot
-fig = go.Figure()
-
-# Add all components
-fig.add_trace(go.Scatter(
-    x=x_positions,
-    y=y_positions,
-    mode='markers+text',
-    marker=dict(
-        size=sizes,
-        color=colors,
-        symbol=symbols,
-        line=dict(width=2, color='white')
-    ),
-    text=labels,
-    textposition="middle center",
-    textfont=dict(size=8, color='black'),
-    hovertext=components,
-    hovertemplate='<b>%{hovertext}</b><extra></extra>',
-    showlegend=False
-))
+diagram = Diagram(
+    title="BLoC Architecture Flow",
+    width=1100,
+    height=650,
+    x_range=(-0.8, 6.8),
+    y_range=(-0.5, 4.5),
+    margin=dict(l=110),
+    font_size=12,
+    anneal=20
+)
 
-# Add flow arrows (simplified representation using lines)
-arrow_x = []
-arrow_y = []
+# Flow arrows (simplified representation using lines), under the components
 for i in range(4):
     x_base = i * 2
-    # UI to Events
-    arrow_x.extend([x_base, x_base, None])
-    arrow_y.extend([ui_y, event_y, None])
-    # Events to BLoC
-    arrow_x.extend([x_base, x_base, None])
-    arrow_y.extend([event_y, bloc_y, None])
-    # BLoC to States
-    arrow_x.extend([x_base, x_base, None])
-    arrow_y.extend([bloc_y, state_y, None])
-    # BLoC to Repository
-    arrow_x.extend([x_base, x_base, None])
-    arrow_y.extend([bloc_y, repo_y, None])
+    for start_y, end_y in [(ui_y, event_y),      # UI to Events
+                           (event_y, bloc_y),    # Events to BLoC
+                           (bloc_y, state_y),    # BLoC to States
+                           (bloc_y, repo_y)]:    # BLoC to Repository
+        diagram.line(x_base, start_y, x_base, end_y, color='#13343B', width=2, dash='dot')
 
-fig.add_trace(go.Scatter(
-    x=arrow_x,
-    y=arrow_y,
-    mode='lines',
-    line=dict(color='#13343B', width=2, dash='dot'),
-    hoverinfo='skip',
-    showlegend=False
-))
+# Add all components; labels go beside the markers where they overlap the least
+for component, x, y, color, symbol, size, label in zip(components, x_positions, y_positions,
+                                                        colors, symbols, sizes, labels):
+    diagram.node(x, y, label, shape=symbol, size=size, fill=color, stroke='white', stroke_width=2,
+                 font_size=8, text_color='black', label_position='auto', hover=component)
 
-# Update layout
-fig.update_layout(
-    title="BLoC Architecture Flow",
-    xaxis=dict(
-        showgrid=False,
-        zeroline=False,
-        showticklabels=False,
-        title=""
-    ),
-    yaxis=dict(
-        showgrid=False,
-        zeroline=False,
-        ticktext=["Repository", "States", "BLoCs", "Events", "UI"],
-        tickvals=[0, 1, 2, 3, 4],
-        title="Layer"
-    ),
-    plot_bgcolor='white'
-)
+diagram.y_ticks([0, 1, 2, 3, 4], ["Repository", "States", "BLoCs", "Events", "UI"], title="Layer")
 
 # Save the chart
-fig.write_image("bloc_architecture_diagram.png")
\ No newline at end of file
+diagram.write_image("bloc_architecture_diagram.png", scale=2)
@@ -1,6 +1,8 @@
-import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from svg_diagram import Diagram
 
 # Define the Firebase services and their positions with better spacing
 services = {
@@ -34,81 +36,25 @@ connections = [
 ]
 
 # Create the network diagram
-fig = go.Figure()
+diagram = Diagram(
+    title='Firebase Integration Flow',
+    width=1000,
+    height=700,
+    x_range=(-6, 7),
+    y_range=(-4.5, 4.5),
+    font_size=13,
+    anneal=20
+)
 
-# Add edges (connections) without overlapping labels
+# Add edges first so the nodes sit on top; arrowheads end at the target's outline.
+# Connection labels are placed beside their edges where they overlap the least
 for source, target, label in connections:
-    source_pos = services[source]
-    target_pos = services[target]
-    
-    # Calculate midpoint for label positioning
-    mid_x = (source_pos['x'] + target_pos['x']) / 2
-    mid_y = (source_pos['y'] + target_pos['y']) / 2
-    
-    # Add connection line
-    fig.add_trace(go.Scatter(
-        x=[source_pos['x'], target_pos['x']],
-        y=[source_pos['y'], target_pos['y']],
-        mode='lines',
-        line=dict(color='#FF6B35', width=4),
-        hoverinfo='text',
-        hovertext=f"{source} → {target}<br>{label}",
-        showlegend=False,
-        opacity=0.8
-    ))
-    
-    # Add arrowhead using annotation
-    dx = target_pos['x'] - source_pos['x']
-    dy = target_pos['y'] - source_pos['y']
-    
-    # Position arrow closer to target
-    arrow_x = source_pos['x'] + dx * 0.8
-    arrow_y = source_pos['y'] + dy * 0.8
-    
-    fig.add_annotation(
-        x=arrow_x,
-        y=arrow_y,
-        ax=source_pos['x'] + dx * 0.6,
-        ay=source_pos['y'] + dy * 0.6,
-        xref='x', yref='y',
-        axref='x', ayref='y',
-        arrowhead=3,
-        arrowsize=2,
-        arrowwidth=3,
-        arrowcolor='#FF6B35',
-        showarrow=True
-    )
-
-# Add connection labels as separate text elements with better visibility
-label_positions = [
-    (-1.5, 1.5, 'Auth & Login'),
-    (1.5, 1.5, 'Data Sync'),
-    (-1.5, -1.5, 'File Upload'),
-    (1.5, -1.5, 'API Calls'),
-    (-2.25, 0, 'User Events'),
-    (2.25, 0, 'Push Notifs'),
-    (0, 3, 'User Data'),
-    (3, 0, 'Data Process'),
-    (0, -3, 'File Process'),
-    (4.25, -1.5, 'ML Process'),
-    (4.25, -0.5, 'Payments'),
-    (4.25, -2.5, '3rd Party'),
-    (4.25, -0.5, 'Notifications')
-]
-
-for i, (lx, ly, label_text) in enumerate(label_positions):
-    if i < len(connections):  # Avoid index out of range
-        fig.add_trace(go.Scatter(
-            x=[lx],
-            y=[ly],
-            mode='text',
-            text=label_text,
-            textfont=dict(size=11, color='#FF6B35', family='Arial Bold'),
-            hoverinfo='none',
-            showlegend=False
-        ))
+    diagram.edge(source, target, color='#FF6B35', width=4, arrow_size=16, opacity=0.8,
+                 hover=f"{source} → {target}<br>{label}",
+                 label=label, label_size=11, label_bold=True)
 
 # Add nodes with better text visibility
+display_names = []
 for service, props in services.items():
     # Abbreviate service names to fit 15 character limit
     display_name = service.replace('Firebase ', '').replace('Cloud ', '')
@@ -131,36 +77,12 @@ for service, props in services.items():
     elif service == 'AI Services':
         display_name = 'AI/ML'
     
-    fig.add_trace(go.Scatter(
-        x=[props['x']],
-        y=[props['y']],
-        mode='markers+text',
-        marker=dict(
-            size=props['size'],
-            color=props['color'],
-            line=dict(width=4, color='#FF6B35')
-        ),
-        text=display_name,
-        textposition='middle center',
-        textfont=dict(size=13, color='white', family='Arial Black'),
-        hoverinfo='text',
-        hovertext=f"{service}<br>Integration point",
-        showlegend=False
-    ))
-
-# Update layout with Firebase theme
-fig.update_layout(
-    title='Firebase Integration Flow',
-    xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-    yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-    plot_bgcolor='rgba(0,0,0,0)',
-    paper_bgcolor='white',
-    showlegend=False,
-    hovermode='closest'
-)
+    display_names.append(display_name)
 
-fig.update_xaxes(range=[-6, 7])
-fig.update_yaxes(range=[-4.5, 4.5])
+for (service, props), display_name in zip(services.items(), display_names):
+    diagram.node(props['x'], props['y'], display_name, shape='circle', size=props['size'],
+                 fill=props['color'], stroke='#FF6B35', stroke_width=4, text_color='#13343B', bold=True,
+                 label_position='auto', hover=f"{service}<br>Integration point", key=service)
 
 # Save the chart
-fig.write_image('firebase_integration_diagram.png')
\ No newline at end of file
+diagram.write_image('firebase_integration_diagram.png', scale=2)
@@ -0,0 +1,220 @@
+"""
+Navigation graph of the app screens.
+
+The specification stores navigation as free text ("Onboarding/Login/Home",
+"Settings/Orders/My Designs"). This module resolves each part to a screen,
+builds an adjacency-indexed directed graph and derives, in linear time:
+reachability and tap depth from the Splash Screen, shortest tap paths,
+unreachable and dead-end screens, and strongly connected components.
+
+Run directly to write tailoring_app_navigation.csv/.json next to
+tailoring_app_screens.csv.
+"""
+
+import json
+import re
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graph_util import strongly_connected
+import report_util
+from spec_model import AppSpec, load_spec
+
+ENTRY_SCREEN = "Splash Screen"
+
+
+def _words(text: str) -> Tuple[str, ...]:
+    """Lowercase words of a screen reference, without the 'screen' suffix"""
+    return tuple(w for w in re.findall(r'[a-z0-9]+', text.lower()) if w not in ('screen', 'screens'))
+
+
+class ScreenResolver:
+    """
+    Map free-text navigation references to screen names
+
+    A reference matches a screen when every word in it starts a word of
+    the screen name, in order ("Orders" -> "Orders History Screen",
+    "Order Summary" -> "Order Summary Screen"). Exact names win; among
+    fuzzy matches the one with the fewest extra words wins, and ties are
+    left unresolved rather than guessed.
+    """
+
+    def __init__(self, screen_names: Sequence[str]):
+        self.exact = {name.lower(): name for name in screen_names}
+        self.candidates = [(name, _words(name)) for name in screen_names]
+        self._cache: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def _matches(ref_words: Tuple[str, ...], name_words: Tuple[str, ...]) -> bool:
+        i = 0
+        for word in name_words:
+            if i < len(ref_words) and word.startswith(ref_words[i]):
+                i += 1
+        return i == len(ref_words)
+
+    def resolve(self, reference: str) -> Optional[str]:
+        reference = reference.strip()
+        if reference in self._cache:
+            return self._cache[reference]
+        name = self.exact.get(reference.lower()) or self.exact.get(f"{reference} screen".lower())
+        if name is None:
+            ref_words = _words(reference)
+            if ref_words:
+                matches = sorted((len(words) - len(ref_words), candidate)
+                                 for candidate, words in self.candidates
+                                 if self._matches(ref_words, words))
+                if matches and (len(matches) == 1 or matches[0][0] < matches[1][0]):
+                    name = matches[0][1]
+        self._cache[reference] = name
+        return name
+
+
+class NavigationGraph:
+    """Directed screen graph with integer node ids and adjacency lists"""
+
+    def __init__(self, spec: AppSpec, entry: str = ENTRY_SCREEN):
+        self.spec = spec
+        self.names: List[str] = [screen.name for screen in spec.screens]
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.successors: List[List[int]] = [[] for _ in self.names]
+        self.predecessors: List[List[int]] = [[] for _ in self.names]
+        # screen name -> references in its navigation text that match no screen
+        self.unresolved: Dict[str, List[str]] = {}
+        if entry not in self.ids:
+            raise ValueError(f"Entry screen {entry!r} is not in the specification")
+        self.entry = self.ids[entry]
+
+        resolver = ScreenResolver(self.names)
+        edges = set()
+        for screen in spec.screens:
+            node = self.ids[screen.name]
+            for field, outgoing in ((screen.navigation_to, True), (screen.navigation_from, False)):
+                for reference in field.split('/'):
+                    if not reference.strip():
+                        continue
+                    target = resolver.resolve(reference)
+                    if target is None:
+                        self.unresolved.setdefault(screen.name, []).append(reference.strip())
+                        continue
+                    other = self.ids[target]
+                    edge = (node, other) if outgoing else (other, node)
+                    if edge[0] != edge[1]:
+                        edges.add(edge)
+        for source, target in sorted(edges):
+            self.successors[source].append(target)
+            self.predecessors[target].append(source)
+
+        self.depth, self._parent = self._bfs(self.entry)
+        self.scc_ids, self.sccs = strongly_connected(self.successors)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self.successors)
+
+    def _bfs(self, start: int) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+        depth: List[Optional[int]] = [None] * len(self.names)
+        parent: List[Optional[int]] = [None] * len(self.names)
+        depth[start] = 0
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for target in self.successors[node]:
+                if depth[target] is None:
+                    depth[target] = depth[node] + 1
+                    parent[target] = node
+                    queue.append(target)
+        return depth, parent
+
+    def shortest_path(self, target: str, source: Optional[str] = None) -> Optional[List[str]]:
+        """Fewest-taps path between two screens (from the entry screen by default)"""
+        if source is None or self.ids[source] == self.entry:
+            parent, start = self._parent, self.entry
+        else:
+            start = self.ids[source]
+            _, parent = self._bfs(start)
+        node = self.ids[target]
+        if node != start and parent[node] is None:
+            return None
+        path = [node]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        return [self.names[i] for i in reversed(path)]
+
+    def unreachable(self) -> List[str]:
+        return [name for name, d in zip(self.names, self.depth) if d is None]
+
+    def dead_ends(self) -> List[str]:
+        return [name for name, targets in zip(self.names, self.successors) if not targets]
+
+    def cycles(self) -> List[List[str]]:
+        """Strongly connected components with more than one screen"""
+        return [[self.names[i] for i in component] for component in self.sccs if len(component) > 1]
+
+    def rows(self) -> List[dict]:
+        """One record per screen, in specification order"""
+        rows = []
+        for node, name in enumerate(self.names):
+            path = self.shortest_path(name)
+            rows.append({
+                'screen_name': name,
+                'category': self.spec.screens_by_name[name].category,
+                'depth': self.depth[node],
+                'reachable': self.depth[node] is not None,
+                'dead_end': not self.successors[node],
+                'scc': self.scc_ids[node],
+                'in_degree': len(self.predecessors[node]),
+                'out_degree': len(self.successors[node]),
+                'navigates_to': [self.names[t] for t in self.successors[node]],
+                'shortest_path': path or [],
+                'unresolved': self.unresolved.get(name, []),
+            })
+        return rows
+
+    def write_csv(self, path: str):
+        rows = [dict(row,
+                     navigates_to=', '.join(row['navigates_to']),
+                     shortest_path=' > '.join(row['shortest_path']),
+                     unresolved=', '.join(row['unresolved']),
+                     depth='' if row['depth'] is None else row['depth'])
+                for row in self.rows()]
+        report_util.write_report(path, rows)
+
+    def write_json(self, path: str):
+        data = {
+            'entry': self.names[self.entry],
+            'screens': self.rows(),
+            'edges': [[self.names[s], self.names[t]]
+                      for s, targets in enumerate(self.successors) for t in targets],
+            'unreachable': self.unreachable(),
+            'dead_ends': self.dead_ends(),
+            'cycles': self.cycles(),
+            'unresolved': self.unresolved,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    graph = NavigationGraph(load_spec())
+    graph.write_csv('tailoring_app_navigation.csv')
+    graph.write_json('tailoring_app_navigation.json')
+
+    print(f"Navigation graph: {len(graph.names)} screens, {graph.edge_count} edges")
+    reachable = [d for d in graph.depth if d is not None]
+    print(f"Reachable from {graph.names[graph.entry]}: {len(reachable)} "
+          f"(max depth {max(reachable)} taps)")
+    print("\nDepth per screen:")
+    for name, depth in sorted(zip(graph.names, graph.depth), key=lambda x: (x[1] is None, x[1] or 0)):
+        print(f"- {name}: {'unreachable' if depth is None else f'{depth} taps'}")
+    print(f"\nUnreachable screens: {', '.join(graph.unreachable()) or 'none'}")
+    print(f"Dead-end screens: {', '.join(graph.dead_ends()) or 'none'}")
+    for component in graph.cycles():
+        print(f"Cycle: {' <-> '.join(component)}")
+    if graph.unresolved:
+        print("\nUnresolved navigation references:")
+        for name, references in graph.unresolved.items():
+            print(f"- {name}: {', '.join(references)}")
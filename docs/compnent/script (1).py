@@ -1,289 +1,20 @@
 # Create a comprehensive assets and components list for the AI-Powered Tailoring Platform
 import json
 
-# Define comprehensive assets and components
-app_assets = {
-    "images": {
-        "logos_and_branding": [
-            "app_logo.png",
-            "app_logo_dark.png",
-            "splash_logo.png",
-            "brand_watermark.png"
-        ],
-        "onboarding": [
-            "onboarding_welcome.png",
-            "onboarding_design.png", 
-            "onboarding_fitting.png",
-            "onboarding_order.png"
-        ],
-        "icons": [
-            "home_icon.png",
-            "design_icon.png",
-            "fitting_icon.png",
-            "orders_icon.png",
-            "profile_icon.png",
-            "settings_icon.png",
-            "camera_icon.png",
-            "gallery_icon.png",
-            "ai_assistant_icon.png",
-            "measurement_icon.png",
-            "payment_icons.png"
-        ],
-        "ui_elements": [
-            "default_avatar.png",
-            "placeholder_image.png",
-            "success_checkmark.png",
-            "error_icon.png",
-            "loading_spinner.png",
-            "empty_state.png"
-        ],
-        "design_studio": [
-            "canvas_background.png",
-            "tool_palette_bg.png",
-            "color_wheel.png",
-            "pattern_thumbnails/",
-            "fabric_textures/",
-            "design_templates/"
-        ],
-        "virtual_fitting": [
-            "ar_overlay_frame.png",
-            "body_measurement_guide.png",
-            "size_chart.png",
-            "fit_indicators.png"
-        ]
-    },
-    "animations": {
-        "lottie_files": [
-            "splash_animation.json",
-            "loading_animation.json",
-            "success_animation.json",
-            "order_processing.json",
-            "ai_thinking.json",
-            "virtual_fitting.json"
-        ]
-    },
-    "fonts": {
-        "primary": "Poppins",
-        "secondary": "Roboto",
-        "accent": "Playfair Display"
-    },
-    "colors": {
-        "primary": "#6C63FF",
-        "secondary": "#FF6B6B",
-        "accent": "#4ECDC4",
-        "background": "#F8F9FA",
-        "surface": "#FFFFFF",
-        "error": "#FF5252",
-        "success": "#4CAF50",
-        "warning": "#FF9800"
-    },
-    "audio": [
-        "notification_sound.mp3",
-        "button_click.mp3",
-        "success_sound.mp3",
-        "camera_shutter.mp3"
-    ]
-}
-
-# Define comprehensive components
-app_components = {
-    "authentication": {
-        "widgets": [
-            "CustomTextField",
-            "AuthButton",
-            "SocialLoginButton",
-            "PasswordStrengthIndicator",
-            "BiometricLoginButton"
-        ],
-        "screens": [
-            "SplashScreen",
-            "OnboardingScreen",
-            "LoginScreen",
-            "RegisterScreen",
-            "ForgotPasswordScreen",
-            "EmailVerificationScreen",
-            "ProfileSetupScreen"
-        ]
-    },
-    "design_studio": {
-        "widgets": [
-            "DesignCanvas",
-            "ToolPalette",
-            "ColorPicker",
-            "PatternLibrary",
-            "LayerManager",
-            "AIAssistantChat",
-            "DesignPreview",
-            "SaveDesignDialog"
-        ],
-        "custom_painters": [
-            "CanvasPainter",
-            "PatternPainter",
-            "SelectionPainter",
-            "GridPainter"
-        ]
-    },
-    "virtual_fitting": {
-        "widgets": [
-            "ARCameraView",
-            "DesignOverlay",
-            "FitAdjustmentControls",
-            "MeasurementCapture",
-            "BodyVisualization",
-            "SizeRecommendation"
-        ],
-        "ar_components": [
-            "ARSession",
-            "BodyTracker",
-            "GarmentRenderer",
-            "FitAnalyzer"
-        ]
-    },
-    "order_management": {
-        "widgets": [
-            "OrderSummaryCard",
-            "PaymentMethodSelector",
-            "OrderTrackingTimeline",
-            "OrderStatusBadge",
-            "DeliveryMap",
-            "OrderHistoryList"
-        ],
-        "screens": [
-            "OrderSummaryScreen",
-            "PaymentScreen",
-            "OrderConfirmationScreen",
-            "OrderTrackingScreen",
-            "OrderHistoryScreen"
-        ]
-    },
-    "profile_management": {
-        "widgets": [
-            "ProfileHeader",
-            "SettingsItem",
-            "MyDesignsGrid",
-            "AvatarUpload",
-            "PreferencesForm",
-            "AccountSettings"
-        ],
-        "screens": [
-            "ProfileScreen",
-            "SettingsScreen",
-            "MyDesignsScreen",
-            "EditProfileScreen"
-        ]
-    },
-    "common_ui": {
-        "widgets": [
-            "CustomAppBar",
-            "CustomBottomNavBar",
-            "LoadingOverlay",
-            "ErrorDialog",
-            "SuccessDialog",
-            "CustomCard",
-            "CustomButton",
-            "CustomTextField",
-            "ImagePicker",
-            "DatePicker",
-            "RatingWidget",
-            "SearchBar",
-            "FilterChips",
-            "EmptyStateWidget",
-            "PaginationWidget"
-        ],
-        "layouts": [
-            "ResponsiveLayout",
-            "AdaptiveLayout",
-            "GridLayout",
-            "ListLayout"
-        ]
-    }
-}
+from spec_model import load_spec
 
-# Define integrations and functions
-app_integrations = {
-    "firebase": {
-        "services": [
-            "Firebase Auth",
-            "Cloud Firestore",
-            "Firebase Storage",
-            "Cloud Functions",
-            "Firebase Analytics",
-            "Firebase Messaging",
-            "Remote Config"
-        ],
-        "functions": [
-            "initializeFirebase()",
-            "signInWithEmail()",
-            "signInWithGoogle()",
-            "uploadImage()",
-            "saveDesign()",
-            "createOrder()",
-            "processPayment()",
-            "sendNotification()"
-        ]
-    },
-    "ai_services": {
-        "providers": [
-            "OpenAI GPT",
-            "Stable Diffusion",
-            "Google ML Kit",
-            "TensorFlow Lite"
-        ],
-        "functions": [
-            "generateDesignFromPrompt()",
-            "analyzeFitFromImage()",
-            "recommendSize()",
-            "extractBodyMeasurements()",
-            "enhanceDesign()"
-        ]
-    },
-    "payment": {
-        "gateways": [
-            "Stripe",
-            "Razorpay",
-            "PayPal"
-        ],
-        "functions": [
-            "createPaymentIntent()",
-            "processPayment()",
-            "refundPayment()",
-            "validatePayment()"
-        ]
-    },
-    "external_apis": {
-        "services": [
-            "Google Maps API",
-            "Camera API",
-            "Gallery API",
-            "Push Notifications",
-            "Email Service"
-        ],
-        "functions": [
-            "getCurrentLocation()",
-            "capturePhoto()",
-            "selectFromGallery()",
-            "sendPushNotification()",
-            "sendEmail()"
-        ]
-    }
-}
+# Assets, components and integrations come from the shared specification
+spec = load_spec()
 
 # Save comprehensive data to JSON
 complete_app_specification = {
-    "app_name": "AI-Powered Tailoring & Clothing Design Platform",
-    "platform": "Flutter",
-    "assets": app_assets,
-    "components": app_components,
-    "integrations": app_integrations,
-    "total_screens": 21,
-    "main_categories": [
-        "Authentication",
-        "Design Studio", 
-        "Virtual Fitting",
-        "Order Management",
-        "Profile Management",
-        "Support"
-    ]
+    "app_name": spec.app_name,
+    "platform": spec.platform,
+    "assets": spec.assets_section(),
+    "components": spec.components_section(),
+    "integrations": spec.integrations_section(),
+    "total_screens": spec.total_screens,
+    "main_categories": list(spec.main_categories)
 }
 
 # Save to JSON file
@@ -291,16 +22,16 @@ with open('complete_app_specification.json', 'w', encoding='utf-8') as f:
     json.dump(complete_app_specification, f, indent=2, ensure_ascii=False)
 
 print("Complete App Specification Generated")
-print(f"Total Assets: {sum(len(v) if isinstance(v, list) else sum(len(nested_v) for nested_v in v.values()) for v in app_assets.values())}")
-print(f"Total Components: {sum(len(v['widgets']) + len(v.get('screens', [])) + len(v.get('custom_painters', [])) + len(v.get('ar_components', [])) for v in app_components.values())}")
-print(f"Total Integrations: {sum(len(v.get('services', [])) + len(v.get('functions', [])) + len(v.get('providers', [])) + len(v.get('gateways', [])) for v in app_integrations.values())}")
+print(f"Total Assets: {spec.total_assets} files ({sum(len(tokens) for tokens in spec.theme.values())} theme tokens)")
+print(f"Total Components: {spec.total_components}")
+print(f"Total Integrations: {spec.total_integrations}")
 
 # Create a summary table
 print("\n=== COMPREHENSIVE APP SPECIFICATION SUMMARY ===")
-print(f"App Name: {complete_app_specification['app_name']}")
-print(f"Platform: {complete_app_specification['platform']}")
-print(f"Total Screens: {complete_app_specification['total_screens']}")
-print(f"Main Categories: {len(complete_app_specification['main_categories'])}")
+print(f"App Name: {spec.app_name}")
+print(f"Platform: {spec.platform}")
+print(f"Total Screens: {spec.total_screens}")
+print(f"Main Categories: {len(spec.main_categories)}")
 print("\nMain Categories:")
-for i, category in enumerate(complete_app_specification['main_categories'], 1):
-    print(f"  {i}. {category}")
\ No newline at end of file
+for i, category in enumerate(spec.main_categories, 1):
+    print(f"  {i}. {category}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Spec-vs-code coverage: which specified widgets and screens exist in lib/.
+
+Joins the component classes of the specification (plus one screen class per
+specified screen, e.g. "Design Studio Screen" -> DesignStudioScreen) against
+the Dart symbol index. A specified class is implemented when a class of that
+name exists, implemented under another name when only a Page/View/Widget
+variant exists (LoginScreen -> LoginPage), and missing otherwise. Widget,
+cubit and painter classes in lib/ that the specification never mentions are
+reported as unspecified.
+
+Example:
+    python spec_coverage.py --output spec_coverage.csv
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dart_index import DEFAULT_CACHE, LIB_DIR, WIDGET_ROLES, DartClass, DartIndex
+import report_util
+from spec_model import AppSpec, load_spec
+
+# Roles of lib/ classes that are expected to appear in the specification
+SPECIFIABLE_ROLES = WIDGET_ROLES + ('cubit', 'bloc', 'painter')
+
+# Interchangeable suffixes of screen and widget class names
+NAME_SUFFIXES = ('Screen', 'Page', 'View', 'Widget')
+
+
+class SpecClass(NamedTuple):
+    name: str
+    group: str
+    kind: str
+
+
+class Coverage(NamedTuple):
+    spec: SpecClass
+    status: str  # "implemented", "renamed" or "missing"
+    declaration: Optional[DartClass]
+
+
+def spec_classes(spec: AppSpec) -> List[SpecClass]:
+    """Distinct class names the specification asks for, first occurrence wins"""
+    classes: Dict[str, SpecClass] = {}
+    for component in spec.components:
+        classes.setdefault(component.name, SpecClass(component.name, component.group, component.kind))
+    for screen in spec.screens:
+        name = ''.join(word[:1].upper() + word[1:] for word in re.findall(r'\w+', screen.name))
+        classes.setdefault(name, SpecClass(name, screen.category, 'screens'))
+    return list(classes.values())
+
+
+def _stem(name: str) -> str:
+    for suffix in NAME_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def match_spec(spec: AppSpec, index: DartIndex) -> List[Coverage]:
+    """Look up every specified class in the index"""
+    public = [declaration for declaration in index.classes
+              if not declaration.private and declaration.kind == 'class']
+    by_name = {declaration.name: declaration for declaration in reversed(public)}
+    by_stem: Dict[str, DartClass] = {}
+    for declaration in public:
+        by_stem.setdefault(_stem(declaration.name), declaration)
+
+    coverage = []
+    for spec_class in spec_classes(spec):
+        declaration = by_name.get(spec_class.name)
+        if declaration is not None:
+            coverage.append(Coverage(spec_class, 'implemented', declaration))
+            continue
+        declaration = by_stem.get(_stem(spec_class.name))
+        if declaration is not None and index.role(declaration.superclass or '') in SPECIFIABLE_ROLES:
+            coverage.append(Coverage(spec_class, 'renamed', declaration))
+        else:
+            coverage.append(Coverage(spec_class, 'missing', None))
+    return coverage
+
+
+def unspecified_classes(index: DartIndex, coverage: List[Coverage]) -> List[DartClass]:
+    """Public widget/cubit/painter classes in lib/ that no specified class maps to"""
+    matched = {item.declaration.name for item in coverage if item.declaration is not None}
+    return [declaration for declaration in index.with_role(SPECIFIABLE_ROLES)
+            if not declaration.private and declaration.name not in matched]
+
+
+def write_report(path: str, index: DartIndex, coverage: List[Coverage], unspecified: List[DartClass]):
+    """Write one row per specified or unspecified class (.csv or .json)"""
+    rows = [{
+        'class_name': item.spec.name,
+        'status': item.status,
+        'spec_group': item.spec.group,
+        'spec_kind': item.spec.kind,
+        'dart_class': item.declaration.name if item.declaration else '',
+        'role': index.role(item.declaration.superclass or '') or '' if item.declaration else '',
+        'path': f"lib/{item.declaration.path}:{item.declaration.line}" if item.declaration else '',
+    } for item in coverage]
+    rows.extend({
+        'class_name': declaration.name,
+        'status': 'unspecified',
+        'spec_group': '',
+        'spec_kind': '',
+        'dart_class': declaration.name,
+        'role': index.role(declaration.superclass) or '',
+        'path': f"lib/{declaration.path}:{declaration.line}",
+    } for declaration in unspecified)
+    report_util.write_report(path, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the app specification with the classes in lib/")
+    parser.add_argument('--lib', default=str(LIB_DIR), help="Dart source root (default: lib/)")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help="Dart index cache (JSON)")
+    parser.add_argument('--no-cache', action='store_true', help="Re-parse every Dart file")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--output', help="Write the full report to this .csv or .json file")
+    args = parser.parse_args()
+
+    spec = load_spec()
+    index = DartIndex(args.lib, None if args.no_cache else args.cache, args.workers).build()
+    coverage = match_spec(spec, index)
+    unspecified = unspecified_classes(index, coverage)
+
+    print(f"🔍 Indexed {len(index.files)} Dart files ({index.parsed} parsed, {index.cached} cached)")
+    for kind in dict.fromkeys(item.spec.kind for item in coverage):
+        items = [item for item in coverage if item.spec.kind == kind]
+        done = sum(1 for item in items if item.status != 'missing')
+        print(f"\n📁 {kind}: {done}/{len(items)} implemented")
+        for item in items:
+            if item.status == 'implemented':
+                print(f"  ✓ {item.spec.name} ({item.declaration.path})")
+            elif item.status == 'renamed':
+                print(f"  ✓ {item.spec.name} as {item.declaration.name} ({item.declaration.path})")
+            else:
+                print(f"  ✗ {item.spec.name}")
+
+    print(f"\n❓ Unspecified classes in lib/: {len(unspecified)}")
+    for declaration in unspecified:
+        print(f"  - {declaration.name} [{index.role(declaration.superclass)}] ({declaration.path})")
+
+    total = len(coverage)
+    implemented = sum(1 for item in coverage if item.status != 'missing')
+    print(f"\n🎉 Coverage: {implemented}/{total} specified classes ({implemented / total:.0%})")
+    if args.output:
+        write_report(args.output, index, coverage, unspecified)
+        print(f"📄 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
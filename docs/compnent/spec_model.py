@@ -0,0 +1,300 @@
+"""
+Typed model of the AI-Powered Tailoring Platform specification.
+
+The specification (screens, assets, components and integrations) lives in
+app_spec.json next to this file. load_spec() validates it once and returns
+an AppSpec whose records are slotted dataclasses and whose indexes (by
+category, integration, asset, component, group and kind) are built up
+front, so reports and charts look things up instead of re-walking the
+nested data.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+SPEC_PATH = Path(__file__).with_name('app_spec.json')
+
+SCREEN_FIELDS = ['screen_name', 'category', 'description', 'components', 'integrations',
+                 'functions', 'assets', 'navigation_from', 'navigation_to']
+SCREEN_LIST_FIELDS = ('components', 'integrations', 'functions', 'assets')
+
+
+class SpecError(ValueError):
+    """The specification data file is malformed; lists every problem found"""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__("Invalid app specification:\n  - " + "\n  - ".join(problems))
+
+
+@dataclass(frozen=True, slots=True)
+class Screen:
+    name: str
+    category: str
+    description: str
+    components: Tuple[str, ...]
+    integrations: Tuple[str, ...]
+    functions: Tuple[str, ...]
+    assets: Tuple[str, ...]
+    navigation_from: str
+    navigation_to: str
+
+    def to_row(self) -> Dict[str, Union[str, List[str]]]:
+        """The screen in its original data-file shape"""
+        return {
+            'screen_name': self.name,
+            'category': self.category,
+            'description': self.description,
+            'components': list(self.components),
+            'integrations': list(self.integrations),
+            'functions': list(self.functions),
+            'assets': list(self.assets),
+            'navigation_from': self.navigation_from,
+            'navigation_to': self.navigation_to,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    name: str  # file or directory name, e.g. "app_logo.png" or "fabric_textures/"
+    category: str  # "images", "animations", "audio", ...
+    group: Optional[str]  # e.g. "logos_and_branding"; None for flat categories
+
+
+@dataclass(frozen=True, slots=True)
+class Component:
+    name: str  # Dart class name, e.g. "DesignCanvas"
+    group: str  # feature area, e.g. "design_studio"
+    kind: str  # "widgets", "screens", "custom_painters", "ar_components"
+
+
+@dataclass(frozen=True, slots=True)
+class Integration:
+    name: str  # service, provider, gateway or function name
+    group: str  # e.g. "firebase", "payment"
+    kind: str  # "services", "providers", "gateways", "functions"
+
+
+def _group_by(items, key) -> Dict[str, Tuple]:
+    index: Dict[str, list] = {}
+    for item in items:
+        index.setdefault(key(item), []).append(item)
+    return {k: tuple(v) for k, v in index.items()}
+
+
+def _group_by_each(items, keys) -> Dict[str, Tuple]:
+    """Index items under every key in keys(item), preserving first-seen order"""
+    index: Dict[str, list] = {}
+    for item in items:
+        for k in dict.fromkeys(keys(item)):
+            index.setdefault(k, []).append(item)
+    return {k: tuple(v) for k, v in index.items()}
+
+
+class AppSpec:
+    """The validated specification plus prebuilt lookup indexes"""
+
+    def __init__(self, app_name: str, platform: str, main_categories: List[str],
+                 screens: List[Screen], assets: List[Asset], theme: Dict[str, Dict[str, str]],
+                 components: List[Component], integrations: List[Integration],
+                 asset_layout: List[str]):
+        self.app_name = app_name
+        self.platform = platform
+        self.main_categories = tuple(main_categories)
+        self.screens = tuple(screens)
+        self.assets = tuple(assets)
+        # Named design tokens from the assets section (fonts, colors)
+        self.theme = theme
+        self.components = tuple(components)
+        self.integrations = tuple(integrations)
+        # Order of the categories in the assets section, lists and tokens alike
+        self._asset_layout = tuple(asset_layout)
+
+        self.screens_by_name = {screen.name: screen for screen in self.screens}
+        self.screens_by_category = _group_by(self.screens, lambda s: s.category)
+        self.screens_by_integration = _group_by_each(self.screens, lambda s: s.integrations)
+        self.screens_by_component = _group_by_each(self.screens, lambda s: s.components)
+        self.screens_by_asset = _group_by_each(self.screens, lambda s: s.assets)
+        self.screens_by_function = _group_by_each(self.screens, lambda s: s.functions)
+
+        self.assets_by_category = _group_by(self.assets, lambda a: a.category)
+        self.assets_by_name = _group_by(self.assets, lambda a: a.name)
+        self.components_by_group = _group_by(self.components, lambda c: c.group)
+        self.components_by_kind = _group_by(self.components, lambda c: c.kind)
+        self.components_by_name = _group_by(self.components, lambda c: c.name)
+        self.integrations_by_group = _group_by(self.integrations, lambda i: i.group)
+        self.integrations_by_kind = _group_by(self.integrations, lambda i: i.kind)
+
+    @property
+    def total_screens(self) -> int:
+        return len(self.screens)
+
+    @property
+    def total_assets(self) -> int:
+        return len(self.assets)
+
+    @property
+    def total_components(self) -> int:
+        return len(self.components)
+
+    @property
+    def total_integrations(self) -> int:
+        return len(self.integrations)
+
+    def assets_section(self) -> dict:
+        """Rebuild the nested assets section of the data file"""
+        section: dict = {}
+        for category in self._asset_layout:
+            if category in self.theme:
+                section[category] = dict(self.theme[category])
+                continue
+            assets = self.assets_by_category.get(category, ())
+            if assets and assets[0].group is None:
+                section[category] = [a.name for a in assets]
+            else:
+                groups: Dict[str, List[str]] = {}
+                for asset in assets:
+                    groups.setdefault(asset.group, []).append(asset.name)
+                section[category] = groups
+        return section
+
+    @staticmethod
+    def _nested(records) -> dict:
+        section: Dict[str, Dict[str, List[str]]] = {}
+        for record in records:
+            section.setdefault(record.group, {}).setdefault(record.kind, []).append(record.name)
+        return section
+
+    def components_section(self) -> dict:
+        """Rebuild the nested components section of the data file"""
+        return self._nested(self.components)
+
+    def integrations_section(self) -> dict:
+        """Rebuild the nested integrations section of the data file"""
+        return self._nested(self.integrations)
+
+
+def _check_str(problems: List[str], where: str, value) -> bool:
+    if not isinstance(value, str) or not value.strip():
+        problems.append(f"{where}: expected a non-empty string, got {value!r}")
+        return False
+    return True
+
+
+def _check_str_list(problems: List[str], where: str, value) -> bool:
+    if not isinstance(value, list):
+        problems.append(f"{where}: expected a list of strings, got {type(value).__name__}")
+        return False
+    ok = True
+    for i, item in enumerate(value):
+        ok = _check_str(problems, f"{where}[{i}]", item) and ok
+    return ok
+
+
+def _load_screens(raw, problems: List[str]) -> List[Screen]:
+    screens = []
+    seen = set()
+    if not isinstance(raw, list):
+        problems.append("screens: expected a list")
+        return screens
+    for i, row in enumerate(raw):
+        where = f"screens[{i}]"
+        if not isinstance(row, dict):
+            problems.append(f"{where}: expected an object")
+            continue
+        missing = [field for field in SCREEN_FIELDS if field not in row]
+        unknown = [field for field in row if field not in SCREEN_FIELDS]
+        if missing:
+            problems.append(f"{where}: missing {', '.join(missing)}")
+        if unknown:
+            problems.append(f"{where}: unknown {', '.join(unknown)}")
+        if missing:
+            continue
+        ok = all([_check_str(problems, f"{where}.{field}", row[field])
+                  for field in SCREEN_FIELDS if field not in SCREEN_LIST_FIELDS])
+        ok = all([_check_str_list(problems, f"{where}.{field}", row[field])
+                  for field in SCREEN_LIST_FIELDS]) and ok
+        if not ok:
+            continue
+        if row['screen_name'] in seen:
+            problems.append(f"{where}: duplicate screen_name {row['screen_name']!r}")
+            continue
+        seen.add(row['screen_name'])
+        screens.append(Screen(
+            name=row['screen_name'],
+            category=row['category'],
+            description=row['description'],
+            components=tuple(row['components']),
+            integrations=tuple(row['integrations']),
+            functions=tuple(row['functions']),
+            assets=tuple(row['assets']),
+            navigation_from=row['navigation_from'],
+            navigation_to=row['navigation_to'],
+        ))
+    return screens
+
+
+def _load_assets(raw, problems: List[str]):
+    assets: List[Asset] = []
+    theme: Dict[str, Dict[str, str]] = {}
+    layout: List[str] = []
+    if not isinstance(raw, dict):
+        problems.append("assets: expected an object")
+        return assets, theme, layout
+    for category, value in raw.items():
+        where = f"assets.{category}"
+        layout.append(category)
+        if isinstance(value, list):
+            if _check_str_list(problems, where, value):
+                assets.extend(Asset(name, category, None) for name in value)
+        elif isinstance(value, dict) and all(isinstance(v, str) for v in value.values()):
+            theme[category] = dict(value)
+        elif isinstance(value, dict):
+            for group, names in value.items():
+                if _check_str_list(problems, f"{where}.{group}", names):
+                    assets.extend(Asset(name, category, group) for name in names)
+        else:
+            problems.append(f"{where}: expected a list, an object of lists or an object of strings")
+    return assets, theme, layout
+
+
+def _load_grouped(section: str, raw, record_type, problems: List[str]) -> list:
+    records = []
+    if not isinstance(raw, dict):
+        problems.append(f"{section}: expected an object")
+        return records
+    for group, kinds in raw.items():
+        if not isinstance(kinds, dict):
+            problems.append(f"{section}.{group}: expected an object of lists")
+            continue
+        for kind, names in kinds.items():
+            if _check_str_list(problems, f"{section}.{group}.{kind}", names):
+                records.extend(record_type(name, group, kind) for name in names)
+    return records
+
+
+def load_spec(path: Union[str, Path] = SPEC_PATH) -> AppSpec:
+    """
+    Load and validate the specification data file
+
+    Raises:
+        SpecError: listing every structural problem in the file
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    problems: List[str] = []
+    for field in ('app_name', 'platform'):
+        _check_str(problems, field, raw.get(field))
+    _check_str_list(problems, 'main_categories', raw.get('main_categories', []))
+    screens = _load_screens(raw.get('screens'), problems)
+    assets, theme, asset_layout = _load_assets(raw.get('assets'), problems)
+    components = _load_grouped('components', raw.get('components'), Component, problems)
+    integrations = _load_grouped('integrations', raw.get('integrations'), Integration, problems)
+    if problems:
+        raise SpecError(problems)
+
+    return AppSpec(raw['app_name'], raw['platform'], raw.get('main_categories', []),
+                   screens, assets, theme, components, integrations, asset_layout)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+SQLite export of the app specification, with a small query API.
+
+The screen lists (components, integrations, functions, assets) become
+name tables joined to screens through link tables, indexed in both
+directions, so "which screens use Cloud Firestore" is an index lookup
+instead of splitting comma-joined CSV cells. The component, integration
+and asset catalogs of the specification are kept alongside, and screen
+names, categories and descriptions are full-text indexed (FTS5).
+
+Example:
+    python spec_sqlite.py --integration "Cloud Firestore"
+    python spec_sqlite.py --search "measurement OR fitting"
+"""
+
+import argparse
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from spec_model import AppSpec, load_spec
+
+DEFAULT_DB = 'tailoring_app_spec.db'
+
+# screen list field -> (name table, link table, link column)
+LINKS = {
+    'components': ('components', 'screen_components', 'component_id'),
+    'integrations': ('integrations', 'screen_integrations', 'integration_id'),
+    'functions': ('functions', 'screen_functions', 'function_id'),
+    'assets': ('assets', 'screen_assets', 'asset_id'),
+}
+
+SCHEMA = """
+CREATE TABLE screens (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    navigation_from TEXT NOT NULL,
+    navigation_to TEXT NOT NULL
+);
+CREATE INDEX screens_category ON screens (category);
+
+CREATE TABLE component_catalog (
+    component_id INTEGER NOT NULL REFERENCES components (id),
+    group_name TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX component_catalog_component ON component_catalog (component_id);
+CREATE INDEX component_catalog_group ON component_catalog (group_name, kind);
+
+CREATE TABLE integration_catalog (
+    integration_id INTEGER NOT NULL REFERENCES integrations (id),
+    group_name TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX integration_catalog_integration ON integration_catalog (integration_id);
+CREATE INDEX integration_catalog_group ON integration_catalog (group_name, kind);
+
+CREATE TABLE asset_catalog (
+    asset_id INTEGER NOT NULL REFERENCES assets (id),
+    category TEXT NOT NULL,
+    group_name TEXT
+);
+CREATE INDEX asset_catalog_asset ON asset_catalog (asset_id);
+CREATE INDEX asset_catalog_category ON asset_catalog (category, group_name);
+
+CREATE TABLE theme_tokens (
+    section TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (section, name)
+) WITHOUT ROWID;
+"""
+
+NAME_TABLE = """
+CREATE TABLE {table} (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE {link} (
+    screen_id INTEGER NOT NULL REFERENCES screens (id),
+    {column} INTEGER NOT NULL REFERENCES {table} (id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (screen_id, {column})
+) WITHOUT ROWID;
+CREATE INDEX {link}_reverse ON {link} ({column}, screen_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE screens_fts USING fts5 (
+    name, category, description, content='screens', content_rowid='id'
+);
+INSERT INTO screens_fts (rowid, name, category, description)
+    SELECT id, name, category, description FROM screens;
+"""
+
+
+def _fts5_available(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5 (x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def export_spec(spec: AppSpec, path: Union[str, Path] = DEFAULT_DB) -> Path:
+    """
+    Write the specification to a fresh SQLite database
+
+    The database is built next to the target and moved into place, so
+    readers never see a half-written file.
+
+    Args:
+        spec: Loaded specification
+        path: Database file to create or replace
+
+    Returns:
+        Path of the written database
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        with conn:
+            conn.executescript(SCHEMA)
+            for table, link, column in LINKS.values():
+                conn.executescript(NAME_TABLE.format(table=table, link=link, column=column))
+
+            conn.executemany(
+                "INSERT INTO screens (id, name, category, description, navigation_from, navigation_to)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(i, s.name, s.category, s.description, s.navigation_from, s.navigation_to)
+                 for i, s in enumerate(spec.screens, 1)])
+
+            # Every name gets an id up front; catalog names join screen names
+            names: Dict[str, Dict[str, int]] = {table: {} for table, _, _ in LINKS.values()}
+
+            def name_id(table: str, name: str) -> int:
+                ids = names[table]
+                return ids.setdefault(name, len(ids) + 1)
+
+            links = {field: [] for field in LINKS}
+            for screen_id, screen in enumerate(spec.screens, 1):
+                for field in LINKS:
+                    table = LINKS[field][0]
+                    for position, name in enumerate(dict.fromkeys(getattr(screen, field))):
+                        links[field].append((screen_id, name_id(table, name), position))
+            component_catalog = [(name_id('components', c.name), c.group, c.kind) for c in spec.components]
+            integration_catalog = [(name_id('integrations', i.name), i.group, i.kind)
+                                   for i in spec.integrations]
+            asset_catalog = [(name_id('assets', a.name), a.category, a.group) for a in spec.assets]
+
+            for field, (table, link, column) in LINKS.items():
+                conn.executemany(f"INSERT INTO {table} (id, name) VALUES (?, ?)",
+                                 [(i, name) for name, i in names[table].items()])
+                conn.executemany(f"INSERT INTO {link} (screen_id, {column}, position) VALUES (?, ?, ?)",
+                                 links[field])
+            conn.executemany("INSERT INTO component_catalog VALUES (?, ?, ?)", component_catalog)
+            conn.executemany("INSERT INTO integration_catalog VALUES (?, ?, ?)", integration_catalog)
+            conn.executemany("INSERT INTO asset_catalog VALUES (?, ?, ?)", asset_catalog)
+            conn.executemany("INSERT INTO theme_tokens VALUES (?, ?, ?)",
+                             [(section, name, value) for section, tokens in spec.theme.items()
+                              for name, value in tokens.items()])
+            if _fts5_available(conn):
+                conn.executescript(FTS_SCHEMA)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+class SpecDatabase:
+    """Read-only queries over an exported specification database"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB):
+        self.conn = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True)
+        self.has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'screens_fts'").fetchone() is not None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "SpecDatabase":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """Run arbitrary SQL and return all rows"""
+        return self.conn.execute(sql, params).fetchall()
+
+    def _screens_using(self, field: str, name: str) -> List[str]:
+        table, link, column = LINKS[field]
+        rows = self.conn.execute(
+            f"SELECT s.name FROM {table} t"
+            f" JOIN {link} l ON l.{column} = t.id"
+            f" JOIN screens s ON s.id = l.screen_id"
+            f" WHERE t.name = ? ORDER BY s.id", (name,))
+        return [row[0] for row in rows]
+
+    def _linked_to_screen(self, field: str, screen: str) -> List[str]:
+        table, link, column = LINKS[field]
+        rows = self.conn.execute(
+            f"SELECT t.name FROM screens s"
+            f" JOIN {link} l ON l.screen_id = s.id"
+            f" JOIN {table} t ON t.id = l.{column}"
+            f" WHERE s.name = ? ORDER BY l.position", (screen,))
+        return [row[0] for row in rows]
+
+    def screens_using_integration(self, name: str) -> List[str]:
+        return self._screens_using('integrations', name)
+
+    def screens_using_component(self, name: str) -> List[str]:
+        return self._screens_using('components', name)
+
+    def screens_using_function(self, name: str) -> List[str]:
+        return self._screens_using('functions', name)
+
+    def screens_using_asset(self, name: str) -> List[str]:
+        return self._screens_using('assets', name)
+
+    def integrations_of(self, screen: str) -> List[str]:
+        return self._linked_to_screen('integrations', screen)
+
+    def components_of(self, screen: str) -> List[str]:
+        return self._linked_to_screen('components', screen)
+
+    def functions_of(self, screen: str) -> List[str]:
+        return self._linked_to_screen('functions', screen)
+
+    def assets_of(self, screen: str) -> List[str]:
+        return self._linked_to_screen('assets', screen)
+
+    def screens_in_category(self, category: str) -> List[str]:
+        rows = self.conn.execute("SELECT name FROM screens WHERE category = ? ORDER BY id", (category,))
+        return [row[0] for row in rows]
+
+    def usage(self, field: str) -> List[Tuple[str, int]]:
+        """(name, screen count) for components/integrations/functions/assets, most used first"""
+        table, link, column = LINKS[field]
+        return self.query(
+            f"SELECT t.name, COUNT(l.screen_id) AS uses FROM {table} t"
+            f" LEFT JOIN {link} l ON l.{column} = t.id"
+            f" GROUP BY t.id ORDER BY uses DESC, t.name")
+
+    def search(self, text: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        (screen, category) matching a full-text query, best match first
+
+        Uses FTS5 syntax (``measurement OR fitting``, ``"order summary"``);
+        text that is not a valid query (``order-summary``) is searched as
+        quoted terms instead. Falls back to a substring match when SQLite
+        lacks FTS5.
+        """
+        if self.has_fts:
+            sql = ("SELECT s.name, s.category FROM screens_fts f JOIN screens s ON s.id = f.rowid"
+                   " WHERE screens_fts MATCH ? ORDER BY bm25(screens_fts) LIMIT ?")
+            try:
+                return self.query(sql, (text, limit))
+            except sqlite3.OperationalError:
+                terms = ' '.join('"' + term.replace('"', '""') + '"' for term in text.split())
+                return self.query(sql, (terms, limit)) if terms else []
+        pattern = f"%{text}%"
+        return self.query(
+            "SELECT name, category FROM screens WHERE name LIKE ? OR description LIKE ?"
+            " ORDER BY id LIMIT ?", (pattern, pattern, limit))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the app specification to SQLite and query it")
+    parser.add_argument('--db', default=DEFAULT_DB, help=f"Database file (default: {DEFAULT_DB})")
+    parser.add_argument('--no-export', action='store_true', help="Query the existing database only")
+    parser.add_argument('--integration', help="List screens using this integration")
+    parser.add_argument('--component', help="List screens using this component")
+    parser.add_argument('--function', help="List screens calling this function")
+    parser.add_argument('--asset', help="List screens using this asset")
+    parser.add_argument('--search', help="Full-text search over screen names and descriptions")
+    args = parser.parse_args()
+
+    if not args.no_export:
+        spec = load_spec()
+        export_spec(spec, args.db)
+        print(f"✓ Exported {spec.total_screens} screens to {args.db}")
+
+    with SpecDatabase(args.db) as db:
+        lookups = [
+            (args.integration, db.screens_using_integration),
+            (args.component, db.screens_using_component),
+            (args.function, db.screens_using_function),
+            (args.asset, db.screens_using_asset),
+        ]
+        for name, lookup in lookups:
+            if name:
+                screens = lookup(name)
+                print(f"\n🔍 {name}: {len(screens)} screens")
+                for screen in screens:
+                    print(f"  - {screen}")
+        if args.search:
+            results = db.search(args.search)
+            print(f"\n🔍 '{args.search}': {len(results)} matches")
+            for screen, category in results:
+                print(f"  - {screen} ({category})")
+        if not any(name for name, _ in lookups) and not args.search:
+            print("\nMost used integrations:")
+            for name, uses in db.usage('integrations')[:10]:
+                print(f"  - {name}: {uses} screens")
+
+
+if __name__ == "__main__":
+    main()
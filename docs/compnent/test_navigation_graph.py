@@ -0,0 +1,67 @@
+import pytest
+
+from navigation_graph import NavigationGraph, ScreenResolver
+from spec_model import AppSpec, Screen
+
+
+def _spec(*screens):
+    return AppSpec('App', 'Flutter', [], [
+        Screen(name, 'Main', '', (), (), (), (), navigation_from, navigation_to)
+        for name, navigation_from, navigation_to in screens
+    ], [], {}, [], [], [])
+
+
+@pytest.mark.parametrize('reference, expected', [
+    ('Home', 'Home Screen'),
+    ('home screen', 'Home Screen'),
+    ('Orders', 'Orders History Screen'),
+    ('Order Summary', 'Order Summary Screen'),
+    ('Order', None),  # "Order Summary" and "Orders History" are equally close
+    ('Checkout', None),
+    ('', None),
+])
+def test_screen_resolver(reference, expected):
+    resolver = ScreenResolver(['Home Screen', 'Orders History Screen', 'Order Summary Screen'])
+    assert resolver.resolve(reference) == expected
+
+
+@pytest.fixture
+def graph():
+    return NavigationGraph(_spec(
+        ('Splash Screen', '', 'Onboarding/Login'),
+        ('Onboarding Screen', 'Splash', 'Login'),
+        ('Login Screen', 'Splash/Onboarding', 'Home'),
+        ('Home Screen', 'Login/Settings', 'Settings/Help Center'),
+        ('Settings Screen', 'Home', 'Home'),
+        ('Hidden Screen', '', 'Home'),
+    ))
+
+
+def test_edges_depth_and_paths(graph):
+    assert graph.edge_count == 7
+    assert graph.depth == [0, 1, 1, 2, 3, None]
+    assert graph.shortest_path('Settings Screen') == [
+        'Splash Screen', 'Login Screen', 'Home Screen', 'Settings Screen']
+    assert graph.shortest_path('Hidden Screen') is None
+    assert graph.shortest_path('Home Screen', source='Hidden Screen') == ['Hidden Screen', 'Home Screen']
+
+
+def test_unreachable_dead_ends_cycles_and_unresolved(graph):
+    assert graph.unreachable() == ['Hidden Screen']
+    assert graph.dead_ends() == []
+    assert graph.cycles() == [['Home Screen', 'Settings Screen']]
+    assert graph.unresolved == {'Home Screen': ['Help Center']}
+
+
+def test_unknown_entry_screen():
+    with pytest.raises(ValueError):
+        NavigationGraph(_spec(('Home Screen', '', '')))
+
+
+def test_csv_report(graph, tmp_path):
+    path = tmp_path / 'navigation.csv'
+    graph.write_csv(str(path))
+    lines = path.read_text().splitlines()
+    assert lines[0].startswith('screen_name,category,depth,reachable')
+    assert 'Splash Screen > Login Screen > Home Screen > Settings Screen' in lines[5]
+    assert lines[6].startswith('Hidden Screen,Main,,False')
@@ -0,0 +1,64 @@
+from dart_index import DartIndex
+from spec_coverage import match_spec, spec_classes, unspecified_classes, write_report
+from spec_model import AppSpec, Component, Screen
+
+LIB = {
+    'view/design_canvas.dart': 'class DesignCanvas extends StatefulWidget {}\n',
+    'view/auth/login_page.dart': 'class LoginPage extends StatelessWidget {}\n',
+    'view/home/home_view.dart': 'class HomeView {}\n',
+    'core/order_cubit.dart': 'class OrderCubit extends Cubit<int> {}\nclass _Hidden extends StatelessWidget {}\n',
+    'product/fabric_painter.dart': 'class FabricPainter extends CustomPainter {}\n',
+}
+
+
+def _screen(name, category):
+    return Screen(name, category, '', (), (), (), (), '', '')
+
+
+def _setup(tmp_path):
+    for path, source in LIB.items():
+        (tmp_path / 'lib' / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / 'lib' / path).write_text(source)
+    spec = AppSpec('App', 'Flutter', [], [
+        _screen('Login Screen', 'Authentication'),
+        _screen('Home Screen', 'Main'),
+        _screen('AR try-on screen', 'Virtual Fitting'),
+    ], [], {}, [
+        Component('DesignCanvas', 'design_studio', 'widgets'),
+        Component('MeasurementGuide', 'fitting', 'widgets'),
+        Component('DesignCanvas', 'other', 'widgets'),
+    ], [], [])
+    return spec, DartIndex(tmp_path / 'lib', None, workers=1).build()
+
+
+def test_spec_classes(tmp_path):
+    spec, _ = _setup(tmp_path)
+    assert [(c.name, c.group, c.kind) for c in spec_classes(spec)] == [
+        ('DesignCanvas', 'design_studio', 'widgets'),
+        ('MeasurementGuide', 'fitting', 'widgets'),
+        ('LoginScreen', 'Authentication', 'screens'),
+        ('HomeScreen', 'Main', 'screens'),
+        ('ARTryOnScreen', 'Virtual Fitting', 'screens'),
+    ]
+
+
+def test_match_spec_and_unspecified(tmp_path):
+    spec, index = _setup(tmp_path)
+    coverage = match_spec(spec, index)
+    assert [(item.spec.name, item.status, item.declaration and item.declaration.name)
+            for item in coverage] == [
+        ('DesignCanvas', 'implemented', 'DesignCanvas'),
+        ('MeasurementGuide', 'missing', None),
+        ('LoginScreen', 'renamed', 'LoginPage'),
+        # HomeView is not a widget, so it does not stand in for HomeScreen
+        ('HomeScreen', 'missing', None),
+        ('ARTryOnScreen', 'missing', None),
+    ]
+    assert [d.name for d in unspecified_classes(index, coverage)] == ['OrderCubit', 'FabricPainter']
+
+    report = tmp_path / 'coverage.csv'
+    write_report(str(report), index, coverage, unspecified_classes(index, coverage))
+    lines = report.read_text().splitlines()
+    assert lines[0] == 'class_name,status,spec_group,spec_kind,dart_class,role,path'
+    assert lines[3] == 'LoginScreen,renamed,Authentication,screens,LoginPage,stateless,lib/view/auth/login_page.dart:1'
+    assert lines[6].startswith('OrderCubit,unspecified,,,OrderCubit,cubit,lib/core/order_cubit.dart:1')
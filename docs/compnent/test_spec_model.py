@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from spec_model import SPEC_PATH, SpecError, load_spec
+
+
+def _screen(name, **fields):
+    row = {'screen_name': name, 'category': 'Main', 'description': 'A screen',
+           'components': [], 'integrations': [], 'functions': [], 'assets': [],
+           'navigation_from': 'Splash', 'navigation_to': 'Home'}
+    row.update(fields)
+    return row
+
+
+def _write(tmp_path, **overrides):
+    data = {
+        'app_name': 'Tailor', 'platform': 'Flutter', 'main_categories': ['Main'],
+        'screens': [_screen('Home Screen', assets=['app_logo.png'], integrations=['auth', 'auth'])],
+        'assets': {
+            'images': {'logos': ['app_logo.png']},
+            'fonts': {'primary': 'Poppins'},
+            'audio': ['tap.mp3'],
+        },
+        'components': {'design_studio': {'widgets': ['DesignCanvas']}},
+        'integrations': {'firebase': {'services': ['auth']}},
+    }
+    data.update(overrides)
+    path = tmp_path / 'app_spec.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return path, data
+
+
+def test_round_trip_of_the_real_spec():
+    with open(SPEC_PATH, encoding='utf-8') as f:
+        raw = json.load(f)
+    spec = load_spec()
+    assert [screen.to_row() for screen in spec.screens] == raw['screens']
+    assert spec.assets_section() == raw['assets']
+    assert spec.components_section() == raw['components']
+    assert spec.integrations_section() == raw['integrations']
+
+
+def test_indexes_and_theme(tmp_path):
+    path, data = _write(tmp_path)
+    spec = load_spec(path)
+    home = spec.screens_by_name['Home Screen']
+    assert spec.screens_by_asset == {'app_logo.png': (home,)}
+    assert spec.screens_by_integration == {'auth': (home,)}
+    assert spec.theme == {'fonts': {'primary': 'Poppins'}}
+    assert [asset.group for asset in spec.assets] == ['logos', None]
+    assert spec.components_by_kind['widgets'][0].group == 'design_studio'
+    assert spec.assets_section() == data['assets']
+
+
+def test_every_problem_is_reported(tmp_path):
+    path, _ = _write(tmp_path, platform='', screens=[
+        _screen('Home Screen'),
+        _screen('Home Screen'),
+        _screen('Cart Screen', assets='cart.png', extra=1),
+        {'screen_name': 'Broken'},
+    ], components={'design_studio': ['DesignCanvas']})
+    with pytest.raises(SpecError) as error:
+        load_spec(path)
+    problems = error.value.problems
+    assert problems[0].startswith('platform: expected a non-empty string')
+    assert "screens[1]: duplicate screen_name 'Home Screen'" in problems
+    assert 'screens[2]: unknown extra' in problems
+    assert 'screens[2].assets: expected a list of strings, got str' in problems
+    assert any(p.startswith('screens[3]: missing category') for p in problems)
+    assert 'components.design_studio: expected an object of lists' in problems
+    assert isinstance(error.value, ValueError)
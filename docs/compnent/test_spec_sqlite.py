@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from spec_model import load_spec
+from spec_sqlite import SpecDatabase, export_spec
+
+
+@pytest.fixture(scope='module')
+def spec():
+    return load_spec()
+
+
+@pytest.fixture(scope='module')
+def db(spec, tmp_path_factory):
+    path = export_spec(spec, tmp_path_factory.mktemp('spec') / 'spec.db')
+    with SpecDatabase(path) as database:
+        yield database
+
+
+def test_queries_agree_with_the_spec_indexes(spec, db):
+    for screen in spec.screens:
+        assert db.components_of(screen.name) == list(dict.fromkeys(screen.components))
+        assert db.integrations_of(screen.name) == list(dict.fromkeys(screen.integrations))
+        assert db.assets_of(screen.name) == list(dict.fromkeys(screen.assets))
+    for name, screens in spec.screens_by_integration.items():
+        assert db.screens_using_integration(name) == [screen.name for screen in screens]
+    for name, screens in spec.screens_by_function.items():
+        assert db.screens_using_function(name) == [screen.name for screen in screens]
+    for category, screens in spec.screens_by_category.items():
+        assert db.screens_in_category(category) == [screen.name for screen in screens]
+    usage = dict(db.usage('components'))
+    assert usage == {name: len(spec.screens_by_component.get(name, ()))
+                     for name in {*spec.screens_by_component, *(c.name for c in spec.components)}}
+
+
+def test_export_replaces_an_open_database(spec, tmp_path):
+    path = tmp_path / 'spec.db'
+    export_spec(spec, path)
+    with SpecDatabase(path) as first:
+        export_spec(spec, path)
+        assert first.screens_in_category(spec.screens[0].category)
+    assert not (tmp_path / 'spec.db.tmp').exists()
+    with SpecDatabase(path) as again:
+        assert again.query("SELECT COUNT(*) FROM screens") == [(len(spec.screens),)]
+
+
+def test_search_accepts_fts_syntax(db):
+    if not db.has_fts:
+        pytest.skip("SQLite was built without FTS5")
+    assert db.search('measurement OR fitting')
+    with pytest.raises(sqlite3.OperationalError):
+        db.query("SELECT rowid FROM screens_fts WHERE screens_fts MATCH ?", ('order-summary',))
+
+
+@pytest.mark.parametrize('text', ['order-summary', 'AND', '"unbalanced', 'size:large', '(', '   '])
+def test_search_survives_invalid_queries(db, text):
+    assert isinstance(db.search(text), list)
+
+
+def test_search_hyphenated_matches_both_words(db):
+    assert db.search('order-summary') == db.search('"order" "summary"')
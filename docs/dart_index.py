@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Lightweight symbol index of the Dart sources under lib/.
+
+Every .dart file is reduced to its type declarations (class, mixin, enum):
+name, superclass, mixins, interfaces, line number and the project-style
+names (Capitalized) its body constructs or accesses; the file's import,
+export and part directives are kept alongside. Files are parsed in
+a process pool and the per-file results are cached by mtime and size, so
+a rebuild only re-reads the files that changed.
+
+Example:
+    python dart_index.py ../lib --role stateful
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+LIB_DIR = Path(__file__).resolve().parent.parent / 'lib'
+DEFAULT_CACHE = Path(__file__).resolve().with_name('.dart-index-cache.json')
+
+# Generated code is rebuilt by build_runner and never part of the design
+GENERATED_SUFFIXES = ('.g.dart', '.freezed.dart', '.mocks.dart', '.gr.dart')
+
+# Fewer changed files than this are parsed in-process
+PARALLEL_THRESHOLD = 64
+
+# Framework base classes that give a declared class its role
+ROLE_BY_SUPERCLASS = {
+    'StatelessWidget': 'stateless',
+    'StatefulWidget': 'stateful',
+    'State': 'state',
+    'ConsumerWidget': 'stateless',
+    'ConsumerStatefulWidget': 'stateful',
+    'ConsumerState': 'state',
+    'Cubit': 'cubit',
+    'Bloc': 'bloc',
+    'CustomPainter': 'painter',
+    'InheritedWidget': 'inherited',
+    'ChangeNotifier': 'notifier',
+}
+WIDGET_ROLES = ('stateless', 'stateful', 'inherited')
+
+DECLARATION_PATTERN = re.compile(
+    r'^[ \t]*(?P<modifiers>(?:(?:abstract|sealed|final|base|interface|mixin)\s+)*)'
+    r'(?P<keyword>class|mixin|enum)\s+(?P<name>[A-Za-z_$][\w$]*)',
+    re.MULTILINE
+)
+TYPE_NAME_PATTERN = re.compile(r'[A-Za-z_$][\w$.]*')
+# Foo(...), const Foo<T>(...), Foo.named(...), Foo.staticMember
+USE_PATTERN = re.compile(r'(?<![\w$.@])(_?[A-Z][\w$]*)\s*(?:<[^;{}()]*?>)?\s*[.(]')
+BRACE_PATTERN = re.compile(r'[{}]')
+# import 'uri' ...; export 'uri' ...; part 'uri'; (not "part of")
+DIRECTIVE_PATTERN = re.compile(r'^[ \t]*(import|export|part)\s+([\'"])([^\'"\n]+)\2', re.MULTILINE)
+
+
+class DartClass(NamedTuple):
+    name: str
+    kind: str  # "class", "mixin" or "enum"
+    path: str  # '/'-separated, relative to the indexed root
+    line: int
+    abstract: bool
+    superclass: Optional[str]  # without type arguments, e.g. "Cubit"
+    mixins: Tuple[str, ...]
+    interfaces: Tuple[str, ...]
+    uses: Tuple[str, ...]  # names constructed or accessed in the body, first use first
+
+    @property
+    def private(self) -> bool:
+        return self.name.startswith('_')
+
+
+class DartDirective(NamedTuple):
+    kind: str  # "import", "export" or "part"
+    uri: str  # as written, e.g. "package:tailorapp/core/models/order_model.dart"
+    line: int
+
+
+def strip_comments(source: str, blank_strings: bool = False) -> str:
+    """
+    Blank out // and /* */ comments, keeping string literals and line numbers
+
+    Args:
+        source: Dart source text
+        blank_strings: Blank string literals as well, so braces and names
+            inside them are not mistaken for code
+
+    Returns:
+        Source of the same length with comment characters replaced by spaces
+    """
+    out = []
+    i, n = 0, len(source)
+    while i < n:
+        ch = source[i]
+        if ch == '/' and source.startswith('//', i):
+            end = source.find('\n', i)
+            end = n if end == -1 else end
+            out.append(' ' * (end - i))
+            i = end
+        elif ch == '/' and source.startswith('/*', i):
+            # Dart block comments nest
+            depth, j = 1, i + 2
+            while j < n and depth:
+                if source.startswith('/*', j):
+                    depth, j = depth + 1, j + 2
+                elif source.startswith('*/', j):
+                    depth, j = depth - 1, j + 2
+                else:
+                    j += 1
+            out.append(re.sub(r'[^\n]', ' ', source[i:j]))
+            i = j
+        elif ch in '\'"':
+            raw = i > 0 and source[i - 1] == 'r'
+            quote = source[i:i + 3] if source.startswith(ch * 3, i) else ch
+            j = i + len(quote)
+            while j < n and not source.startswith(quote, j):
+                if source[j] == '\\' and not raw:
+                    j += 1
+                elif source[j] == '\n' and len(quote) == 1:
+                    break
+                j += 1
+            j = min(j + len(quote), n)
+            out.append(re.sub(r'[^\n]', ' ', source[i:j]) if blank_strings else source[i:j])
+            i = j
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+def _skip_type_arguments(text: str, start: int) -> int:
+    """Index just past a balanced <...> beginning at start (or start itself)"""
+    if start >= len(text) or text[start] != '<':
+        return start
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == '<':
+            depth += 1
+        elif text[i] == '>':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(text)
+
+
+def _block_end(text: str, start: int) -> int:
+    """Index just past the {...} block opening at start"""
+    depth = 0
+    for match in BRACE_PATTERN.finditer(text, start):
+        depth += 1 if match.group() == '{' else -1
+        if depth == 0:
+            return match.end()
+    return len(text)
+
+
+def _type_list(clause: str) -> Tuple[str, ...]:
+    """Top-level type names of a comma-separated clause, type arguments dropped"""
+    names, i = [], 0
+    while i < len(clause):
+        match = TYPE_NAME_PATTERN.match(clause, i)
+        if match is None:
+            i += 1
+            continue
+        names.append(match.group().rsplit('.', 1)[-1])
+        i = _skip_type_arguments(clause, match.end())
+    return tuple(names)
+
+
+def parse_declarations(source: str, path: str = '') -> List[DartClass]:
+    """
+    Extract type declarations from Dart source
+
+    Args:
+        source: Dart source text
+        path: Path recorded on each declaration
+
+    Returns:
+        Declarations in source order
+    """
+    code = strip_comments(source, blank_strings=True)
+    declarations = []
+    for match in DECLARATION_PATTERN.finditer(code):
+        # The header runs up to the body, or ';' for "class A = B with C;"
+        header_start = _skip_type_arguments(code, match.end())
+        header_end = len(code)
+        for terminator in '{;':
+            found = code.find(terminator, header_start)
+            if found != -1:
+                header_end = min(header_end, found)
+        header = ' ' + code[header_start:header_end].strip()
+        body = code[header_end:_block_end(code, header_end)] if code.startswith('{', header_end) else ''
+        name = match.group('name')
+        clauses = dict.fromkeys(('extends', 'with', 'implements', 'on', '='), '')
+        for part in re.split(r'\s(?=(?:extends|with|implements|on|=)\s)', header):
+            keyword, _, rest = part.strip().partition(' ')
+            if keyword in clauses:
+                clauses[keyword] = rest
+        supers = _type_list(clauses['extends'] or clauses['='])
+        declarations.append(DartClass(
+            name=name,
+            kind='mixin' if match.group('keyword') == 'mixin' else match.group('keyword'),
+            path=path,
+            line=code.count('\n', 0, match.start('keyword')) + 1,
+            abstract='abstract' in match.group('modifiers').split(),
+            superclass=supers[0] if supers else None,
+            mixins=_type_list(clauses['with']),
+            interfaces=_type_list(clauses['implements']),
+            uses=tuple(dict.fromkeys(use for use in USE_PATTERN.findall(body) if use != name)),
+        ))
+    return declarations
+
+
+def parse_directives(source: str) -> List[DartDirective]:
+    """
+    Extract import, export and part directives from Dart source
+
+    Args:
+        source: Dart source text
+
+    Returns:
+        Directives in source order
+    """
+    code = strip_comments(source)
+    return [DartDirective(match.group(1), match.group(3), code.count('\n', 0, match.start(1)) + 1)
+            for match in DIRECTIVE_PATTERN.finditer(code)]
+
+
+def _index_dart_file(args: Tuple[str, str]) -> Tuple[str, List[list], List[list]]:
+    """Process-pool worker: parse one file into cacheable declaration and directive rows"""
+    file_path, key = args
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+    return (key, [list(declaration) for declaration in parse_declarations(source, key)],
+            [list(directive) for directive in parse_directives(source)])
+
+
+def walk_dart_files(root: Path, skip_generated: bool = True) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Yield (path, stat) for every .dart file under root, skipping hidden directories"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.name.endswith('.dart') and entry.is_file():
+                if skip_generated and entry.name.endswith(GENERATED_SUFFIXES):
+                    continue
+                yield Path(entry.path), entry.stat()
+
+
+class DartIndex:
+    """
+    Declarations of every Dart file under a root, with lookups
+
+    Attributes:
+        files: relative path -> declarations in that file
+        directives: relative path -> import/export/part directives of that file
+        classes_by_name: declaration name -> declarations (a name can repeat
+            across files)
+    """
+
+    VERSION = 3
+
+    def __init__(self, root: os.PathLike = LIB_DIR, cache_file: Optional[os.PathLike] = DEFAULT_CACHE,
+                 workers: Optional[int] = None, skip_generated: bool = True):
+        """
+        Args:
+            root: Directory to index (normally the Flutter lib/ directory)
+            cache_file: JSON cache of per-file results; None disables caching
+            workers: Process pool size (default: CPU count)
+            skip_generated: Ignore build_runner output such as *.g.dart
+        """
+        self.root = Path(root).resolve()
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.workers = workers or os.cpu_count() or 1
+        self.skip_generated = skip_generated
+        self.files: Dict[str, List[DartClass]] = {}
+        self.directives: Dict[str, List[DartDirective]] = {}
+        self.classes_by_name: Dict[str, List[DartClass]] = {}
+        self.parsed = 0
+        self.cached = 0
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if self.cache_file is None:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.VERSION or data.get('root') != str(self.root):
+            return {}
+        return data.get('files', {})
+
+    def _save_cache(self, entries: Dict[str, dict]):
+        tmp_path = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'root': str(self.root), 'files': entries},
+                      f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.cache_file)
+
+    def build(self) -> "DartIndex":
+        """Index the tree, re-parsing only files whose mtime or size changed"""
+        cache = self._load_cache()
+        entries: Dict[str, dict] = {}
+        stale: List[Tuple[str, str]] = []
+        for file_path, st in walk_dart_files(self.root, self.skip_generated):
+            key = file_path.relative_to(self.root).as_posix()
+            entry = cache.get(key)
+            if entry is not None and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                entries[key] = entry
+            else:
+                entries[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+                stale.append((str(file_path), key))
+
+        self.parsed, self.cached = len(stale), len(entries) - len(stale)
+        workers = min(self.workers, len(stale))
+        if workers > 1 and len(stale) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_index_dart_file, stale,
+                                        chunksize=max(1, len(stale) // (workers * 4))))
+        else:
+            results = [_index_dart_file(item) for item in stale]
+        for key, rows, directives in results:
+            entries[key]['classes'] = rows
+            entries[key]['directives'] = directives
+
+        if self.cache_file is not None and (stale or len(entries) != len(cache)):
+            self._save_cache(entries)
+
+        # JSON turns the tuple fields into lists
+        self.files = {key: [DartClass(*row[:6], *map(tuple, row[6:])) for row in entry['classes']]
+                      for key, entry in sorted(entries.items())}
+        self.directives = {key: [DartDirective(*row) for row in entry['directives']]
+                           for key, entry in sorted(entries.items())}
+        self.classes_by_name = {}
+        for declarations in self.files.values():
+            for declaration in declarations:
+                self.classes_by_name.setdefault(declaration.name, []).append(declaration)
+        return self
+
+    @property
+    def classes(self) -> Iterator[DartClass]:
+        for declarations in self.files.values():
+            yield from declarations
+
+    def role(self, name: str) -> Optional[str]:
+        """
+        Role of a class ('stateless', 'stateful', 'cubit', ...), following
+        superclasses declared in the index until a framework base is found
+        """
+        seen = set()
+        while name and name not in seen:
+            if name in ROLE_BY_SUPERCLASS:
+                return ROLE_BY_SUPERCLASS[name]
+            seen.add(name)
+            declarations = self.classes_by_name.get(name)
+            if not declarations:
+                return None
+            name = declarations[0].superclass
+        return None
+
+    def with_role(self, roles: Sequence[str]) -> List[DartClass]:
+        """Declarations whose resolved role is one of roles"""
+        return [declaration for declaration in self.classes
+                if declaration.superclass and self.role(declaration.superclass) in roles]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the class declarations of a Dart source tree")
+    parser.add_argument('root', nargs='?', default=str(LIB_DIR), help="Directory to index (default: lib/)")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help="Per-file cache (JSON)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse every file")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--role', action='append', choices=sorted(set(ROLE_BY_SUPERCLASS.values())),
+                        help="Only list classes with this role (repeatable)")
+    args = parser.parse_args()
+
+    index = DartIndex(args.root, None if args.no_cache else args.cache, args.workers).build()
+    print(f"🔍 {len(index.files)} Dart files ({index.parsed} parsed, {index.cached} cached), "
+          f"{sum(1 for _ in index.classes)} declarations")
+    declarations = index.with_role(args.role) if args.role else list(index.classes)
+    for declaration in declarations:
+        role = index.role(declaration.superclass) if declaration.superclass else None
+        extends = f" extends {declaration.superclass}" if declaration.superclass else ''
+        print(f"  {declaration.name}{extends} [{role or declaration.kind}] "
+              f"{declaration.path}:{declaration.line}")
+
+
+if __name__ == "__main__":
+    main()
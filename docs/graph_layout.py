@@ -0,0 +1,457 @@
+"""
+Layout engine for the docs diagrams.
+
+Two layouts, both near-linear and deterministic (ties follow input order,
+so the same graph always gets the same coordinates):
+
+tree_layout()
+    Reingold-Tilford tidy tree drawing with Buchheim, Jünger and Leipert's
+    linear-time improvements of Walker's algorithm. Parents are centred
+    over their children, subtrees are packed as closely as their contours
+    allow and identical subtrees are drawn identically.
+
+layered_layout()
+    Sugiyama-style drawing of a directed graph: cycles are broken by
+    reversing DFS back edges, nodes get longest-path layers, long edges are
+    split by dummy nodes, crossings are reduced with barycenter sweeps
+    (counted in O(E log V) with a Fenwick tree) and x coordinates come
+    from isotonic regression, which pulls nodes towards their neighbours
+    without letting any two in a layer overlap.
+
+Both work iteratively, so deep trees and graphs with thousands of nodes do
+not hit the recursion limit.
+"""
+
+from collections import defaultdict, deque
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+Node = Hashable
+Point = Tuple[float, float]
+
+
+class _TreeNode:
+    __slots__ = ('key', 'parent', 'children', 'number', 'x', 'mod', 'thread', 'ancestor',
+                 'change', 'shift', 'depth', 'default_ancestor')
+
+    def __init__(self, key: Node, parent: Optional["_TreeNode"], number: int, depth: int):
+        self.key = key
+        self.parent = parent
+        self.children: List[_TreeNode] = []
+        self.number = number  # 1-based position among its siblings
+        self.x = 0.0
+        self.mod = 0.0
+        self.thread: Optional[_TreeNode] = None
+        self.ancestor = self
+        self.change = 0.0
+        self.shift = 0.0
+        self.depth = depth
+        self.default_ancestor: Optional[_TreeNode] = None
+
+    def left(self) -> Optional["_TreeNode"]:
+        return self.thread or (self.children[0] if self.children else None)
+
+    def right(self) -> Optional["_TreeNode"]:
+        return self.thread or (self.children[-1] if self.children else None)
+
+    def left_brother(self) -> Optional["_TreeNode"]:
+        if self.parent is None or self.number == 1:
+            return None
+        return self.parent.children[self.number - 2]
+
+    def leftmost_sibling(self) -> Optional["_TreeNode"]:
+        if self.parent is None or self.number == 1:
+            return None
+        return self.parent.children[0]
+
+
+def _move_subtree(wl: _TreeNode, wr: _TreeNode, shift: float):
+    subtrees = wr.number - wl.number
+    wr.change -= shift / subtrees
+    wr.shift += shift
+    wl.change += shift / subtrees
+    wr.x += shift
+    wr.mod += shift
+
+
+def _execute_shifts(v: _TreeNode):
+    shift = change = 0.0
+    for w in reversed(v.children):
+        w.x += shift
+        w.mod += shift
+        change += w.change
+        shift += w.shift + change
+
+
+def _apportion(v: _TreeNode, default_ancestor: _TreeNode,
+               separation: Callable[[Node, Node], float]) -> _TreeNode:
+    """Push v's subtree right until its left contour clears its left siblings'"""
+    w = v.left_brother()
+    if w is None:
+        return default_ancestor
+    vir = vor = v
+    vil = w
+    vol = v.leftmost_sibling()
+    sir = sor = v.mod
+    sil = vil.mod
+    sol = vol.mod
+    while vil.right() is not None and vir.left() is not None:
+        vil = vil.right()
+        vir = vir.left()
+        vol = vol.left()
+        vor = vor.right()
+        vor.ancestor = v
+        shift = (vil.x + sil) - (vir.x + sir) + separation(vil.key, vir.key)
+        if shift > 0:
+            ancestor = vil.ancestor if vil.ancestor.parent is v.parent else default_ancestor
+            _move_subtree(ancestor, v, shift)
+            sir += shift
+            sor += shift
+        sil += vil.mod
+        sir += vir.mod
+        sol += vol.mod
+        sor += vor.mod
+    if vil.right() is not None and vor.right() is None:
+        vor.thread = vil.right()
+        vor.mod += sil - sor
+    else:
+        if vir.left() is not None and vol.left() is None:
+            vol.thread = vir.left()
+            vol.mod += sir - sol
+        default_ancestor = v
+    return default_ancestor
+
+
+def tree_layout(parents: Dict[Node, Optional[Node]],
+                separation: Optional[Callable[[Node, Node], float]] = None,
+                tree_gap: float = 2.0) -> Dict[Node, Point]:
+    """
+    Tidy layout of a forest given as child -> parent
+
+    Args:
+        parents: Every node mapped to its parent (None for roots). Children
+            are ordered as they appear in the mapping; a parent that is not
+            itself a key becomes a root.
+        separation: Minimum horizontal distance between the centres of two
+            neighbouring nodes on one level (default: 1.0 for every pair),
+            e.g. half the sum of their label widths plus a gap
+        tree_gap: Distance between the outermost nodes of neighbouring trees
+
+    Returns:
+        node -> (x, depth); roots have depth 0 and x grows to the right
+    """
+    separation = separation or (lambda a, b: 1.0)
+    order = list(dict.fromkeys(list(parents) + [p for p in parents.values() if p is not None]))
+    children: Dict[Node, List[Node]] = defaultdict(list)
+    roots = []
+    for node in order:
+        parent = parents.get(node)
+        if parent is None:
+            roots.append(node)
+        else:
+            children[parent].append(node)
+
+    # Build the tree records breadth first, so depth never needs recursion
+    forest: List[_TreeNode] = []
+    postorder: List[_TreeNode] = []
+    seen: Set[Node] = set()
+    for root_key in roots:
+        root = _TreeNode(root_key, None, 1, 0)
+        forest.append(root)
+        seen.add(root_key)
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            postorder.append(v)
+            for number, key in enumerate(children.get(v.key, ()), 1):
+                if key in seen:
+                    raise ValueError(f"{key!r} has more than one parent or is part of a cycle")
+                seen.add(key)
+                child = _TreeNode(key, v, number, v.depth + 1)
+                v.children.append(child)
+                stack.append(child)
+    if len(seen) != len(order):
+        cycle = [node for node in order if node not in seen]
+        raise ValueError(f"Parent links form a cycle through {cycle[0]!r}")
+    # The stack pops right children first, so the reversed visiting order has
+    # every subtree before its parent and siblings left to right
+    postorder.reverse()
+
+    # First walk: preliminary x and modifiers, bottom-up
+    for v in postorder:
+        if v.children:
+            _execute_shifts(v)
+            midpoint = (v.children[0].x + v.children[-1].x) / 2
+            w = v.left_brother()
+            if w is not None:
+                v.x = w.x + separation(w.key, v.key)
+                v.mod = v.x - midpoint
+            else:
+                v.x = midpoint
+        else:
+            w = v.left_brother()
+            v.x = w.x + separation(w.key, v.key) if w is not None else 0.0
+        if v.parent is not None:
+            if v.number == 1:
+                v.parent.default_ancestor = v
+            v.parent.default_ancestor = _apportion(v, v.parent.default_ancestor, separation)
+
+    # Second walk: absolute x, top-down; then place trees side by side
+    positions: Dict[Node, Point] = {}
+    offset = 0.0
+    for root in forest:
+        tree: Dict[Node, Point] = {}
+        stack = [(root, 0.0)]
+        while stack:
+            v, m = stack.pop()
+            tree[v.key] = (v.x + m, float(v.depth))
+            for child in v.children:
+                stack.append((child, m + v.mod))
+        left = min(x for x, _ in tree.values())
+        right = max(x for x, _ in tree.values())
+        shift = offset - left
+        for key, (x, y) in tree.items():
+            positions[key] = (x + shift, y)
+        offset += right - left + tree_gap
+    return {node: positions[node] for node in order}
+
+
+class LayeredLayout(NamedTuple):
+    positions: Dict[Node, Point]  # node -> (x, layer)
+    edges: Dict[Tuple[Node, Node], List[Point]]  # (source, target) -> polyline incl. end points
+    layers: List[List[Node]]  # real nodes per layer, left to right
+    reversed_edges: Set[Tuple[Node, Node]]  # edges drawn against the flow to break cycles
+    crossings: int
+
+
+def _break_cycles(succ: List[List[int]]) -> Set[Tuple[int, int]]:
+    """Back edges of an iterative DFS, started from the nodes in input order"""
+    state = [0] * len(succ)  # 1 = on the stack, 2 = done
+    back = set()
+    for start in range(len(succ)):
+        if state[start]:
+            continue
+        state[start] = 1
+        stack = [(start, iter(succ[start]))]
+        while stack:
+            node, it = stack[-1]
+            for target in it:
+                if state[target] == 1:
+                    back.add((node, target))
+                elif not state[target]:
+                    state[target] = 1
+                    stack.append((target, iter(succ[target])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    return back
+
+
+def _count_crossings(upper: Sequence[int], lower_pos: List[int], down: List[List[int]], size: int) -> int:
+    """Crossings between two layers (Barth, Jünger and Mutzel, with a Fenwick tree)"""
+    tree = [0] * (size + 1)
+    crossings = seen = 0
+    for node in upper:
+        for position in sorted(lower_pos[t] for t in down[node]):
+            # Earlier edges that end to the right of this one cross it
+            i, not_greater = position + 1, 0
+            while i > 0:
+                not_greater += tree[i]
+                i -= i & -i
+            crossings += seen - not_greater
+            seen += 1
+            i = position + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+    return crossings
+
+
+def _isotonic(desired: List[float], offsets: List[float]) -> List[float]:
+    """
+    Closest positions (least squares) to desired whose distances to the first
+    position are at least offsets
+
+    Solved exactly with pool-adjacent-violators on desired minus offsets,
+    in linear time.
+    """
+    means: List[float] = []
+    counts: List[int] = []
+    for d, o in zip(desired, offsets):
+        mean, count = d - o, 1
+        while means and means[-1] > mean:
+            prev_count = counts.pop()
+            mean = (means.pop() * prev_count + mean * count) / (prev_count + count)
+            count += prev_count
+        means.append(mean)
+        counts.append(count)
+    fitted = []
+    for mean, count in zip(means, counts):
+        fitted.extend([mean] * count)
+    return [f + o for f, o in zip(fitted, offsets)]
+
+
+def layered_layout(nodes: Iterable[Node], edges: Iterable[Tuple[Node, Node]],
+                   sweeps: int = 8, width: Optional[Callable[[Node], float]] = None,
+                   node_gap: float = 1.0, dummy_width: float = 0.0,
+                   coordinate_passes: int = 4) -> LayeredLayout:
+    """
+    Sugiyama-style layered layout of a directed graph
+
+    Args:
+        nodes: Graph nodes; their order breaks every tie
+        edges: (source, target) pairs; unknown endpoints are added as nodes,
+            self loops and duplicates are ignored
+        sweeps: Down/up barycenter sweeps for crossing reduction (the
+            ordering with the fewest crossings seen is kept)
+        width: Node width for spacing (default: 0, i.e. unit spacing)
+        node_gap: Minimum free space between neighbours in a layer
+        dummy_width: Width reserved for a long edge passing through a layer
+        coordinate_passes: Down/up passes pulling nodes towards neighbours
+
+    Returns:
+        LayeredLayout with node positions as (x, layer), layer 0 on top
+    """
+    # Work on integer ids: real nodes first, dummy nodes appended after them
+    ids: Dict[Node, int] = {node: i for i, node in enumerate(dict.fromkeys(nodes))}
+    edge_list: List[Tuple[Node, Node]] = []
+    for source, target in dict.fromkeys(edges):
+        ids.setdefault(source, len(ids))
+        ids.setdefault(target, len(ids))
+        if source != target:
+            edge_list.append((source, target))
+    keys = list(ids)
+    n = len(keys)
+    succ: List[List[int]] = [[] for _ in range(n)]
+    for source, target in edge_list:
+        succ[ids[source]].append(ids[target])
+
+    # 1. Cycle removal
+    back = _break_cycles(succ)
+    dag_edges = list(dict.fromkeys((t, s) if (s, t) in back else (s, t)
+                                   for s, t in ((ids[a], ids[b]) for a, b in edge_list)))
+
+    # 2. Longest-path layering (Kahn's topological order)
+    dag_succ: List[List[int]] = [[] for _ in range(n)]
+    indegree = [0] * n
+    for s, t in dag_edges:
+        dag_succ[s].append(t)
+        indegree[t] += 1
+    rank = [0] * n
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    while queue:
+        node = queue.popleft()
+        for target in dag_succ[node]:
+            if rank[node] + 1 > rank[target]:
+                rank[target] = rank[node] + 1
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                queue.append(target)
+
+    # 3. Dummy nodes, so every edge spans exactly one layer
+    down: List[List[int]] = [[] for _ in range(n)]
+    up: List[List[int]] = [[] for _ in range(n)]
+    chains: Dict[Tuple[int, int], List[int]] = {}
+    for s, t in dag_edges:
+        chain = [s]
+        for layer in range(rank[s] + 1, rank[t]):
+            chain.append(len(rank))
+            rank.append(layer)
+            down.append([])
+            up.append([])
+        chain.append(t)
+        for a, b in zip(chain, chain[1:]):
+            down[a].append(b)
+            up[b].append(a)
+        chains[(s, t)] = chain
+
+    layers: List[List[int]] = [[] for _ in range(max(rank, default=-1) + 1)]
+    # Initial order: breadth-first from the sources, which already groups families
+    placed = [False] * len(rank)
+    for start in range(n):
+        if placed[start] or up[start]:
+            continue
+        placed[start] = True
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            layers[rank[node]].append(node)
+            for target in down[node]:
+                if not placed[target]:
+                    placed[target] = True
+                    queue.append(target)
+
+    # 4. Crossing reduction: barycenter sweeps, keeping the best ordering
+    position = [0] * len(rank)
+
+    def index_layer(row: List[int]):
+        for p, node in enumerate(row):
+            position[node] = p
+
+    def total_crossings(candidate: List[List[int]]) -> int:
+        for row in candidate:
+            index_layer(row)
+        return sum(_count_crossings(upper, position, down, len(lower))
+                   for upper, lower in zip(candidate, candidate[1:]))
+
+    best = [list(row) for row in layers]
+    best_crossings = total_crossings(best)
+    current = [list(row) for row in layers]
+    for sweep in range(sweeps):
+        if best_crossings == 0:
+            break
+        downward = sweep % 2 == 0
+        neighbours = up if downward else down
+        indices = range(1, len(current)) if downward else range(len(current) - 2, -1, -1)
+        for row in current:
+            index_layer(row)
+        for i in indices:
+            keyed = []
+            for p, node in enumerate(current[i]):
+                linked = neighbours[node]
+                keyed.append((sum(position[m] for m in linked) / len(linked) if linked else p, p, node))
+            keyed.sort()
+            current[i] = [node for _, _, node in keyed]
+            index_layer(current[i])
+        crossings = total_crossings(current)
+        if crossings < best_crossings:
+            best, best_crossings = [list(row) for row in current], crossings
+
+    # 5. Coordinates: pull towards neighbours, never closer than the gaps allow
+    node_width = [width(key) if width else 0.0 for key in keys]
+    node_width.extend([dummy_width] * (len(rank) - n))
+    offsets = []
+    x = [0.0] * len(rank)
+    for row in best:
+        row_offsets = [0.0]
+        for a, b in zip(row, row[1:]):
+            row_offsets.append(row_offsets[-1] + (node_width[a] + node_width[b]) / 2 + node_gap)
+        offsets.append(row_offsets)
+        # Centre every layer on 0 before the passes start
+        for node, offset in zip(row, row_offsets):
+            x[node] = offset - row_offsets[-1] / 2
+    for p in range(coordinate_passes * 2):
+        downward = p % 2 == 0
+        neighbours = up if downward else down
+        indices = range(1, len(best)) if downward else range(len(best) - 2, -1, -1)
+        for i in indices:
+            desired = []
+            for node in best[i]:
+                linked = neighbours[node]
+                desired.append(sum(x[m] for m in linked) / len(linked) if linked else x[node])
+            for node, value in zip(best[i], _isotonic(desired, offsets[i])):
+                x[node] = value
+
+    positions = {key: (x[i], float(rank[i])) for i, key in enumerate(keys)}
+    polylines: Dict[Tuple[Node, Node], List[Point]] = {}
+    for source, target in edge_list:
+        s, t = ids[source], ids[target]
+        chain = chains[(s, t)] if (s, t) in chains else chains[(t, s)][::-1]
+        polylines[(source, target)] = [(x[i], float(rank[i])) for i in chain]
+    return LayeredLayout(
+        positions=positions,
+        edges=polylines,
+        layers=[[keys[i] for i in row if i < n] for row in best],
+        reversed_edges={(keys[s], keys[t]) for s, t in back},
+        crossings=best_crossings,
+    )
@@ -0,0 +1,162 @@
+"""
+Plotly trace builders for node-link diagrams that scale.
+
+One trace per edge is fine for 25 nodes, but every trace is a separate SVG
+group in the browser and a separate object to serialize for export. Here:
+
+- all edges go into a single None-separated line trace (hover text per
+  edge still works, it is repeated on each point of the edge)
+- node and edge traces switch to WebGL (Scattergl) above GL_THRESHOLD
+  points, so interactive HTML exports of big graphs stay responsive
+- aggregate() merges nodes sharing a grid cell once a graph has more
+  nodes than a diagram can show, and bundles the edges between cells,
+  which keeps the point count (and static export time) flat
+"""
+
+import math
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import plotly.graph_objects as go
+
+Node = Hashable
+Point = Tuple[float, float]
+
+# Above this many points a trace is drawn with WebGL
+GL_THRESHOLD = 1000
+
+
+def scatter_class(points: int, threshold: int = GL_THRESHOLD):
+    """go.Scatter for small traces, go.Scattergl for large ones"""
+    return go.Scattergl if points > threshold else go.Scatter
+
+
+def merge_polylines(polylines: Iterable[Sequence[Point]],
+                    hovertext: Optional[Iterable[str]] = None
+                    ) -> Tuple[List[Optional[float]], List[Optional[float]], Optional[List[Optional[str]]]]:
+    """
+    Flatten polylines into None-separated coordinate lists
+
+    Args:
+        polylines: Point sequences, e.g. [(x0, y0), (x1, y1)] per edge
+        hovertext: Optional text per polyline, repeated on each of its points
+
+    Returns:
+        (x, y, text) ready for one line trace; text is None without hovertext
+    """
+    xs: List[Optional[float]] = []
+    ys: List[Optional[float]] = []
+    texts: Optional[List[Optional[str]]] = [] if hovertext is not None else None
+    labels = iter(hovertext) if hovertext is not None else None
+    for points in polylines:
+        label = next(labels) if labels is not None else None
+        for x, y in points:
+            xs.append(x)
+            ys.append(y)
+            if texts is not None:
+                texts.append(label)
+        xs.append(None)
+        ys.append(None)
+        if texts is not None:
+            texts.append(None)
+    return xs, ys, texts
+
+
+def edge_trace(polylines: Iterable[Sequence[Point]], hovertext: Optional[Iterable[str]] = None,
+               threshold: int = GL_THRESHOLD, **kwargs) -> go.Scatter:
+    """
+    All edges as a single line trace
+
+    Args:
+        polylines: Point sequences, one per edge
+        hovertext: Optional text per edge (hover is off without it)
+        threshold: Point count above which the trace uses WebGL
+        **kwargs: Passed to the trace, e.g. line=dict(width=2, color='#666')
+
+    Returns:
+        go.Scatter or go.Scattergl
+    """
+    xs, ys, texts = merge_polylines(polylines, hovertext)
+    options = dict(mode='lines', showlegend=False)
+    if texts is None:
+        options['hoverinfo'] = 'none'
+    else:
+        options.update(hoverinfo='text', hovertext=texts)
+    options.update(kwargs)
+    return scatter_class(len(xs), threshold)(x=xs, y=ys, **options)
+
+
+def node_trace(x: Sequence[float], y: Sequence[float], threshold: int = GL_THRESHOLD, **kwargs) -> go.Scatter:
+    """All nodes as one marker trace; colors, sizes and text can be per node lists"""
+    options = dict(mode='markers', showlegend=False)
+    options.update(kwargs)
+    return scatter_class(len(x), threshold)(x=list(x), y=list(y), **options)
+
+
+class Aggregation(NamedTuple):
+    positions: List[Point]  # cluster centroid
+    members: List[List[Node]]  # nodes per cluster, in input order
+    cluster_of: Dict[Node, int]
+    edges: Dict[Tuple[int, int], int]  # (source cluster, target cluster) -> edge count
+
+    def label(self, cluster: int, noun: str = 'nodes') -> str:
+        members = self.members[cluster]
+        return str(members[0]) if len(members) == 1 else f"{len(members)} {noun}"
+
+
+def aggregate(positions: Dict[Node, Point], edges: Iterable[Tuple[Node, Node]] = (),
+              max_nodes: int = 500, cell: Optional[float] = None) -> Aggregation:
+    """
+    Merge nodes that share a grid cell and bundle the edges between cells
+
+    Graphs with at most max_nodes nodes (and no explicit cell) come back
+    with one cluster per node. Otherwise the cell size starts from the
+    bounding box divided into max_nodes cells and doubles until the
+    cluster count fits; sparse regions keep their single nodes.
+
+    Args:
+        positions: node -> (x, y)
+        edges: (source, target) pairs; edges inside a cluster are dropped
+        max_nodes: Most clusters to draw
+        cell: Fixed grid cell size instead of the automatic one
+
+    Returns:
+        Aggregation with cluster centroids, members and weighted edges
+    """
+    nodes = list(positions)
+    fixed = cell is not None
+    if not fixed and len(nodes) > max_nodes:
+        xs = [positions[node][0] for node in nodes]
+        ys = [positions[node][1] for node in nodes]
+        width = max(xs) - min(xs) or 1.0
+        height = max(ys) - min(ys) or 1.0
+        cell = math.sqrt(width * height / max_nodes) or 1.0
+
+    cells: Dict[Tuple[int, int], int] = {}
+    members: List[List[Node]] = []
+    cluster_of: Dict[Node, int] = {}
+    while True:
+        cells.clear()
+        members = []
+        cluster_of = {}
+        for i, node in enumerate(nodes):
+            x, y = positions[node]
+            key = (math.floor(x / cell), math.floor(y / cell)) if cell else (i, 0)
+            if key not in cells:
+                cells[key] = len(members)
+                members.append([])
+            members[cells[key]].append(node)
+            cluster_of[node] = cells[key]
+        if fixed or cell is None or len(members) <= max_nodes:
+            break
+        cell *= 2
+
+    centroids = []
+    for group in members:
+        centroids.append((sum(positions[node][0] for node in group) / len(group),
+                          sum(positions[node][1] for node in group) / len(group)))
+    bundled: Dict[Tuple[int, int], int] = {}
+    for source, target in edges:
+        pair = (cluster_of[source], cluster_of[target])
+        if pair[0] != pair[1]:
+            bundled[pair] = bundled.get(pair, 0) + 1
+    return Aggregation(centroids, members, cluster_of, bundled)
@@ -0,0 +1,71 @@
+"""
+Graph algorithms shared by the docs analysis scripts.
+
+Graphs are adjacency lists over the nodes 0..n-1, as built by the import
+graph and the navigation graph.
+"""
+
+from typing import List, Tuple
+
+
+def strongly_connected(successors: List[List[int]]) -> Tuple[List[int], List[List[int]]]:
+    """
+    Iterative Tarjan SCC
+
+    Args:
+        successors: Adjacency lists of the nodes 0..n-1
+
+    Returns:
+        (component id of every node, components with their members sorted,
+        in reverse topological order: a component comes before every
+        component with an edge into it)
+    """
+    n = len(successors)
+    index = [0] * n
+    lowlink = [0] * n
+    visited = [False] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    scc_ids = [-1] * n
+    sccs: List[List[int]] = []
+    counter = 0
+    for root in range(n):
+        if visited[root]:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, child = work.pop()
+            if child == 0:
+                visited[node] = True
+                index[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            recurse = False
+            targets = successors[node]
+            while child < len(targets):
+                target = targets[child]
+                child += 1
+                if not visited[target]:
+                    work.append((node, child))
+                    work.append((target, 0))
+                    recurse = True
+                    break
+                if on_stack[target]:
+                    lowlink[node] = min(lowlink[node], index[target])
+            if recurse:
+                continue
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    scc_ids[member] = len(sccs)
+                    component.append(member)
+                    if member == node:
+                        break
+                sccs.append(sorted(component))
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+    return scc_ids, sccs
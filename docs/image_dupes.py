@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Duplicate and near-duplicate image finder for the app's bundled images.
+
+Hashes every image under the given roots in a process pool: a SHA-256 of
+the bytes for exact duplicates and, when Pillow is installed, a 64-bit
+difference hash (dHash) for visually near-identical images. Exact groups
+report the bytes that deduplication would reclaim; near-duplicates are
+grouped through a BK-tree over Hamming distance.
+
+Density variants (Android drawable-*dpi/mipmap-*dpi folders and Flutter
+2.0x/3.0x asset folders) are checked separately: a variant that is a
+byte copy of another density, or whose pixel size does not follow its
+density, is flagged since it adds APK size without adding sharpness.
+
+Example:
+    python image_dupes.py ../assets ../android/app/src/main/res --report dupes.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ROOTS = ('assets', 'android/app/src/main/res')
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp'}
+
+# Android density qualifiers and their scale relative to mdpi
+ANDROID_DENSITIES = {'ldpi': 0.75, 'mdpi': 1.0, 'tvdpi': 1.33, 'hdpi': 1.5, 'xhdpi': 2.0,
+                     'xxhdpi': 3.0, 'xxxhdpi': 4.0}
+ANDROID_RESOURCE_DIR = re.compile(r'^(drawable|mipmap)(-[\w-]+)?$')
+FLUTTER_VARIANT_DIR = re.compile(r'^(\d+(?:\.\d+)?)x$')
+
+# Relative size error tolerated before a density variant counts as unscaled
+SCALE_TOLERANCE = 0.15
+
+# Fewer images than this are hashed in-process
+PARALLEL_THRESHOLD = 32
+
+
+class ImageHash(NamedTuple):
+    path: str  # '/'-separated, relative to the project
+    size: int
+    digest: str  # SHA-256 of the file bytes
+    dhash: Optional[int]  # 64-bit difference hash; None without Pillow
+    dimensions: Optional[Tuple[int, int]]
+
+
+def read_dimensions(path: Path) -> Optional[Tuple[int, int]]:
+    """Width and height from the PNG, GIF or JPEG header, without decoding"""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:2] != b'\xff\xd8':
+            return None
+        f.seek(2)
+        while True:
+            marker = f.read(4)
+            if len(marker) < 4 or marker[0] != 0xFF:
+                return None
+            length = struct.unpack('>H', marker[2:4])[0]
+            # SOF0..SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+            if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>xHH', f.read(5))
+                return width, height
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def difference_hash(path: Path) -> Optional[int]:
+    """64-bit dHash: brightness gradients of a 9x8 grayscale thumbnail"""
+    if Image is None:
+        return None
+    with Image.open(path) as img:
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # Flatten transparency onto white so alpha-only differences vanish
+            img = img.convert('RGBA')
+            background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+            img = Image.alpha_composite(background, img)
+        pixels = img.convert('L').resize((9, 8), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def _hash_image(args: Tuple[str, str]) -> ImageHash:
+    """Process-pool worker: exact digest, perceptual hash and size of one image"""
+    file_path, key = args
+    path = Path(file_path)
+    data = path.read_bytes()
+    try:
+        dhash = difference_hash(path)
+    except (OSError, ValueError):
+        dhash = None  # Truncated or unsupported; still compared byte for byte
+    try:
+        dimensions = read_dimensions(path)
+    except (OSError, struct.error):
+        dimensions = None
+    if dimensions is None and Image is not None:
+        try:
+            with Image.open(path) as img:
+                dimensions = img.size
+        except (OSError, ValueError):
+            pass
+    return ImageHash(key, len(data), hashlib.sha256(data).hexdigest(), dhash, dimensions)
+
+
+def find_images(project_dir: Path, roots: Sequence[str] = ()) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (absolute path, key) for every image under roots
+
+    Without roots, DEFAULT_ROOTS of the project are scanned. Roots given
+    explicitly are taken relative to the current directory when they exist
+    there and to the project otherwise; keys are project-relative where
+    possible.
+    """
+    if roots:
+        roots = [Path(root) if Path(root).exists() else project_dir / root for root in roots]
+    else:
+        roots = [project_dir / root for root in DEFAULT_ROOTS]
+    for root in roots:
+        root = root.resolve()
+        base = project_dir if root.is_relative_to(project_dir) else root.parent
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            for filename in sorted(filenames):
+                if Path(filename).suffix.lower() in IMAGE_EXTENSIONS:
+                    path = Path(directory) / filename
+                    yield str(path), path.relative_to(base).as_posix()
+
+
+def hash_images(items: List[Tuple[str, str]], workers: Optional[int] = None) -> List[ImageHash]:
+    workers = min(workers or os.cpu_count() or 1, len(items))
+    if workers > 1 and len(items) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_hash_image, items, chunksize=max(1, len(items) // (workers * 4))))
+    return [_hash_image(item) for item in items]
+
+
+class BKTree:
+    """Metric tree over Hamming distance for radius queries on 64-bit hashes"""
+
+    def __init__(self):
+        self.root = None  # [value, payload, {distance: child}]
+
+    def add(self, value: int, payload):
+        if self.root is None:
+            self.root = [value, payload, {}]
+            return
+        node = self.root
+        while True:
+            distance = bin(value ^ node[0]).count('1')
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, payload, {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, object]]:
+        """(distance, payload) of every stored value within radius"""
+        found, stack = [], [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            distance = bin(value ^ node[0]).count('1')
+            if distance <= radius:
+                found.append((distance, node[1]))
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def exact_groups(hashes: List[ImageHash]) -> List[List[ImageHash]]:
+    by_digest: Dict[str, List[ImageHash]] = {}
+    for item in hashes:
+        by_digest.setdefault(item.digest, []).append(item)
+    groups = [group for group in by_digest.values() if len(group) > 1]
+    return sorted(groups, key=lambda group: -group[0].size * (len(group) - 1))
+
+
+def near_groups(hashes: List[ImageHash], radius: int) -> List[List[ImageHash]]:
+    """
+    Groups of visually near-identical images that are not byte-identical
+
+    One representative per exact digest goes into a BK-tree. Grouping is
+    complete-linkage: an image joins the earliest group whose every member
+    is within ``radius`` bits of it, so a chain of small differences does
+    not pull far-apart images together. Density variants of one resource
+    are expected to look alike and never share a group.
+    """
+    representatives: Dict[str, ImageHash] = {}
+    for item in hashes:
+        if item.dhash is not None:
+            representatives.setdefault(item.digest, item)
+    items = list(representatives.values())
+    variant_keys = [(density_variant(item.path) or (item.path,))[0] for item in items]
+
+    group_of: List[int] = []
+    groups: List[List[int]] = []
+    tree = BKTree()
+    for i, item in enumerate(items):
+        near = {j for _, j in tree.search(item.dhash, radius)}
+        joined = None
+        for g in sorted({group_of[j] for j in near}):
+            members = groups[g]
+            if (all(j in near for j in members)
+                    and all(variant_keys[j] != variant_keys[i] for j in members)):
+                joined = g
+                break
+        if joined is None:
+            joined = len(groups)
+            groups.append([])
+        groups[joined].append(i)
+        group_of.append(joined)
+        tree.add(item.dhash, i)
+
+    return [[items[i] for i in members] for members in groups if len(members) > 1]
+
+
+def density_variant(path: str) -> Optional[Tuple[Tuple[str, ...], float]]:
+    """
+    Variant-group key and scale of a density-specific image, if it is one
+
+    drawable-night-xhdpi/splash.png -> (("res", "drawable-night", "splash.png"), 2.0)
+    assets/logo/3.0x/logo.png -> (("assets/logo", "logo.png"), 3.0)
+    """
+    parts = path.split('/')
+    if len(parts) < 2:
+        return None
+    directory, filename = parts[-2], parts[-1]
+    match = ANDROID_RESOURCE_DIR.match(directory)
+    if match:
+        qualifiers = [q for q in (match.group(2) or '').split('-') if q]
+        densities = [q for q in qualifiers if q in ANDROID_DENSITIES]
+        if len(densities) != 1:
+            return None
+        rest = [q for q in qualifiers if q not in ANDROID_DENSITIES]
+        key = ('/'.join(parts[:-2]), '-'.join([match.group(1)] + rest), filename)
+        return key, ANDROID_DENSITIES[densities[0]]
+    match = FLUTTER_VARIANT_DIR.match(directory)
+    if match:
+        return ('/'.join(parts[:-2]), filename), float(match.group(1))
+    return ('/'.join(parts[:-1]), filename), 1.0
+
+
+class DensityIssue(NamedTuple):
+    path: str
+    problem: str
+
+
+def density_issues(hashes: List[ImageHash]) -> List[DensityIssue]:
+    """Density variants that copy another density or do not scale with it"""
+    groups: Dict[Tuple[str, ...], List[Tuple[float, ImageHash]]] = {}
+    for item in hashes:
+        variant = density_variant(item.path)
+        if variant is not None:
+            groups.setdefault(variant[0], []).append((variant[1], item))
+
+    issues = []
+    for variants in groups.values():
+        if len({scale for scale, _ in variants}) < 2:
+            continue
+        variants.sort(key=lambda variant: variant[0])
+        base_scale, base = variants[0]
+        first_by_digest: Dict[str, Tuple[float, ImageHash]] = {}
+        for scale, item in variants:
+            copy_of = first_by_digest.setdefault(item.digest, (scale, item))
+            if copy_of[1] is not item:
+                issues.append(DensityIssue(item.path, f"byte copy of the {copy_of[0]:g}x variant "
+                                                      f"{copy_of[1].path}"))
+                continue
+            if item is base or not base.dimensions or not item.dimensions:
+                continue
+            expected = base.dimensions[0] * scale / base_scale
+            if abs(item.dimensions[0] / expected - 1) > SCALE_TOLERANCE:
+                issues.append(DensityIssue(
+                    item.path, f"{item.dimensions[0]}x{item.dimensions[1]} px at {scale:g}x, "
+                               f"expected ~{expected:.0f} px wide from {base.path}"))
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate and near-duplicate images")
+    parser.add_argument('roots', nargs='*',
+                        help="Directories to scan (default: the project's assets and android res)")
+    parser.add_argument('--project', default=str(PROJECT_DIR), help="Flutter project directory")
+    parser.add_argument('--distance', type=int, default=4,
+                        help="Max dHash Hamming distance for near-duplicates (0-64)")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--report', help="Write the groups to this JSON file")
+    args = parser.parse_args()
+
+    project_dir = Path(args.project).resolve()
+    items = list(find_images(project_dir, args.roots))
+    hashes = hash_images(items, args.workers)
+    exact = exact_groups(hashes)
+    near = near_groups(hashes, args.distance)
+    issues = density_issues(hashes)
+
+    print("🔍 Image duplicate scan")
+    print("=" * 50)
+    print(f"{len(hashes)} images, {sum(item.size for item in hashes):,} bytes under {', '.join(args.roots or DEFAULT_ROOTS)}")
+    if Image is None:
+        print("⚠️  Pillow is not installed; near-duplicate detection skipped")
+
+    reclaimable = sum(group[0].size * (len(group) - 1) for group in exact)
+    print(f"\n📁 Byte-identical groups: {len(exact)} ({reclaimable:,} bytes reclaimable)")
+    for group in exact:
+        print(f"  {group[0].size:,} bytes x {len(group)}:")
+        for item in group:
+            print(f"    - {item.path}")
+
+    print(f"\n📁 Near-duplicate groups (distance <= {args.distance}): {len(near)}")
+    for group in near:
+        print(f"  {len(group)} images:")
+        for item in group:
+            dims = f"{item.dimensions[0]}x{item.dimensions[1]}" if item.dimensions else '?'
+            print(f"    - {item.path} ({item.size:,} bytes, {dims})")
+
+    print(f"\n⚠️  Density variants that are not real rescales: {len(issues)}")
+    for issue in issues:
+        print(f"  - {issue.path}: {issue.problem}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'images': len(hashes),
+                'reclaimable_bytes': reclaimable,
+                'exact_groups': [[item.path for item in group] for group in exact],
+                'near_groups': [[item.path for item in group] for group in near],
+                'density_issues': [issue._asdict() for issue in issues],
+            }, f, indent=2)
+        print(f"\n📄 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
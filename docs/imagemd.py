@@ -1,34 +1,840 @@
+import io
 import os
 import re
+import json
+import argparse
 import requests
 import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from urllib.parse import urlparse, unquote
 from pathlib import Path
+import threading
 import time
-from typing import List, Dict, Tuple
+from email.utils import parsedate_to_datetime
+from typing import Iterator, List, Dict, NamedTuple, Optional, Sequence, Set, Tuple
+
+from report_util import write_report
+
+try:
+    from PIL import Image, JpegImagePlugin
+except ImportError:  # Pillow is only needed for --optimize
+    Image = JpegImagePlugin = None
+
+
+# Single precompiled scanner for every supported image reference form.
+# Alternatives are tried left to right at each position, so one pass over
+# the document yields non-overlapping matches in source order.
+IMAGE_REFERENCE_PATTERN = re.compile(
+    # ![alt text](url), ![alt text](<url> "title"); the title is not part of the URL
+    r'(?P<markdown>!\[(?P<markdown_alt>[^\]]*)\]\(\s*<?(?P<markdown_url>[^\s)>]+)>?'
+    r'(?:\s+(?:"[^"]*"|\'[^\']*\'))?\s*\))'
+    # <img src="url" alt="alt text">
+    r'|(?P<html><img(?:(?=[^>]*?alt=["\'](?P<html_alt>[^"\']*)["\']))?'
+    r'[^>]+src=["\'](?P<html_url>[^"\']+)["\'][^>]*>)'
+    # [alt]: url
+    r'|(?P<reference>^[ \t]*\[(?P<reference_alt>[^\]]+)\]:[ \t]*(?P<reference_url>[^\s]+))',
+    re.MULTILINE,
+)
+
+
+class ImageReference(NamedTuple):
+    """An image reference found in markdown, with its position in the source"""
+    kind: str  # 'markdown', 'html' or 'reference'
+    full_match: str
+    alt_text: str
+    url: str
+    start: int
+    end: int
+    url_start: int
+    url_end: int
+
+
+def scan_image_references(content: str) -> Iterator[ImageReference]:
+    """Yield every image reference in ``content`` in source order"""
+    for match in IMAGE_REFERENCE_PATTERN.finditer(content):
+        # The outer group of each alternative closes last, so lastgroup
+        # names the alternative that matched
+        kind = match.lastgroup
+        url_group = f"{kind}_url"
+        yield ImageReference(
+            kind=kind,
+            full_match=match.group(0),
+            alt_text=match.group(f"{kind}_alt") or "",
+            url=match.group(url_group),
+            start=match.start(),
+            end=match.end(),
+            url_start=match.start(url_group),
+            url_end=match.end(url_group),
+        )
+
+
+# Any http(s) URL in the text: markdown links, autolinks, href/src
+# attributes and bare URLs alike
+REMOTE_URL_PATTERN = re.compile(r'https?://[^\s<>"\'`)\]]+')
+
+
+def scan_remote_urls(content: str) -> Iterator[str]:
+    """Yield every http(s) URL in ``content`` in source order"""
+    for match in REMOTE_URL_PATTERN.finditer(content):
+        # Sentence punctuation right after a bare URL is not part of it
+        yield match.group(0).rstrip('.,;:!?*_')
+
+
+def splice_image_urls(content: str, refs: Sequence[ImageReference],
+                      replacements: Dict[str, str]) -> Tuple[str, int]:
+    """
+    Rebuild ``content`` with the URL of each reference swapped for its replacement
+    
+    Args:
+        content: Markdown source the references were scanned from
+        refs: References in source order
+        replacements: Mapping of original URL to new URL; references whose URL
+            is not in the mapping are left untouched
+    
+    Returns:
+        Tuple of (new_content, number_of_references_rewritten)
+    """
+    # Output is assembled from the untouched spans between references plus
+    # the new URLs, so the rewrite is a single linear pass and never touches
+    # identical text elsewhere in the file
+    pieces: List[str] = []
+    last_end = 0
+    updated_count = 0
+    for ref in refs:
+        new_url = replacements.get(ref.url)
+        if new_url is None:
+            continue
+        # Only the URL is replaced; alt text, title and any other <img>
+        # attributes are kept as written
+        pieces.append(content[last_end:ref.url_start])
+        pieces.append(new_url)
+        last_end = ref.url_end
+        updated_count += 1
+    if not updated_count:
+        return content, 0
+    pieces.append(content[last_end:])
+    return ''.join(pieces), updated_count
+
+
+# Directories that never contain documentation worth rewriting
+DEFAULT_IGNORE_PATTERNS = [
+    '.git/', '.dart_tool/', '.idea/', '.vscode/', 'build/', 'android/', 'ios/',
+    'linux/', 'macos/', 'windows/', 'web/', 'node_modules/', '__pycache__/',
+    '.venv/', 'venv/',
+]
+
+MARKDOWN_SUFFIXES = ('.md', '.markdown')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (without leading '!' or trailing '/') to a regex"""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            regex.append('/.*')
+            i += 3
+        elif pattern[i] == '*':
+            regex.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            regex.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            close = pattern.find(']', i + 1)
+            if close == -1:
+                regex.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                body = pattern[i + 1:close]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex.append(f'[{body}]')
+                i = close + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(regex)
+
+
+class IgnoreRules:
+    """
+    A list of gitignore-style patterns, evaluated relative to a base directory
+    
+    Supports comments, negation (``!``), directory-only patterns (trailing
+    ``/``), anchored patterns (leading or embedded ``/``) and ``*``, ``?``,
+    ``**`` and ``[...]`` globs.
+    """
+    
+    def __init__(self, patterns: Sequence[str] = ()):
+        # (compiled regex, negated, directory only)
+        self.rules: List[Tuple["re.Pattern[str]", bool, bool]] = []
+        for raw in patterns:
+            line = raw.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            body = _glob_to_regex(line.lstrip('/'))
+            if not anchored:
+                body = '(?:.*/)?' + body
+            self.rules.append((re.compile(body + r'\Z'), negated, dir_only))
+    
+    @classmethod
+    def from_file(cls, path: Path) -> "IgnoreRules":
+        """Load rules from a .gitignore-style file"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(f.readlines())
+        except OSError:
+            return cls()
+    
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Check a '/'-separated path relative to the rules' base directory
+        
+        Returns:
+            True if ignored, False if explicitly re-included, None if no rule applies
+        """
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negated
+        return result
+
+
+def walk_markdown_files(root: Path, ignore_patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS,
+                        use_gitignore: bool = True) -> List[Path]:
+    """
+    Find markdown files under ``root`` in a single ``os.scandir`` walk
+    
+    Ignored directories are pruned before descending into them, and
+    symlinked directories are not followed. With ``use_gitignore``, every
+    ``.gitignore`` met on the way is applied to its own subtree, after
+    ``ignore_patterns`` (so it can re-include paths).
+    
+    Args:
+        root: Directory to walk
+        ignore_patterns: Extra gitignore-style patterns, relative to ``root``
+        use_gitignore: Also honour .gitignore files found in the tree
+    """
+    markdown_files: List[Path] = []
+    # Each stack entry: (directory path, relative path from root, active rule sets)
+    # where a rule set is (relative path of its base directory, IgnoreRules)
+    base_rules = [('', IgnoreRules(ignore_patterns))]
+    stack = [(str(root), '', base_rules)]
+    
+    while stack:
+        dir_path, dir_rel, rule_sets = stack.pop()
+        if use_gitignore:
+            gitignore = os.path.join(dir_path, '.gitignore')
+            if os.path.isfile(gitignore):
+                rule_sets = rule_sets + [(dir_rel, IgnoreRules.from_file(Path(gitignore)))]
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = sorted(entries, key=lambda e: e.name)
+        except OSError:
+            continue
+        
+        for entry in entries:
+            try:
+                # Symlinked directories are not descended into (as with rglob),
+                # so a link back up the tree cannot loop the walk
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if not is_dir and not entry.name.lower().endswith(MARKDOWN_SUFFIXES):
+                continue
+            rel = f"{dir_rel}/{entry.name}" if dir_rel else entry.name
+            
+            ignored = None
+            for base, rules in rule_sets:
+                sub_rel = rel[len(base) + 1:] if base else rel
+                verdict = rules.match(sub_rel, is_dir)
+                if verdict is not None:
+                    ignored = verdict
+            if ignored:
+                continue
+            
+            if is_dir:
+                stack.append((entry.path, rel, rule_sets))
+            else:
+                markdown_files.append(Path(entry.path))
+    
+    markdown_files.sort()
+    return markdown_files
+
+
+class FileFingerprint(NamedTuple):
+    """What a markdown file looked like when it was last scanned"""
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+def _read_markdown(file_path: Path) -> Tuple[str, FileFingerprint]:
+    """Read a markdown file and fingerprint the bytes that were read"""
+    st = os.stat(file_path)
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    fingerprint = FileFingerprint(st.st_mtime_ns, st.st_size, hashlib.sha256(raw).hexdigest())
+    return raw.decode('utf-8'), fingerprint
+
+
+def _write_markdown(file_path: Path, content: str) -> FileFingerprint:
+    """Write a markdown file and fingerprint the bytes that were written"""
+    raw = content.encode('utf-8')
+    with open(file_path, 'wb') as f:
+        f.write(raw)
+    st = os.stat(file_path)
+    return FileFingerprint(st.st_mtime_ns, st.st_size, hashlib.sha256(raw).hexdigest())
+
+
+class ScanResult(NamedTuple):
+    file_path: Path
+    refs: List[Tuple[str, str]]  # (url, alt_text) for every image reference
+    fingerprint: Optional[FileFingerprint]
+    error: Optional[str]
+
+
+class RewriteResult(NamedTuple):
+    file_path: Path
+    updated_count: int
+    fingerprint: Optional[FileFingerprint]  # None when the file was not written
+    error: Optional[str]
+
+
+def _scan_markdown_file(file_path: Path) -> ScanResult:
+    """Process pool worker: read one markdown file and list its image references"""
+    try:
+        content, fingerprint = _read_markdown(file_path)
+    except Exception as e:
+        return ScanResult(file_path, [], None, str(e))
+    refs = [(ref.url, ref.alt_text) for ref in scan_image_references(content)]
+    return ScanResult(file_path, refs, fingerprint, None)
+
+
+def _rewrite_markdown_file(file_path: Path, images_dir: Path,
+                           local_files: Dict[str, str]) -> RewriteResult:
+    """
+    Process pool worker: point downloaded image references at their local copies
+    
+    Args:
+        file_path: Markdown file to rewrite in place
+        images_dir: Directory the images were downloaded to
+        local_files: Mapping of remote URL to downloaded filename
+    """
+    try:
+        content, _ = _read_markdown(file_path)
+        replacements = {
+            url: os.path.relpath(images_dir / filename, file_path.parent)
+            for url, filename in local_files.items()
+        }
+        refs = list(scan_image_references(content))
+        content, updated_count = splice_image_urls(content, refs, replacements)
+        fingerprint = _write_markdown(file_path, content) if updated_count else None
+        return RewriteResult(file_path, updated_count, fingerprint, None)
+    except Exception as e:
+        return RewriteResult(file_path, 0, None, str(e))
+
+
+class OptimizeOptions(NamedTuple):
+    """Settings for the post-download image optimization stage"""
+    max_width: Optional[int] = None  # downscale wider images to this width
+    quality: Optional[int] = None  # None recompresses losslessly
+    webp: bool = False  # transcode to WebP
+    
+    def cache_key(self) -> str:
+        return f"w{self.max_width or 0}-q{self.quality if self.quality is not None else 'll'}-{'webp' if self.webp else 'keep'}"
+
+
+class OptimizeResult(NamedTuple):
+    source: str  # filename that was downloaded
+    output: str  # filename the markdown should point at
+    bytes_before: int
+    bytes_after: int
+    cached: bool
+    error: Optional[str]
+
+
+# Formats Pillow can re-encode without losing animation or vector data
+OPTIMIZABLE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp'}
+
+
+def _encode_optimized(raw: bytes, extension: str, options: OptimizeOptions) -> bytes:
+    """Resize and re-encode image bytes; metadata is not carried over"""
+    with Image.open(io.BytesIO(raw)) as opened:
+        opened.load()
+        source_format = opened.format
+        source_mode = opened.mode
+        # quality='keep' only works on the JpegImageFile itself, so take the
+        # source's tables and chroma subsampling along with the copy
+        qtables = getattr(opened, 'quantization', None) if source_format == 'JPEG' else None
+        subsampling = JpegImagePlugin.get_sampling(opened) if qtables else -1
+        image = opened.copy()
+    resized = False
+    if options.max_width and image.width > options.max_width:
+        height = max(1, round(image.height * options.max_width / image.width))
+        image = image.resize((options.max_width, height), Image.LANCZOS)
+        resized = True
+    # Drop EXIF, text chunks, ICC profiles and the like
+    image.info = {}
+    
+    out = io.BytesIO()
+    if extension == '.webp':
+        if options.quality is None:
+            image.save(out, 'WEBP', lossless=True, method=6)
+        else:
+            image.save(out, 'WEBP', quality=options.quality, method=6)
+    elif extension in ('.jpg', '.jpeg'):
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        if options.quality is None and not resized and qtables and image.mode == source_mode:
+            # Same quantization tables and subsampling as the source, so the
+            # only loss is one rounding pass; optimize/progressive shrink the
+            # entropy coding
+            image.save(out, 'JPEG', qtables=qtables, subsampling=subsampling,
+                       optimize=True, progressive=True)
+        else:
+            image.save(out, 'JPEG', quality=options.quality or 90, optimize=True, progressive=True)
+    elif extension == '.png':
+        if options.quality is not None and image.mode in ('RGB', 'RGBA'):
+            # Lossy PNG: palette quantization, which usually dominates savings
+            image = image.quantize(colors=256, method=Image.FASTOCTREE)
+        image.save(out, 'PNG', optimize=True)
+    else:
+        image.save(out, source_format or 'PNG')
+    return out.getvalue()
+
+
+def _optimize_image(images_dir: Path, filename: str, options: OptimizeOptions) -> OptimizeResult:
+    """
+    Process pool worker: optimize one downloaded image
+    
+    Encoded output is cached under ``images_dir/.optimize-cache`` by the
+    SHA-256 of the input bytes and the options, so re-running over the same
+    downloads costs a hash per image. The optimized file replaces the
+    download only when it is smaller; a WebP transcode gets its own name
+    and the original is removed.
+    """
+    source = images_dir / filename
+    try:
+        raw = source.read_bytes()
+        extension = source.suffix.lower()
+        if extension not in OPTIMIZABLE_EXTENSIONS:
+            return OptimizeResult(filename, filename, len(raw), len(raw), False, None)
+        out_extension = '.webp' if options.webp else extension
+        
+        digest = hashlib.sha256(raw).hexdigest()
+        cache_dir = images_dir / '.optimize-cache'
+        cache_path = cache_dir / f"{digest[:32]}-{options.cache_key()}{out_extension}"
+        cached = cache_path.exists()
+        if cached:
+            data = cache_path.read_bytes()
+        else:
+            data = _encode_optimized(raw, out_extension, options)
+            cache_dir.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_name(cache_path.name + f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, cache_path)
+        
+        if len(data) >= len(raw):
+            return OptimizeResult(filename, filename, len(raw), len(raw), cached, None)
+        
+        target = source.with_suffix(out_extension)
+        tmp_path = target.with_name(target.name + f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, target)
+        if target != source:
+            source.unlink()
+        return OptimizeResult(filename, target.name, len(raw), len(data), cached, None)
+    except Exception as e:
+        return OptimizeResult(filename, filename, 0, 0, False, str(e))
+
+
+class IncrementalState:
+    """
+    Per-file scan state persisted between runs
+    
+    For every markdown file (keyed by its '/'-separated path relative to the
+    scan root) the state records the mtime, size and SHA-256 of the content
+    last seen, plus the remote image URLs still referenced after that run.
+    A file whose mtime and size are unchanged and that has no outstanding
+    remote images can be skipped without being opened.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: Path, root_dir: Path):
+        self.path = path
+        self.root_dir = root_dir
+        self.files: Dict[str, dict] = {}
+        self.load()
+    
+    def load(self):
+        """Load the state file; a missing or unreadable file starts empty"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == self.VERSION:
+            self.files = data.get('files', {})
+    
+    def save(self):
+        """Write the state file atomically"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'files': self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def key(self, file_path: Path) -> str:
+        return Path(os.path.relpath(file_path, self.root_dir)).as_posix()
+    
+    def is_fresh(self, file_path: Path, st: os.stat_result) -> bool:
+        """True if the file is unchanged since the last run and fully migrated"""
+        entry = self.files.get(self.key(file_path))
+        return (entry is not None
+                and not entry['remote_urls']
+                and entry['mtime_ns'] == st.st_mtime_ns
+                and entry['size'] == st.st_size)
+    
+    def is_migrated(self, file_path: Path, digest: str) -> bool:
+        """True if the content is the same as last run and fully migrated"""
+        entry = self.files.get(self.key(file_path))
+        return entry is not None and not entry['remote_urls'] and entry['digest'] == digest
+    
+    def record(self, file_path: Path, fingerprint: FileFingerprint, remote_urls):
+        self.files[self.key(file_path)] = {
+            'mtime_ns': fingerprint.mtime_ns,
+            'size': fingerprint.size,
+            'digest': fingerprint.digest,
+            'remote_urls': sorted(remote_urls),
+        }
+    
+    def retain(self, file_paths: Sequence[Path]):
+        """Forget files that no longer exist in the tree"""
+        keep = {self.key(file_path) for file_path in file_paths}
+        self.files = {key: entry for key, entry in self.files.items() if key in keep}
+
+
+# Statuses that mean "slow down" rather than "this URL is broken"
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str], limit: float = 60.0) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = when.timestamp() - time.time()
+    return min(max(seconds, 0.0), limit)
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket for one host
+    
+    Requests take a token; tokens refill at ``rate`` per second up to
+    ``burst``. The rate adapts AIMD-style: it halves on every throttling
+    response (429/503) and creeps back up by ``increase`` on every success,
+    never leaving ``[min_rate, max_rate]``.
+    """
+    
+    def __init__(self, rate: float, burst: int, min_rate: float = 0.1,
+                 max_rate: Optional[float] = None, increase: Optional[float] = None):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max(max_rate or rate, rate)
+        self.increase = increase or max(rate * 0.1, 0.05)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.blocked_until:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    # Refill arithmetic can leave a hair under a whole token,
+                    # and a wait that short would not move the clock
+                    if self.tokens >= 1 - 1e-9:
+                        self.tokens = max(0.0, self.tokens - 1)
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.blocked_until - now
+            time.sleep(wait)
+    
+    def penalize(self, retry_after: Optional[float] = None):
+        """The server pushed back: halve the rate and honour Retry-After"""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+                self.updated = self.blocked_until
+    
+    def reward(self):
+        """A request succeeded: grow the rate back towards max_rate"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use"""
+    
+    def __init__(self, rate: float, burst: int, max_rate: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.max_rate = max_rate
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+    
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst, max_rate=self.max_rate)
+            return bucket
+
+
+def _scan_remote_urls_file(file_path: Path) -> Tuple[Path, List[str], Optional[str]]:
+    """Process pool worker: list the distinct remote URLs in one markdown file"""
+    try:
+        content, _ = _read_markdown(file_path)
+    except Exception as e:
+        return file_path, [], str(e)
+    return file_path, list(dict.fromkeys(scan_remote_urls(content))), None
+
+
+def resolve_local_reference(url: str, file_path: Path, root_dir: Path) -> Optional[Path]:
+    """
+    Resolve a local image reference to an absolute, normalized path
+    
+    Leading '/' is taken as relative to the repository root, as on GitHub.
+    Returns None for remote URLs, data URIs and pure anchors.
+    """
+    target = url.strip()
+    if target.startswith('<') and target.endswith('>'):
+        target = target[1:-1]
+    # ![alt](path "title"): the title is not part of the path
+    target = target.split(' "', 1)[0].split(" '", 1)[0].strip()
+    if not target or target.startswith('#') or re.match(r'^[a-zA-Z][a-zA-Z0-9+.-]*:', target):
+        return None
+    target = unquote(target.split('#', 1)[0].split('?', 1)[0])
+    if target.startswith('/'):
+        resolved = root_dir / target.lstrip('/')
+    else:
+        resolved = file_path.parent / target
+    return Path(os.path.normpath(os.path.abspath(resolved)))
+
+
+def _scan_local_image_refs(file_path: Path, root_dir: Path) -> Tuple[Path, List[Tuple[str, Path]], Optional[str]]:
+    """Process pool worker: resolve every local image reference in one markdown file"""
+    try:
+        content, _ = _read_markdown(file_path)
+    except Exception as e:
+        return file_path, [], str(e)
+    refs = []
+    for ref in scan_image_references(content):
+        resolved = resolve_local_reference(ref.url, file_path, root_dir)
+        if resolved is not None:
+            refs.append((ref.url, resolved))
+    return file_path, refs, None
+
+
+class DownloadMetrics:
+    """
+    Per-URL download instrumentation, aggregated per host
+    
+    Each fetch records total time, time spent waiting on the rate limiter,
+    time to first byte (connect + request + server think time, as measured
+    by requests) and body transfer time, plus bytes, retries and whether the
+    image was served from this run's cache. requests does not expose DNS or
+    TCP connect timings separately, so those are folded into TTFB.
+    """
+    
+    # Latency histogram bucket upper bounds in milliseconds
+    HISTOGRAM_BOUNDS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf')]
+    
+    def __init__(self, progress: bool = False):
+        self.progress = progress
+        self.records: List[dict] = []
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.expected = 0
+    
+    def expect(self, count: int):
+        """Set the number of fetches the progress line counts towards"""
+        with self.lock:
+            self.expected = count
+    
+    def record(self, url: str, cache: str, status: Optional[int] = None, bytes: int = 0,
+               total_ms: float = 0.0, wait_ms: float = 0.0, ttfb_ms: Optional[float] = None,
+               transfer_ms: Optional[float] = None, retries: int = 0, error: Optional[str] = None):
+        entry = {
+            'url': url, 'host': urlparse(url).netloc.lower(), 'cache': cache, 'status': status,
+            'bytes': bytes, 'total_ms': round(total_ms, 1), 'wait_ms': round(wait_ms, 1),
+            'ttfb_ms': None if ttfb_ms is None else round(ttfb_ms, 1),
+            'transfer_ms': None if transfer_ms is None else round(transfer_ms, 1),
+            'retries': retries, 'error': error,
+        }
+        with self.lock:
+            self.records.append(entry)
+            if self.progress:
+                self._print_progress()
+    
+    def _print_progress(self):
+        elapsed = time.perf_counter() - self.started
+        done = len(self.records)
+        total_bytes = sum(r['bytes'] for r in self.records)
+        failed = sum(1 for r in self.records if r['error'])
+        print(f"\r⬇️  {done}/{self.expected or '?'} images, {failed} failed, "
+              f"{total_bytes / 1e6:.1f} MB, {total_bytes / 1e6 / elapsed if elapsed else 0:.2f} MB/s",
+              end='', flush=True)
+    
+    @staticmethod
+    def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+        if not sorted_values:
+            return None
+        index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+        return round(sorted_values[index], 1)
+    
+    def summary(self) -> dict:
+        """Overall throughput plus per-host latency histograms and percentiles"""
+        wall = time.perf_counter() - self.started
+        fetched = [r for r in self.records if r['cache'] == 'miss']
+        total_bytes = sum(r['bytes'] for r in fetched)
+        hosts: Dict[str, dict] = {}
+        for r in fetched:
+            host = hosts.setdefault(r['host'], {'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0,
+                                                'wait_ms': 0.0, 'latencies': []})
+            host['requests'] += 1
+            host['errors'] += 1 if r['error'] else 0
+            host['retries'] += r['retries']
+            host['bytes'] += r['bytes']
+            host['wait_ms'] += r['wait_ms']
+            host['latencies'].append(r['total_ms'] - r['wait_ms'])
+        for host in hosts.values():
+            latencies = sorted(host.pop('latencies'))
+            histogram = [0] * len(self.HISTOGRAM_BOUNDS_MS)
+            for latency in latencies:
+                histogram[next(i for i, bound in enumerate(self.HISTOGRAM_BOUNDS_MS) if latency <= bound)] += 1
+            host['histogram_ms'] = {
+                (f"<={bound:g}" if bound != float('inf') else f">{self.HISTOGRAM_BOUNDS_MS[-2]:g}"): count
+                for bound, count in zip(self.HISTOGRAM_BOUNDS_MS, histogram)
+            }
+            host['p50_ms'] = self._percentile(latencies, 0.5)
+            host['p90_ms'] = self._percentile(latencies, 0.9)
+            host['p99_ms'] = self._percentile(latencies, 0.99)
+            host['wait_ms'] = round(host['wait_ms'], 1)
+        return {
+            'wall_s': round(wall, 3),
+            'fetched': len(fetched),
+            'cache_hits': sum(1 for r in self.records if r['cache'] == 'hit'),
+            'errors': sum(1 for r in fetched if r['error']),
+            'retries': sum(r['retries'] for r in fetched),
+            'bytes': total_bytes,
+            'bytes_per_s': round(total_bytes / wall, 1) if wall else 0.0,
+            'images_per_s': round(sum(1 for r in fetched if not r['error']) / wall, 2) if wall else 0.0,
+            'hosts': hosts,
+        }
+    
+    def write(self, path: str):
+        """Write metrics as JSON (summary + per-URL) or CSV (per-URL)"""
+        document = None
+        if path.lower().endswith('.json'):
+            document = {'summary': self.summary(), 'downloads': self.records}
+        write_report(path, self.records, document,
+                     ['url', 'host', 'cache', 'status', 'bytes', 'total_ms', 'wait_ms',
+                      'ttfb_ms', 'transfer_ms', 'retries', 'error'])
+    
+    def print_hosts(self):
+        for host, stats in sorted(self.summary()['hosts'].items()):
+            print(f"🌐 {host}: {stats['requests']} requests, {stats['errors']} errors, "
+                  f"{stats['retries']} retries, p50 {stats['p50_ms']} ms, p90 {stats['p90_ms']} ms, "
+                  f"rate-limit wait {stats['wait_ms'] / 1000:.1f}s")
+
 
 class MarkdownImageDownloader:
-    def __init__(self, root_dir: str = ".", images_dir: str = "images"):
+    def __init__(self, root_dir: str = ".", images_dir: str = "images",
+                 workers: Optional[int] = None, download_workers: int = 4,
+                 ignore_patterns: Optional[Sequence[str]] = None,
+                 use_gitignore: bool = True, state_file: Optional[str] = None,
+                 optimize: Optional[OptimizeOptions] = None,
+                 rate_limit: Optional[float] = 10.0, burst: int = 5,
+                 max_rate: Optional[float] = 50.0, max_retries: int = 3,
+                 metrics_file: Optional[str] = None, progress: bool = False):
         """
         Initialize the image downloader
         
         Args:
             root_dir: Root directory to scan for markdown files
             images_dir: Directory to store downloaded images
+            workers: Processes used to parse and rewrite markdown files
+                (defaults to the CPU count; 1 runs everything in-process)
+            download_workers: Concurrent image downloads
+            ignore_patterns: Gitignore-style patterns to skip while scanning
+                (defaults to DEFAULT_IGNORE_PATTERNS)
+            use_gitignore: Also honour .gitignore files found under root_dir
+            state_file: Enables incremental mode; per-file scan state is kept
+                here and unchanged, fully migrated files are skipped
+            optimize: Enables the post-download optimization stage (needs Pillow)
+            rate_limit: Starting requests per second per host; the rate adapts
+                to 429/503 responses (None or 0 disables rate limiting)
+            burst: Requests a host may receive back to back
+            max_rate: Ceiling the per-host rate may grow to while requests succeed
+            max_retries: Retries for a request answered with 429/503
+            metrics_file: Write per-URL and per-host download metrics here at
+                the end of run() (.json or .csv)
+            progress: Show a live progress line while downloading
         """
         self.root_dir = Path(root_dir)
         self.images_dir = Path(images_dir)
-        self.images_dir.mkdir(exist_ok=True)
-        
-        # Regex patterns for finding images in markdown
-        self.image_patterns = [
-            # ![alt text](url)
-            r'!\[([^\]]*)\]\(([^)]+)\)',
-            # <img src="url" alt="alt text">
-            r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>',
-            # [alt]: url
-            r'^\s*\[([^\]]+)\]:\s*([^\s]+)',
-        ]
+        
+        self.workers = workers or os.cpu_count() or 1
+        self.download_workers = max(1, download_workers)
+        self.ignore_patterns = list(DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns)
+        self.use_gitignore = use_gitignore
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.state = IncrementalState(Path(state_file), self.root_dir) if state_file else None
+        
+        if optimize is not None and Image is None:
+            print("✗ Pillow is not installed; image optimization is disabled")
+            optimize = None
+        self.optimize = optimize
+        self.bytes_before_optimize = 0
+        self.bytes_after_optimize = 0
+        self._optimized_outputs = set()
+        
+        self.rate_limiter = HostRateLimiter(rate_limit, burst, max_rate) if rate_limit else None
+        self.max_retries = max_retries
+        self.metrics_file = metrics_file
+        self.metrics = DownloadMetrics(progress)
         
         # Supported image extensions
         self.image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.bmp'}
@@ -38,10 +844,7 @@ class MarkdownImageDownloader:
         
     def find_markdown_files(self) -> List[Path]:
         """Find all markdown files in the root directory and subdirectories"""
-        markdown_files = []
-        for pattern in ['*.md', '*.markdown']:
-            markdown_files.extend(self.root_dir.rglob(pattern))
-        return markdown_files
+        return walk_markdown_files(self.root_dir, self.ignore_patterns, self.use_gitignore)
     
     def extract_image_urls(self, content: str) -> List[Tuple[str, str, str]]:
         """
@@ -50,30 +853,13 @@ class MarkdownImageDownloader:
         Returns:
             List of tuples: (full_match, alt_text, url)
         """
-        image_urls = []
-        
-        for pattern in self.image_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE)
-            for match in matches:
-                if pattern.startswith('!'):  # ![alt](url) format
-                    full_match = match.group(0)
-                    alt_text = match.group(1)
-                    url = match.group(2)
-                elif pattern.startswith('<img'):  # <img> format
-                    full_match = match.group(0)
-                    url = match.group(1)
-                    alt_match = re.search(r'alt=["\']([^"\']*)["\']', full_match)
-                    alt_text = alt_match.group(1) if alt_match else ""
-                else:  # [alt]: url format
-                    full_match = match.group(0)
-                    alt_text = match.group(1)
-                    url = match.group(2)
-                
-                # Check if it's an online image URL
-                if self.is_online_image_url(url):
-                    image_urls.append((full_match, alt_text, url))
-        
-        return image_urls
+        return [(ref.full_match, ref.alt_text, ref.url)
+                for ref in self.extract_image_references(content)]
+    
+    def extract_image_references(self, content: str) -> List[ImageReference]:
+        """Extract online image references from markdown content, in source order"""
+        return [ref for ref in scan_image_references(content)
+                if self.is_online_image_url(ref.url)]
     
     def is_online_image_url(self, url: str) -> bool:
         """Check if URL is an online image"""
@@ -123,87 +909,128 @@ class MarkdownImageDownloader:
     
     def download_image(self, url: str, filename: str) -> bool:
         """Download image from URL to local file"""
+        start = time.perf_counter()
+        wait = 0.0
+        retries = 0
+        response = None
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
+            bucket = self.rate_limiter.bucket(url) if self.rate_limiter else None
             
-            response = requests.get(url, headers=headers, timeout=30)
+            for attempt in range(self.max_retries + 1):
+                if bucket:
+                    waited_from = time.perf_counter()
+                    bucket.acquire()
+                    wait += time.perf_counter() - waited_from
+                response = requests.get(url, headers=headers, timeout=30, stream=True)
+                if response.status_code not in THROTTLE_STATUSES or attempt == self.max_retries:
+                    break
+                response.close()
+                retries += 1
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if bucket:
+                    bucket.penalize(retry_after)
+                else:
+                    time.sleep(retry_after or 2 ** attempt)
             response.raise_for_status()
+            if bucket:
+                bucket.reward()
             
+            transfer_from = time.perf_counter()
+            content = response.content
+            transfer = time.perf_counter() - transfer_from
+            
+            self.images_dir.mkdir(exist_ok=True)
             file_path = self.images_dir / filename
             with open(file_path, 'wb') as f:
-                f.write(response.content)
+                f.write(content)
             
-            print(f"✓ Downloaded: {filename}")
+            self.metrics.record(url, 'miss', status=response.status_code, bytes=len(content),
+                                total_ms=(time.perf_counter() - start) * 1000, wait_ms=wait * 1000,
+                                ttfb_ms=response.elapsed.total_seconds() * 1000,
+                                transfer_ms=transfer * 1000, retries=retries)
+            if not self.metrics.progress:
+                print(f"✓ Downloaded: {filename}")
             return True
             
         except Exception as e:
+            self.metrics.record(url, 'miss', status=response.status_code if response is not None else None,
+                                total_ms=(time.perf_counter() - start) * 1000, wait_ms=wait * 1000,
+                                retries=retries, error=str(e))
+            if self.metrics.progress:
+                print()
             print(f"✗ Failed to download {url}: {str(e)}")
             return False
     
+    def fetch_image(self, url: str, alt_text: str = "") -> Optional[str]:
+        """
+        Download an image once per run
+        
+        Returns:
+            Local filename inside images_dir, or None if the download failed
+        """
+        # Check if we already downloaded this image
+        if url in self.downloaded_images:
+            self.metrics.record(url, 'hit')
+            return self.downloaded_images[url]
+        
+        # Generate filename and download
+        local_filename = self.generate_filename(url, alt_text)
+        if not self.download_image(url, local_filename):
+            return None
+        self.downloaded_images[url] = local_filename
+        return local_filename
+    
+    def optimize_images(self, filenames: Sequence[str]) -> Dict[str, str]:
+        """
+        Run the optimization stage over downloaded files
+        
+        Returns:
+            Mapping of downloaded filename to the filename to reference
+        """
+        outputs = {filename: filename for filename in filenames}
+        # Files already produced by this stage (e.g. a URL referenced again
+        # from a later markdown file) are not optimized twice
+        filenames = [f for f in filenames if f not in self._optimized_outputs]
+        if self.optimize is None or not filenames:
+            return outputs
+        
+        images_dir = self.images_dir.absolute()
+        results = self._map(_optimize_image, [images_dir] * len(filenames), filenames,
+                            [self.optimize] * len(filenames))
+        for result in results:
+            outputs[result.source] = result.output
+            self._optimized_outputs.add(result.output)
+            if result.error:
+                print(f"✗ Failed to optimize {result.source}: {result.error}")
+                continue
+            self.bytes_before_optimize += result.bytes_before
+            self.bytes_after_optimize += result.bytes_after
+            if result.output != result.source or result.bytes_after < result.bytes_before:
+                print(f"✓ Optimized: {result.output} ({result.bytes_before:,} → {result.bytes_after:,} bytes"
+                      f"{', cached' if result.cached else ''})")
+        
+        # Later references to the same URL must resolve to the optimized file
+        for url, filename in self.downloaded_images.items():
+            self.downloaded_images[url] = outputs.get(filename, filename)
+        return outputs
+    
     def process_markdown_file(self, file_path: Path) -> int:
         """Process a single markdown file and update image references"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            original_content = content
-            image_urls = self.extract_image_urls(content)
-            
-            if not image_urls:
-                return 0
-            
-            print(f"\nProcessing: {file_path}")
-            print(f"Found {len(image_urls)} images")
-            
-            updated_count = 0
-            
-            for full_match, alt_text, url in image_urls:
-                # Check if we already downloaded this image
-                if url in self.downloaded_images:
-                    local_filename = self.downloaded_images[url]
-                else:
-                    # Generate filename and download
-                    local_filename = self.generate_filename(url, alt_text)
-                    
-                    if self.download_image(url, local_filename):
-                        self.downloaded_images[url] = local_filename
-                    else:
-                        continue  # Skip this image if download failed
-                
-                # Calculate relative path from markdown file to images directory
-                relative_path = os.path.relpath(self.images_dir / local_filename, file_path.parent)
-                
-                # Update the markdown content
-                if full_match.startswith('!['):
-                    # Standard markdown format
-                    new_reference = f"![{alt_text}]({relative_path})"
-                elif full_match.startswith('<img'):
-                    # HTML img tag - keep original but update src
-                    new_reference = re.sub(r'src=["\'][^"\']+["\']', f'src="{relative_path}"', full_match)
-                else:
-                    # Reference style
-                    new_reference = f"[{alt_text}]: {relative_path}"
-                
-                content = content.replace(full_match, new_reference)
-                updated_count += 1
-            
-            # Write back the updated content if changes were made
-            if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"✓ Updated {updated_count} image references in {file_path}")
-            
-            return updated_count
-            
-        except Exception as e:
-            print(f"✗ Error processing {file_path}: {str(e)}")
-            return 0
+        return self._process_files([file_path])[0]
+    
+    def _map(self, func, *iterables):
+        """Run ``func`` over the arguments in the process pool, or in-process for one worker"""
+        if self._pool is None:
+            return list(map(func, *iterables))
+        return list(self._pool.map(func, *iterables, chunksize=8))
     
     def run(self):
         """Main method to process all markdown files"""
         print("🔍 Scanning for markdown files...")
+        self.metrics.started = time.perf_counter()
         markdown_files = self.find_markdown_files()
         
         if not markdown_files:
@@ -213,36 +1040,564 @@ class MarkdownImageDownloader:
         print(f"Found {len(markdown_files)} markdown files")
         print(f"Images will be saved to: {self.images_dir.absolute()}")
         
-        total_images = 0
-        total_files_updated = 0
+        to_process = markdown_files
+        if self.state is not None:
+            self.state.retain(markdown_files)
+            # A stat is enough to rule out files that cannot have changed
+            to_process = [file_path for file_path in markdown_files
+                          if not self.state.is_fresh(file_path, os.stat(file_path))]
+            print(f"⏭️  Unchanged since last run: {len(markdown_files) - len(to_process)}")
         
-        for file_path in markdown_files:
-            updated_count = self.process_markdown_file(file_path)
-            if updated_count > 0:
-                total_files_updated += 1
-                total_images += updated_count
-            
-            # Small delay to be respectful to servers
-            time.sleep(0.5)
+        total_images = total_files_updated = 0
+        if to_process:
+            # Optimization parallelizes over images, not markdown files
+            workers = self.workers if self.optimize else min(self.workers, len(to_process))
+            self._pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                total_images, total_files_updated = self._process_files(to_process)
+            finally:
+                if self._pool is not None:
+                    self._pool.shutdown()
+                self._pool = None
+        
+        if self.state is not None:
+            self.state.save()
         
         print(f"\n🎉 Complete!")
-        print(f"📁 Files processed: {len(markdown_files)}")
+        print(f"📁 Files processed: {len(to_process)}")
         print(f"📄 Files updated: {total_files_updated}")
         print(f"🖼️  Images downloaded: {len(self.downloaded_images)}")
         print(f"🔗 References updated: {total_images}")
         print(f"📂 Images saved to: {self.images_dir.absolute()}")
+        if self.optimize is not None:
+            saved = self.bytes_before_optimize - self.bytes_after_optimize
+            print(f"💾 Bytes saved by optimization: {saved:,} "
+                  f"({self.bytes_before_optimize:,} → {self.bytes_after_optimize:,})")
+        
+        summary = self.metrics.summary()
+        if summary['fetched']:
+            print(f"⚡ Throughput: {summary['images_per_s']} images/s, "
+                  f"{summary['bytes_per_s'] / 1e6:.2f} MB/s, {summary['retries']} retries")
+            self.metrics.print_hosts()
+        if self.metrics_file:
+            self.metrics.write(self.metrics_file)
+            print(f"📊 Metrics written to: {self.metrics_file}")
+    
+    def _process_files(self, markdown_files: List[Path]) -> Tuple[int, int]:
+        """
+        Scan, download and rewrite in three phases
+        
+        Parsing and rewriting are spread across the process pool; downloads
+        are deduplicated across all files and fetched centrally by a bounded
+        thread pool, so each URL is requested once per run.
+        
+        Returns:
+            Tuple of (references_updated, files_updated)
+        """
+        # Phase 1: scan every file for online image references
+        pending: Dict[Path, Dict[str, str]] = {}  # file -> {url: alt_text}
+        for file_path, refs, fingerprint, error in self._map(_scan_markdown_file, markdown_files):
+            if error:
+                print(f"✗ Error processing {file_path}: {error}")
+                continue
+            if self.state is not None and self.state.is_migrated(file_path, fingerprint.digest):
+                # Touched but not modified: refresh the recorded stat only
+                self.state.record(file_path, fingerprint, ())
+                continue
+            online = {}
+            for url, alt_text in refs:
+                if url not in online and self.is_online_image_url(url):
+                    online[url] = alt_text
+            if online:
+                pending[file_path] = online
+                print(f"Found {len(online)} images in {file_path}")
+            if self.state is not None:
+                # Provisional: URLs that get rewritten are dropped in phase 3
+                self.state.record(file_path, fingerprint, online)
+        
+        if not pending:
+            return 0, 0
+        
+        # Phase 2: download each distinct URL once, named after its first alt text
+        first_alt: Dict[str, str] = {}
+        references = 0
+        for online in pending.values():
+            references += len(online)
+            for url, alt_text in online.items():
+                first_alt.setdefault(url, alt_text)
+        self.metrics.expect(references)
+        with ThreadPoolExecutor(max_workers=self.download_workers) as downloads:
+            fetched = dict(zip(first_alt, downloads.map(self.fetch_image, first_alt, first_alt.values())))
+        # References to a URL after its first are served from this run's cache
+        for online in pending.values():
+            for url in online:
+                if fetched[url] is not None and first_alt.pop(url, None) is None:
+                    self.metrics.record(url, 'hit')
+        if self.metrics.progress:
+            print()
+        
+        # Optional: shrink downloads before anything points at them
+        optimized = self.optimize_images(sorted({f for f in fetched.values() if f is not None}))
+        fetched = {url: optimized[f] if f is not None else None for url, f in fetched.items()}
+        
+        # Phase 3: rewrite files whose images were fetched
+        jobs = []
+        for file_path, online in pending.items():
+            local_files = {url: fetched[url] for url in online if fetched[url] is not None}
+            if local_files:
+                jobs.append((file_path, local_files))
+        
+        total_images = 0
+        total_files_updated = 0
+        results = self._map(_rewrite_markdown_file,
+                            [file_path for file_path, _ in jobs],
+                            [self.images_dir.absolute()] * len(jobs),
+                            [local_files for _, local_files in jobs])
+        for (file_path, local_files), (_, updated_count, fingerprint, error) in zip(jobs, results):
+            if error:
+                print(f"✗ Error processing {file_path}: {error}")
+                continue
+            if self.state is not None and fingerprint is not None:
+                outstanding = set(pending[file_path]) - set(local_files)
+                self.state.record(file_path, fingerprint, outstanding)
+            if updated_count > 0:
+                print(f"✓ Updated {updated_count} image references in {file_path}")
+                total_files_updated += 1
+                total_images += updated_count
+        return total_images, total_files_updated
+
+
+class LinkChecker:
+    """
+    Validate every remote image and link in the markdown tree without downloading
+    
+    URLs are found with the downloader's walker and process pool, then
+    checked concurrently with HEAD requests, falling back to a one-byte
+    ranged GET for servers that reject HEAD. Redirects are followed by hand
+    so the full chain is reported. The per-host rate limiter is shared with
+    the downloader. Results are cached in a JSON file and reused until they
+    are older than the TTL; checks that got no HTTP answer at all (timeouts,
+    connection errors) are retried after the much shorter ERROR_TTL.
+    """
+    
+    # HEAD answers that mean "try GET instead" rather than "broken"
+    HEAD_UNSUPPORTED = {403, 405, 501}
+    MAX_REDIRECTS = 10
+    # Seconds a cached transient failure (no HTTP status) stays valid
+    ERROR_TTL = 5 * 60
+    
+    def __init__(self, downloader: MarkdownImageDownloader, cache_file: Optional[str] = None,
+                 ttl: float = 24 * 3600, workers: int = 16, timeout: float = 15.0):
+        """
+        Args:
+            downloader: Supplies the markdown walker, URL classification and rate limiter
+            cache_file: JSON results cache (None disables caching)
+            ttl: Seconds a cached result stays valid
+            workers: Concurrent requests
+            timeout: Per-request timeout in seconds
+        """
+        self.downloader = downloader
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = ttl
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache: Dict[str, dict] = {}
+        self._local = threading.local()
+    
+    def _session(self) -> requests.Session:
+        # One session per thread so connections to a host are reused
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; imagemd-linkcheck)'
+        return session
+    
+    def _request(self, method: str, url: str) -> requests.Response:
+        limiter = self.downloader.rate_limiter
+        bucket = limiter.bucket(url) if limiter else None
+        headers = {'Range': 'bytes=0-0'} if method == 'GET' else {}
+        for attempt in range(self.downloader.max_retries + 1):
+            if bucket:
+                bucket.acquire()
+            response = self._session().request(method, url, headers=headers, timeout=self.timeout,
+                                               allow_redirects=False, stream=True)
+            response.close()
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.downloader.max_retries:
+                break
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if bucket:
+                bucket.penalize(retry_after)
+            else:
+                time.sleep(retry_after or 2 ** attempt)
+        if bucket and response.status_code < 400:
+            bucket.reward()
+        return response
+    
+    @staticmethod
+    def _size(response: requests.Response) -> Optional[int]:
+        content_range = response.headers.get('Content-Range', '')
+        if '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            return int(total) if total.isdigit() else None
+        length = response.headers.get('Content-Length')
+        return int(length) if length and length.isdigit() and response.request.method == 'HEAD' else None
+    
+    def check_url(self, url: str) -> dict:
+        """Check one URL, following redirects, and describe the outcome"""
+        start = time.perf_counter()
+        chain: List[str] = []
+        method = 'HEAD'
+        current = url
+        result = {'url': url, 'status': None, 'ok': False, 'latency_ms': None, 'size': None,
+                  'redirects': chain, 'method': method, 'error': None}
+        try:
+            while True:
+                try:
+                    response = self._request(method, current)
+                except requests.RequestException:
+                    if method == 'GET':
+                        raise
+                    response = None
+                if method == 'HEAD' and (response is None or response.status_code in self.HEAD_UNSUPPORTED):
+                    method = 'GET'
+                    continue
+                if response.is_redirect:
+                    chain.append(current)
+                    if len(chain) > self.MAX_REDIRECTS:
+                        result['status'] = response.status_code
+                        raise requests.TooManyRedirects(f"too many redirects (more than {self.MAX_REDIRECTS})")
+                    current = requests.compat.urljoin(current, response.headers['Location'])
+                    method = 'HEAD'
+                    continue
+                break
+            result.update(status=response.status_code, ok=response.status_code < 400,
+                          size=self._size(response), method=method)
+            if chain:
+                chain.append(current)
+        except Exception as e:
+            result['error'] = str(e)
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        result['checked_at'] = time.time()
+        return result
+    
+    def load_cache(self):
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+    
+    def save_cache(self):
+        if self.cache_file is None:
+            return
+        tmp_path = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.cache_file)
+    
+    def is_stale(self, url: str, now: float) -> bool:
+        """True if ``url`` has no cached result or the cached one has expired"""
+        cached = self.cache.get(url)
+        if cached is None:
+            return True
+        ttl = self.ttl if cached.get('status') is not None else min(self.ttl, self.ERROR_TTL)
+        return now - cached.get('checked_at', 0) > ttl
+    
+    def collect_urls(self) -> Dict[str, List[str]]:
+        """Map every remote URL in the tree to the markdown files that reference it"""
+        markdown_files = self.downloader.find_markdown_files()
+        workers = min(self.downloader.workers, len(markdown_files))
+        self.downloader._pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            scanned = self.downloader._map(_scan_remote_urls_file, markdown_files)
+        finally:
+            if self.downloader._pool is not None:
+                self.downloader._pool.shutdown()
+            self.downloader._pool = None
+        
+        referenced_by: Dict[str, List[str]] = {}
+        for file_path, urls, error in scanned:
+            if error:
+                print(f"✗ Error reading {file_path}: {error}")
+                continue
+            for url in urls:
+                referenced_by.setdefault(url, []).append(str(file_path))
+        return referenced_by
+    
+    def run(self, report_path: Optional[str] = None) -> List[dict]:
+        """Check every URL in the tree, print a summary and optionally write a report"""
+        print("🔍 Collecting remote URLs...")
+        referenced_by = self.collect_urls()
+        print(f"Found {len(referenced_by)} distinct remote URLs")
+        
+        self.load_cache()
+        now = time.time()
+        stale = [url for url in referenced_by if self.is_stale(url, now)]
+        print(f"Cached: {len(referenced_by) - len(stale)}, checking: {len(stale)}")
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for result in pool.map(self.check_url, stale):
+                self.cache[result['url']] = result
+        elapsed = time.perf_counter() - start
+        self.save_cache()
+        
+        results = []
+        for url, files in sorted(referenced_by.items()):
+            result = dict(self.cache[url])
+            result['image'] = self.downloader.is_online_image_url(url)
+            result['files'] = files
+            results.append(result)
+        
+        broken = [r for r in results if not r['ok']]
+        for r in broken:
+            print(f"✗ {r['status'] or r['error']}: {r['url']}")
+            for file_path in r['files']:
+                print(f"    in {file_path}")
+        print(f"\n🎉 Checked {len(stale)} URLs in {elapsed:.1f}s")
+        print(f"✓ OK: {len(results) - len(broken)}")
+        print(f"✗ Broken: {len(broken)}")
+        print(f"↪️  Redirected: {sum(1 for r in results if r['redirects'])}")
+        
+        if report_path:
+            write_link_report(results, report_path)
+            print(f"📄 Report written to: {report_path}")
+        return results
+
+
+class ImageAudit:
+    """
+    Reverse index of local image references, for finding rot in the images directory
+    
+    One parallel scan of the markdown tree maps every referenced local file
+    to the markdown files using it. From that the audit reports references
+    to missing files, references that resolve outside the repository root
+    and image files nobody references (orphans), which ``collect_garbage``
+    can delete or move to a quarantine directory.
+    """
+    
+    # Housekeeping directories inside images_dir that are never orphans
+    SKIP_DIRS = {'.optimize-cache', '.quarantine'}
+    
+    def __init__(self, downloader: MarkdownImageDownloader):
+        self.downloader = downloader
+        self.root_dir = Path(os.path.abspath(downloader.root_dir))
+        self.images_dir = Path(os.path.abspath(downloader.images_dir))
+        # resolved target -> [(markdown file, url as written)]
+        self.references: Dict[Path, List[Tuple[Path, str]]] = {}
+        self.missing: List[Tuple[Path, str, Path]] = []
+        self.escaping: List[Tuple[Path, str, Path]] = []
+        self.orphans: List[Tuple[Path, int]] = []
+        self.scanned: Set[Path] = set()
+        self.unreadable: List[Path] = []
+    
+    def build_index(self):
+        """Scan all markdown files and classify every local image reference"""
+        markdown_files = self.downloader.find_markdown_files()
+        workers = min(self.downloader.workers, len(markdown_files))
+        self.downloader._pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            scanned = self.downloader._map(_scan_local_image_refs, markdown_files,
+                                           [self.root_dir] * len(markdown_files))
+        finally:
+            if self.downloader._pool is not None:
+                self.downloader._pool.shutdown()
+            self.downloader._pool = None
+        
+        self.scanned = set(markdown_files)
+        self.unreadable = []
+        for file_path, refs, error in scanned:
+            if error:
+                print(f"✗ Error reading {file_path}: {error}")
+                self.unreadable.append(file_path)
+                continue
+            for url, target in refs:
+                self.references.setdefault(target, []).append((file_path, url))
+        
+        for target, users in self.references.items():
+            inside = target == self.root_dir or self.root_dir in target.parents
+            exists = target.is_file()
+            for file_path, url in users:
+                if not inside:
+                    self.escaping.append((file_path, url, target))
+                if not exists:
+                    self.missing.append((file_path, url, target))
+        
+        self.orphans = []
+        if self.images_dir.is_dir():
+            extensions = self.downloader.image_extensions
+            for dir_path, dir_names, file_names in os.walk(self.images_dir):
+                dir_names[:] = [d for d in dir_names if d not in self.SKIP_DIRS]
+                for name in file_names:
+                    path = Path(dir_path) / name
+                    if path.suffix.lower() in extensions and path not in self.references:
+                        self.orphans.append((path, path.stat().st_size))
+        self.orphans.sort()
+    
+    def report(self):
+        print(f"\n🖼️  Referenced local images: {len(self.references)}")
+        print(f"✗ Missing targets: {len(self.missing)}")
+        for file_path, url, _ in self.missing:
+            print(f"    {file_path}: {url}")
+        print(f"⚠️  References escaping {self.root_dir}: {len(self.escaping)}")
+        for file_path, url, target in self.escaping:
+            print(f"    {file_path}: {url} -> {target}")
+        orphan_bytes = sum(size for _, size in self.orphans)
+        print(f"🗑️  Orphaned files in {self.images_dir}: {len(self.orphans)} ({orphan_bytes:,} bytes)")
+        for path, size in self.orphans:
+            print(f"    {path.relative_to(self.images_dir)} ({size:,} bytes)")
+    
+    def collect_garbage(self, action: str = 'quarantine', dry_run: bool = False) -> int:
+        """
+        Remove orphaned files from the images directory
+        
+        The index honours the ignore rules, so before anything is removed the
+        markdown files it skipped are scanned as well: an image referenced
+        only from an ignored tree (a gitignored docs build, say) is kept.
+        Nothing is removed if any markdown file could not be read.
+        
+        Args:
+            action: 'quarantine' moves orphans to images_dir/.quarantine/<timestamp>/,
+                'delete' removes them
+            dry_run: Only print what would happen
+        
+        Returns:
+            Bytes reclaimed (or that would be reclaimed)
+        """
+        if action not in ('quarantine', 'delete'):
+            raise ValueError(f"Unknown garbage collection action: {action}")
+        everything = walk_markdown_files(self.downloader.root_dir, (), use_gitignore=False)
+        skipped = [file_path for file_path in everything if file_path not in self.scanned]
+        in_use = set()
+        unreadable = list(self.unreadable)
+        for file_path, refs, error in map(_scan_local_image_refs, skipped, [self.root_dir] * len(skipped)):
+            if error:
+                print(f"✗ Error reading {file_path}: {error}")
+                unreadable.append(file_path)
+            in_use.update(target for _, target in refs)
+        if unreadable:
+            print(f"✗ Not collecting garbage: {len(unreadable)} markdown files could not be read")
+            return 0
+        
+        quarantine_dir = self.images_dir / '.quarantine' / time.strftime('%Y%m%d-%H%M%S')
+        reclaimed = 0
+        for path, size in self.orphans:
+            # Re-check right before acting: the tree may have changed since the scan
+            if path in self.references or not path.is_file():
+                continue
+            relative = path.relative_to(self.images_dir)
+            if path in in_use:
+                print(f"⏭️  Kept, referenced from an ignored file: {relative}")
+                continue
+            if dry_run:
+                print(f"Would {action}: {relative}")
+            elif action == 'delete':
+                path.unlink()
+                print(f"🗑️  Deleted: {relative}")
+            else:
+                destination = quarantine_dir / relative
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, destination)
+                print(f"📦 Quarantined: {relative}")
+            reclaimed += size
+        print(f"{'Would reclaim' if dry_run else 'Reclaimed'} {reclaimed:,} bytes")
+        return reclaimed
+    
+    def run(self, gc_action: Optional[str] = None, dry_run: bool = False):
+        print("🔍 Indexing local image references...")
+        self.build_index()
+        self.report()
+        if gc_action:
+            self.collect_garbage(gc_action, dry_run)
+
+
+def write_link_report(results: List[dict], report_path: str):
+    """Write link check results as CSV (lists joined into one cell) or JSON"""
+    rows = [dict(result, redirects=' -> '.join(result['redirects']), files=', '.join(result['files']))
+            for result in results]
+    write_report(report_path, rows, results, ['url', 'ok', 'status', 'latency_ms', 'size', 'method',
+                                              'image', 'redirects', 'error', 'files'])
 
 
 def main():
     """Main function to run the image downloader"""
+    parser = argparse.ArgumentParser(description="Download online images referenced by markdown files")
+    parser.add_argument("root", nargs="?", default=".", help="Root directory to scan for markdown files")
+    parser.add_argument("--images-dir", default="images", help="Local images folder")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to parse and rewrite markdown (default: CPU count)")
+    parser.add_argument("--download-workers", type=int, default=4, help="Concurrent image downloads")
+    parser.add_argument("--ignore", action="append", default=[], metavar="PATTERN",
+                        help="Extra gitignore-style pattern to skip (repeatable)")
+    parser.add_argument("--no-default-ignores", action="store_true",
+                        help="Do not skip build/, android/, node_modules/ and similar directories")
+    parser.add_argument("--no-gitignore", action="store_true", help="Do not honour .gitignore files")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip markdown files unchanged since the last incremental run")
+    parser.add_argument("--state-file", default=None,
+                        help="Incremental state file (default: <root>/.imagemd-state.json)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Resize/recompress downloaded images and strip metadata (needs Pillow)")
+    parser.add_argument("--max-width", type=int, default=None, help="Downscale images wider than this")
+    parser.add_argument("--quality", type=int, default=None,
+                        help="Lossy quality 1-100 (default: lossless recompression)")
+    parser.add_argument("--webp", action="store_true", help="Transcode optimized images to WebP")
+    parser.add_argument("--rate", type=float, default=10.0,
+                        help="Starting requests/s per host, adapted on 429/503 (0 disables)")
+    parser.add_argument("--max-rate", type=float, default=50.0,
+                        help="Ceiling the per-host rate grows to while requests succeed")
+    parser.add_argument("--burst", type=int, default=5, help="Back-to-back requests allowed per host")
+    parser.add_argument("--metrics", default=None,
+                        help="Write per-URL and per-host download metrics (.json or .csv)")
+    parser.add_argument("--progress", action="store_true", help="Show a live download progress line")
+    parser.add_argument("--check", action="store_true",
+                        help="Check every remote image and link instead of downloading")
+    parser.add_argument("--check-workers", type=int, default=16, help="Concurrent link checks")
+    parser.add_argument("--ttl", type=float, default=24 * 3600,
+                        help="Seconds a cached link check result stays valid")
+    parser.add_argument("--check-cache", default=None,
+                        help="Link check cache file (default: <root>/.imagemd-linkcheck.json)")
+    parser.add_argument("--report", default=None, help="Write the link check report (.csv or .json)")
+    parser.add_argument("--audit", action="store_true",
+                        help="Report missing, escaping and orphaned local images instead of downloading")
+    parser.add_argument("--gc", choices=["quarantine", "delete"], default=None,
+                        help="With --audit: quarantine or delete orphaned files in the images folder")
+    parser.add_argument("--dry-run", action="store_true", help="With --gc: only show what would be removed")
+    args = parser.parse_args()
+    
     print("🚀 Starting Markdown Image Downloader")
     print("=" * 50)
     
-    # You can customize these paths
-    root_directory = "."  # Current directory - change if needed
-    images_directory = "images"  # Local images folder
-    
-    downloader = MarkdownImageDownloader(root_directory, images_directory)
+    optimize = None
+    if args.optimize or args.max_width or args.quality is not None or args.webp:
+        optimize = OptimizeOptions(max_width=args.max_width, quality=args.quality, webp=args.webp)
+    state_file = None
+    if args.incremental or args.state_file:
+        state_file = args.state_file or os.path.join(args.root, ".imagemd-state.json")
+    ignore_patterns = ([] if args.no_default_ignores else list(DEFAULT_IGNORE_PATTERNS)) + args.ignore
+    downloader = MarkdownImageDownloader(args.root, args.images_dir,
+                                         workers=args.workers,
+                                         download_workers=args.download_workers,
+                                         ignore_patterns=ignore_patterns,
+                                         use_gitignore=not args.no_gitignore,
+                                         state_file=state_file,
+                                         optimize=optimize,
+                                         rate_limit=args.rate,
+                                         burst=args.burst,
+                                         max_rate=args.max_rate,
+                                         metrics_file=args.metrics,
+                                         progress=args.progress)
+    if args.check:
+        checker = LinkChecker(downloader,
+                              cache_file=args.check_cache or os.path.join(args.root, ".imagemd-linkcheck.json"),
+                              ttl=args.ttl, workers=args.check_workers)
+        checker.run(args.report)
+        return
+    if args.audit:
+        ImageAudit(downloader).run(args.gc, args.dry_run)
+        return
     downloader.run()
 
 
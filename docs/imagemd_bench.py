@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark harness for MarkdownImageDownloader.
+
+Starts a local HTTP stand-in for S3/GitHub with configurable latency,
+bandwidth, error rate, redirects and ETag support, generates a synthetic
+docs tree, and times imagemd.py against it, cold and then warm (the
+rewritten tree again, with the same state, so unchanged files are skipped).
+Nothing leaves the machine.
+
+Example:
+    python imagemd_bench.py --files 200 --images 2000 --latency 0.05 \
+        --download-workers 1 4 16
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from imagemd import MarkdownImageDownloader
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class ServerConfig:
+    def __init__(self, latency: float = 0.0, bandwidth: Optional[int] = None,
+                 error_rate: float = 0.0, redirect_rate: float = 0.0,
+                 image_size: int = 64 * 1024, seed: int = 0):
+        """
+        Behaviour of the stand-in image server
+
+        Args:
+            latency: Seconds to wait before answering each request
+            bandwidth: Bytes per second per response (None = unthrottled)
+            error_rate: Fraction of image requests answered with 500/503
+            redirect_rate: Fraction of image requests answered with a 302
+            image_size: Body size of every image in bytes
+            seed: Seed for the error/redirect dice
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.redirect_rate = redirect_rate
+        self.image_size = image_size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+        # Counters, updated by handler threads under the lock
+        self.requests = 0
+        self.bytes_sent = 0
+        self.errors = 0
+        self.redirects = 0
+        self.not_modified = 0
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+    def count(self, **deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+
+def image_body(path: str, size: int) -> bytes:
+    """Deterministic, opaque payload for an image path"""
+    seed = hashlib.sha256(path.encode()).digest()
+    repeats = (size - len(PNG_SIGNATURE)) // len(seed) + 1
+    return (PNG_SIGNATURE + seed * repeats)[:size]
+
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    # Set on the per-server subclass created by StandInServer
+    config: ServerConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        config = self.config
+        config.count(requests=1)
+        if config.latency:
+            time.sleep(config.latency)
+
+        path, _, query = self.path.partition('?')
+        if not path.startswith('/img/'):
+            self.send_error(404)
+            return
+        # A redirected request carries ?r=1 and is always served
+        if 'r=1' not in query:
+            if config.roll() < config.error_rate:
+                config.count(errors=1)
+                self.send_error(503 if config.roll() < 0.5 else 500)
+                return
+            if config.roll() < config.redirect_rate:
+                config.count(redirects=1)
+                self.send_response(302)
+                self.send_header('Location', f'{path}?r=1')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        body = image_body(path, config.image_size)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            config.count(not_modified=1)
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'none')
+        self.end_headers()
+        if not send_body:
+            return
+        chunk_size = 16 * 1024
+        for offset in range(0, len(body), chunk_size):
+            chunk = body[offset:offset + chunk_size]
+            self.wfile.write(chunk)
+            config.count(bytes_sent=len(chunk))
+            if config.bandwidth:
+                time.sleep(len(chunk) / config.bandwidth)
+
+
+class StandInServer:
+    """Threaded HTTP server on 127.0.0.1, usable as a context manager"""
+
+    def __init__(self, config: ServerConfig):
+        handler = type('ConfiguredHandler', (ImageRequestHandler,), {'config': config})
+        self.config = config
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self) -> "StandInServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def generate_docs_tree(root: Path, base_url: str, files: int, images: int,
+                       distinct: Optional[int] = None, seed: int = 0) -> int:
+    """
+    Write ``files`` markdown files holding ``images`` image references in total
+
+    References cycle through the three supported syntaxes and point at
+    ``distinct`` different URLs (default: all distinct), spread over nested
+    directories like a real docs tree.
+
+    Returns:
+        Number of distinct URLs referenced
+    """
+    rng = random.Random(seed)
+    distinct = distinct or images
+    per_file = [images // files + (1 if i < images % files else 0) for i in range(files)]
+    ref = 0
+    for i, count in enumerate(per_file):
+        directory = root / f'section{i % 10}' / f'part{i % 7}'
+        directory.mkdir(parents=True, exist_ok=True)
+        lines = [f'# Synthetic page {i}', '']
+        for _ in range(count):
+            url = f'{base_url}/img/{ref % distinct}.png'
+            style = ref % 3
+            if style == 0:
+                lines.append(f'![Figure {ref}]({url})')
+            elif style == 1:
+                lines.append(f'<img src="{url}" alt="Figure {ref}">')
+            else:
+                lines.append(f'[fig{ref}]: {url}')
+            lines.append('Lorem ipsum dolor sit amet. ' * rng.randint(1, 4))
+            ref += 1
+        (directory / f'page{i}.md').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return min(distinct, images)
+
+
+def _max_rss_kb() -> Optional[Dict[str, int]]:
+    """High-water RSS of this process and its reaped children, over their lifetime"""
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1024 if sys.platform == 'darwin' else 1
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+
+def _timed_run(downloader: MarkdownImageDownloader, verbose: bool) -> float:
+    """Run the downloader; returns wall seconds"""
+    start = time.perf_counter()
+    output = sys.stdout if verbose else io.StringIO()
+    with contextlib.redirect_stdout(output):
+        downloader.run()
+    return time.perf_counter() - start
+
+
+def _traced_run(downloader: MarkdownImageDownloader) -> int:
+    """Run the downloader under tracemalloc; returns the peak traced bytes"""
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            downloader.run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(args, download_workers: int) -> Dict[str, float]:
+    """
+    Run the downloader against a fresh tree and server, then once more warm
+
+    The warm pass reruns over the tree the first pass rewrote, with the
+    same state file, so it measures the incremental skip: only files left
+    with remote images (failed downloads) are opened and requested again.
+
+    With args.trace_memory, a third, untimed cold pass over a fresh tree
+    measures the peak Python heap, since tracing every allocation would
+    slow the timed passes down.
+    """
+    config = ServerConfig(latency=args.latency, bandwidth=args.bandwidth,
+                          error_rate=args.error_rate, redirect_rate=args.redirect_rate,
+                          image_size=args.image_size, seed=args.seed)
+    work_dir = Path(tempfile.mkdtemp(prefix='imagemd-bench-'))
+    try:
+        with StandInServer(config) as server:
+            def downloader(run_dir: Path):
+                return MarkdownImageDownloader(str(run_dir / 'docs'), str(run_dir / 'images'),
+                                               workers=args.workers,
+                                               download_workers=download_workers,
+                                               state_file=str(run_dir / 'state.json'),
+                                               rate_limit=args.rate)
+
+            distinct = generate_docs_tree(work_dir / 'docs', server.base_url, args.files, args.images,
+                                          args.distinct, args.seed)
+            cold = downloader(work_dir)
+            wall = _timed_run(cold, args.verbose)
+            cold_counts = {name: getattr(config, name)
+                           for name in ('requests', 'bytes_sent', 'errors', 'redirects', 'not_modified')}
+
+            warm_wall = _timed_run(downloader(work_dir), args.verbose)
+            warm_requests = config.requests - cold_counts['requests']
+            warm_bytes = config.bytes_sent - cold_counts['bytes_sent']
+
+            peak = None
+            if args.trace_memory:
+                traced_dir = work_dir / 'traced'
+                generate_docs_tree(traced_dir / 'docs', server.base_url, args.files, args.images,
+                                   args.distinct, args.seed)
+                peak = _traced_run(downloader(traced_dir))
+
+        downloaded = len(cold.downloaded_images)
+        return {
+            'download_workers': download_workers,
+            'wall_s': wall,
+            'images': downloaded,
+            'distinct_urls': distinct,
+            'images_per_s': downloaded / wall if wall else 0.0,
+            'bytes': cold_counts['bytes_sent'],
+            'bytes_per_s': cold_counts['bytes_sent'] / wall if wall else 0.0,
+            'requests': cold_counts['requests'],
+            'errors': cold_counts['errors'],
+            'redirects': cold_counts['redirects'],
+            'not_modified': cold_counts['not_modified'],
+            'warm_wall_s': warm_wall,
+            'warm_requests': warm_requests,
+            'warm_bytes': warm_bytes,
+            'peak_traced_mb': None if peak is None else peak / 1e6,
+            'max_rss_kb': _max_rss_kb(),
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_report(results: List[Dict[str, float]]):
+    print(f"\n{'dl-workers':>10} {'wall s':>8} {'images':>7} {'img/s':>8} {'MB/s':>7} "
+          f"{'reqs':>6} {'errs':>5} {'302s':>5} {'warm s':>7} {'w-reqs':>6} {'peak MB':>8} {'max RSS':>10}")
+    for r in results:
+        rss = r['max_rss_kb']
+        rss_text = f"{rss['self'] // 1024}M/{rss['children'] // 1024}M" if rss else 'n/a'
+        peak_text = f"{r['peak_traced_mb']:.1f}" if r['peak_traced_mb'] is not None else '-'
+        print(f"{r['download_workers']:>10} {r['wall_s']:>8.2f} {r['images']:>7} "
+              f"{r['images_per_s']:>8.1f} {r['bytes_per_s'] / 1e6:>7.2f} {r['requests']:>6} "
+              f"{r['errors']:>5} {r['redirects']:>5} {r['warm_wall_s']:>7.2f} {r['warm_requests']:>6} "
+              f"{peak_text:>8} {rss_text:>10}")
+    print("\nwarm s/w-reqs: second pass over the rewritten tree and its state; "
+          "only files with failed downloads are requested again")
+    print("peak MB: Python heap of the coordinating process, from an extra untimed pass "
+          "(--trace-memory); max RSS: self/children high-water marks of the run's own process")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark for imagemd.py")
+    parser.add_argument('--files', type=int, default=50, help="Markdown files to generate")
+    parser.add_argument('--images', type=int, default=500, help="Image references in total")
+    parser.add_argument('--distinct', type=int, default=None,
+                        help="Distinct image URLs (default: every reference distinct)")
+    parser.add_argument('--image-size', type=int, default=64 * 1024, help="Bytes per image")
+    parser.add_argument('--latency', type=float, default=0.02, help="Server latency per request (s)")
+    parser.add_argument('--bandwidth', type=int, default=None, help="Bytes/s per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 500/503 answers")
+    parser.add_argument('--redirect-rate', type=float, default=0.0, help="Fraction of 302 answers")
+    parser.add_argument('--workers', type=int, default=None, help="Markdown process pool size")
+    parser.add_argument('--download-workers', type=int, nargs='+', default=[4],
+                        help="One run per value, to compare concurrency settings")
+    parser.add_argument('--rate', type=float, default=0,
+                        help="Downloader's per-host requests/s (default 0: unlimited, "
+                             "so the server and the workers set the pace)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Measure the peak Python heap in an extra, untimed pass")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="Show the downloader's own output")
+    args = parser.parse_args()
+
+    print("⏱️  Markdown Image Downloader benchmark")
+    print("=" * 50)
+    print(f"{args.files} files, {args.images} references, {args.image_size:,} bytes/image, "
+          f"latency {args.latency}s, errors {args.error_rate:.0%}, redirects {args.redirect_rate:.0%}, "
+          f"rate limit {f'{args.rate:g}/s per host' if args.rate else 'off'}")
+
+    # A fresh process per run, so each max RSS is that run's own high-water mark
+    results = []
+    for n in args.download_workers:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results.append(pool.submit(run_benchmark, args, n).result())
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
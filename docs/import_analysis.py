@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Import-cycle, blast-radius and layering analysis of the Dart sources.
+
+Built on the import graph of lib/:
+
+- cycles: strongly connected components (iterative Tarjan), each with one
+  shortest concrete import cycle to start untangling from
+- blast radius: every file that transitively imports a file, i.e. what the
+  analyzer and hot reload have to revisit when it changes. Closures are
+  computed once per component of the condensation DAG with integer
+  bitsets, so thousands of files cost a few big-int ORs per edge.
+- layering violations: imports a layer is not allowed to make, such as
+  view/ reaching into core/services/ directly
+
+Example:
+    python import_analysis.py --top 15 --output tailoring_app_import_impact.csv
+"""
+
+import argparse
+import sys
+from collections import deque
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from dart_index import DEFAULT_CACHE, LIB_DIR, DartIndex
+from graph_util import strongly_connected
+from import_graph import ImportGraph, layer_of
+import report_util
+
+# Layer -> layers its files may import (None: unrestricted)
+ALLOWED_IMPORTS: Dict[str, Optional[FrozenSet[str]]] = {
+    'app': None,
+    'other': None,
+    'view': frozenset({'view', 'product', 'core', 'core/models'}),
+    'product': frozenset({'product', 'core', 'core/models'}),
+    'core': frozenset({'core', 'core/services', 'core/models'}),
+    'core/services': frozenset({'core/services', 'core/repositories', 'core/models', 'core'}),
+    'core/repositories': frozenset({'core/repositories', 'core/models', 'core'}),
+    'core/models': frozenset({'core/models', 'core'}),
+}
+
+
+class LayerViolation(NamedTuple):
+    source: str
+    target: str
+    source_layer: str
+    target_layer: str
+    line: int
+
+
+class ImportAnalysis:
+    """
+    Cycles, transitive closures and layering checks over an import graph
+
+    Attributes:
+        files: file paths; list positions are the node ids and bit numbers
+        scc_ids: component id of every file
+        sccs: components (file ids) in reverse topological order
+        dependents: bitset of the files that transitively import each file
+        dependencies: bitset of the files each file transitively imports
+    """
+
+    def __init__(self, graph: ImportGraph):
+        """
+        Args:
+            graph: Built import graph
+        """
+        self.graph = graph
+        self.files = list(graph.files)
+        ids = {path: i for i, path in enumerate(self.files)}
+        self.successors = [[ids[target] for target in graph.imports[path]] for path in self.files]
+        self.predecessors: List[List[int]] = [[] for _ in self.files]
+        for source, targets in enumerate(self.successors):
+            for target in targets:
+                self.predecessors[target].append(source)
+        self.scc_ids, self.sccs = strongly_connected(self.successors)
+        self.dependents = self._closure(self.predecessors, reversed(range(len(self.sccs))))
+        self.dependencies = self._closure(self.successors, range(len(self.sccs)))
+
+    def _closure(self, neighbours: List[List[int]], order) -> List[int]:
+        """
+        Transitive closure along neighbours, one bitset per file
+
+        Components are visited so that every neighbouring component is done
+        first; the members of a component reach each other.
+        """
+        members = [0] * len(self.sccs)
+        for component_id, component in enumerate(self.sccs):
+            for node in component:
+                members[component_id] |= 1 << node
+        reach = [0] * len(self.sccs)
+        for component_id in order:
+            bits = 0
+            for node in self.sccs[component_id]:
+                for neighbour in neighbours[node]:
+                    other = self.scc_ids[neighbour]
+                    if other != component_id:
+                        bits |= members[other] | reach[other]
+            reach[component_id] = bits
+        closure = []
+        for node in range(len(self.files)):
+            component_id = self.scc_ids[node]
+            bits = reach[component_id]
+            if len(self.sccs[component_id]) > 1:
+                bits |= members[component_id] & ~(1 << node)
+            closure.append(bits)
+        return closure
+
+    def _paths(self, bits: int) -> List[str]:
+        paths = []
+        while bits:
+            low = bits & -bits
+            paths.append(self.files[low.bit_length() - 1])
+            bits ^= low
+        return paths
+
+    def blast_radius(self, path: str) -> List[str]:
+        """Files that transitively import path"""
+        return self._paths(self.dependents[self.files.index(path)])
+
+    def cycles(self) -> List[List[str]]:
+        """Import cycles (components with more than one file), largest first"""
+        components = [component for component in self.sccs if len(component) > 1]
+        components.sort(key=lambda component: (-len(component), self.files[component[0]]))
+        return [[self.files[node] for node in component] for component in components]
+
+    def cycle_path(self, component: List[str]) -> List[str]:
+        """A shortest import cycle through the first file of a component"""
+        ids = {path: i for i, path in enumerate(self.files)}
+        start = ids[component[0]]
+        scc = self.scc_ids[start]
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for target in self.successors[node]:
+                if target == start:
+                    path = [node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    return [self.files[i] for i in reversed(path)] + [self.files[start]]
+                if self.scc_ids[target] == scc and target not in parent:
+                    parent[target] = node
+                    queue.append(target)
+        return []
+
+    def violations(self) -> List[LayerViolation]:
+        """Imports crossing layers against ALLOWED_IMPORTS, in file order"""
+        found = []
+        for source, target in self.graph.edges:
+            source_layer, target_layer = layer_of(source), layer_of(target)
+            allowed = ALLOWED_IMPORTS.get(source_layer)
+            if allowed is not None and target_layer not in allowed:
+                found.append(LayerViolation(source, target, source_layer, target_layer,
+                                            self.graph.lines.get((source, target), 0)))
+        return found
+
+    def rows(self) -> List[dict]:
+        """One record per file, largest blast radius first"""
+        rows = [{
+            'path': path,
+            'layer': layer_of(path),
+            'blast_radius': self.dependents[i].bit_count(),
+            'direct_dependents': len(self.predecessors[i]),
+            'transitive_dependencies': self.dependencies[i].bit_count(),
+            'direct_dependencies': len(self.successors[i]),
+            'cycle': self.scc_ids[i] if len(self.sccs[self.scc_ids[i]]) > 1 else '',
+        } for i, path in enumerate(self.files)]
+        rows.sort(key=lambda row: (-row['blast_radius'], -row['direct_dependents'], row['path']))
+        return rows
+
+    def write_report(self, path: str):
+        """Write the per-file ranking as CSV, or everything as JSON"""
+        rows = self.rows()
+        document = None
+        if path.endswith('.json'):
+            document = {
+                'files': rows,
+                'cycles': [{'files': component, 'example': self.cycle_path(component)}
+                           for component in self.cycles()],
+                'violations': [violation._asdict() for violation in self.violations()],
+            }
+        report_util.write_report(path, rows, document)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find import cycles, blast radius and layering violations")
+    parser.add_argument('--lib', default=str(LIB_DIR), help="Flutter lib/ directory")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help="Dart index cache (JSON)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse every file")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--top', type=int, default=10, help="Files to list by blast radius (default: 10)")
+    parser.add_argument('--output', help="Write the ranking as .csv (or everything as .json)")
+    parser.add_argument('--strict', action='store_true', help="Exit with 1 on cycles or layering violations")
+    args = parser.parse_args()
+
+    index = DartIndex(args.lib, None if args.no_cache else args.cache, args.workers).build()
+    analysis = ImportAnalysis(ImportGraph(index).build())
+    print(f"🔍 {len(analysis.files)} Dart files, {len(analysis.graph.edges)} internal imports")
+
+    rows = analysis.rows()
+    print("\n📊 Largest blast radius (files re-analyzed when this one changes):")
+    for row in rows[:args.top]:
+        cycle = f"  [cycle {row['cycle']}]" if row['cycle'] != '' else ''
+        print(f"  {row['blast_radius']:>4}  {row['path']} ({row['direct_dependents']} direct){cycle}")
+
+    cycles = analysis.cycles()
+    if cycles:
+        print(f"\n⚠️  {len(cycles)} import cycles:")
+        for component in cycles:
+            print(f"  {len(component)} files: {' -> '.join(analysis.cycle_path(component))}")
+    else:
+        print("\n✓ No import cycles")
+
+    violations = analysis.violations()
+    if violations:
+        by_pair: Dict[Tuple[str, str], List[LayerViolation]] = {}
+        for violation in violations:
+            by_pair.setdefault((violation.source_layer, violation.target_layer), []).append(violation)
+        print(f"\n⚠️  {len(violations)} layering violations:")
+        for (source_layer, target_layer), items in sorted(by_pair.items(), key=lambda item: -len(item[1])):
+            print(f"  {source_layer} -> {target_layer}: {len(items)}")
+            for item in items:
+                print(f"    lib/{item.source}:{item.line} imports {item.target}")
+    else:
+        print("\n✓ No layering violations")
+
+    if args.output:
+        analysis.write_report(args.output)
+        print(f"\n✓ Report written to {args.output}")
+
+    if args.strict and (cycles or violations):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+File-level import graph of the Dart sources under lib/.
+
+Every import, export and part directive is resolved to a file under lib/
+(package:tailorapp/... and relative URIs) or to an external package
+(package:flutter/..., dart:async). Files are classified into architecture
+layers by directory, and edges are aggregated layer to layer for the
+architecture diagrams.
+
+Directives come from the DartIndex cache, so an incremental run only
+re-reads the files that changed.
+
+Example:
+    python import_graph.py --output tailoring_app_imports.csv
+"""
+
+import argparse
+import posixpath
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from asset_manifest import load_pubspec
+from dart_index import DEFAULT_CACHE, GENERATED_SUFFIXES, LIB_DIR, DartIndex
+import report_util
+
+# Directory prefix (relative to lib/) -> layer, most specific first
+LAYERS = (
+    ('view/', 'view'),
+    ('core/services/', 'core/services'),
+    ('core/repositories/', 'core/repositories'),
+    ('core/models/', 'core/models'),
+    ('core/', 'core'),
+    ('product/', 'product'),
+)
+APP_LAYER = 'app'  # main.dart, app.dart and other files directly in lib/
+OTHER_LAYER = 'other'
+
+
+def layer_of(path: str) -> str:
+    """Architecture layer of a file, from its path relative to lib/"""
+    for prefix, layer in LAYERS:
+        if path.startswith(prefix):
+            return layer
+    return APP_LAYER if '/' not in path else OTHER_LAYER
+
+
+def package_name(project_dir: Path) -> str:
+    """The `name` of the Flutter project from pubspec.yaml"""
+    return str(load_pubspec(project_dir / 'pubspec.yaml').get('name', ''))
+
+
+class UnresolvedImport(NamedTuple):
+    path: str  # importing file, relative to lib/
+    uri: str
+    line: int
+
+
+class ImportGraph:
+    """
+    Import edges between the files of a Dart package
+
+    Attributes:
+        files: every indexed file, relative to lib/
+        imports: file -> files it imports, exports or includes as a part
+        external: file -> external packages it imports ("flutter", "dart:async")
+        lines: (file, imported file) -> line of the first directive
+        unresolved: package-local directives pointing at missing files
+    """
+
+    def __init__(self, index: DartIndex, package: Optional[str] = None):
+        """
+        Args:
+            index: Built index of the lib/ sources
+            package: Package name for package: URIs (default: read from
+                the pubspec.yaml next to lib/)
+        """
+        self.index = index
+        self.package = package if package is not None else package_name(index.root.parent)
+        self.files: List[str] = []
+        self.imports: Dict[str, List[str]] = {}
+        self.external: Dict[str, List[str]] = {}
+        self.lines: Dict[Tuple[str, str], int] = {}
+        self.unresolved: List[UnresolvedImport] = []
+
+    def resolve(self, uri: str, path: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolve a directive URI written in path
+
+        Returns:
+            (file relative to lib/, None) for package-local URIs, or
+            (None, external package) for everything else
+        """
+        if uri.startswith('dart:'):
+            return None, uri.split('/', 1)[0]
+        if uri.startswith('package:'):
+            package, _, rest = uri[len('package:'):].partition('/')
+            if package != self.package:
+                return None, package
+            return posixpath.normpath(rest), None
+        if uri.startswith('/'):
+            return posixpath.normpath(uri.lstrip('/')), None
+        return posixpath.normpath(posixpath.join(posixpath.dirname(path), uri)), None
+
+    def build(self) -> "ImportGraph":
+        """Resolve the directives of every indexed file"""
+        self.files = list(self.index.files)
+        known = set(self.files)
+        self.imports, self.external, self.lines, self.unresolved = {}, {}, {}, []
+        for path in self.files:
+            internal, external = [], []
+            for directive in self.index.directives.get(path, ()):
+                target, package = self.resolve(directive.uri, path)
+                if package is not None:
+                    external.append(package)
+                elif target in known:
+                    internal.append(target)
+                    self.lines.setdefault((path, target), directive.line)
+                elif not target.endswith(GENERATED_SUFFIXES):
+                    # Generated files are skipped by the index, not missing
+                    self.unresolved.append(UnresolvedImport(path, directive.uri, directive.line))
+            self.imports[path] = list(dict.fromkeys(target for target in internal if target != path))
+            self.external[path] = list(dict.fromkeys(external))
+        return self
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        return [(source, target) for source, targets in self.imports.items() for target in targets]
+
+    def layer_counts(self, include_external: bool = False) -> Counter:
+        """
+        Import edges aggregated per (importing layer, imported layer)
+
+        Args:
+            include_external: Also count edges to external packages, keyed
+                by package name (Dart SDK libraries are left out)
+        """
+        counts = Counter((layer_of(source), layer_of(target)) for source, target in self.edges)
+        if include_external:
+            for source, packages in self.external.items():
+                counts.update((layer_of(source), package) for package in packages
+                              if not package.startswith('dart:'))
+        return counts
+
+    def write_report(self, path: str):
+        """Write one row per internal import edge (.csv or .json)"""
+        rows = [{
+            'source': source,
+            'target': target,
+            'source_layer': layer_of(source),
+            'target_layer': layer_of(target),
+        } for source, target in self.edges]
+        report_util.write_report(path, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the import graph of the Dart sources")
+    parser.add_argument('--lib', default=str(LIB_DIR), help="Flutter lib/ directory")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help="Dart index cache (JSON)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse every file")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--output', help="Write the file-level edges as .csv or .json")
+    args = parser.parse_args()
+
+    index = DartIndex(args.lib, None if args.no_cache else args.cache, args.workers).build()
+    graph = ImportGraph(index).build()
+    print(f"🔍 {len(graph.files)} Dart files ({index.parsed} parsed, {index.cached} cached), "
+          f"{len(graph.edges)} internal imports")
+
+    print("\n📊 Layer -> layer imports:")
+    for (source, target), count in sorted(graph.layer_counts().items(), key=lambda item: -item[1]):
+        print(f"  {source:>18} -> {target:<18} {count}")
+
+    if graph.unresolved:
+        print(f"\n⚠️  {len(graph.unresolved)} imports of missing files:")
+        for item in graph.unresolved:
+            print(f"  lib/{item.path}:{item.line} {item.uri}")
+
+    if args.output:
+        graph.write_report(args.output)
+        print(f"\n✓ Edges written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
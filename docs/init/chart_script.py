@@ -1,5 +1,12 @@
+import sys
+from pathlib import Path
+
 import plotly.graph_objects as go
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dart_index import DartIndex
+from import_graph import ImportGraph
+
 # Brand colors by layer
 layer_colors = {
     'Presentation': '#1FB8CD',  # Strong cyan
@@ -8,96 +15,57 @@ layer_colors = {
     'External': '#5D878F'       # Cyan
 }
 
-# Node labels (<=15 chars each)
-nodes = [
-    # External (6)
-    'OpenAIGemini', 'Firebase', 'CameraAPI', 'CanvasAPI', 'PaySys', 'CloudStore',
-    # Data Src (3)
-    'AIDataSrc', 'LocalDataSrc', 'APIDataSrc',
-    # Repo Impl (3)
-    'GarmentImpl', 'CustomerImpl', 'OrderImpl',
-    # Domain Repo (3)
-    'GarmentRepo', 'CustomerRepo', 'OrderRepo',
-    # UseCase (3)
-    'GenDesignUC', 'ProcessFitUC', 'CreateOrderUC',
-    # Entities (1)
-    'Entities',
-    # ViewModel (4)
-    'HomeVM', 'DesignVM', 'FittingVM', 'OrderVM',
-    # View (4)
-    'HomeView', 'DesignCanvas', 'VirtualFit', 'OrdersView',
-    # Widgets (1)
-    'Widgets'
-]
-
-# Layer assignment for colors
-node_layers = [
-    'External']*6 + ['Data']*3 + ['Data']*3 + ['Domain']*3 + ['Domain']*3 + ['Domain']*1 + ['Presentation']*4 + ['Presentation']*4 + ['Presentation']*1
+# Code layer (directory under lib/) -> architecture tier for colors
+tiers = {
+    'app': 'Presentation',
+    'view': 'Presentation',
+    'product': 'Presentation',
+    'core': 'Domain',
+    'core/services': 'Domain',
+    'core/repositories': 'Data',
+    'core/models': 'Data',
+    'other': 'Domain',
+}
+
+# Most imported external packages get their own node, the rest are pooled
+TOP_PACKAGES = 6
+
+# Real import edges from lib/, aggregated layer to layer
+graph = ImportGraph(DartIndex().build()).build()
+counts = graph.layer_counts(include_external=True)
+
+package_totals = {}
+for (_, target), count in counts.items():
+    if target not in tiers:
+        package_totals[target] = package_totals.get(target, 0) + count
+top_packages = sorted(package_totals, key=lambda package: (-package_totals[package], package))[:TOP_PACKAGES]
+
+flows = {}
+for (source, target), count in counts.items():
+    if target not in tiers:
+        target = target if target in top_packages else 'other packages'
+    elif source == target:
+        # A layer importing itself has no place in a Sankey
+        continue
+    flows[(source, target)] = flows.get((source, target), 0) + count
+
+# Node labels: code layers in tier order, then external packages
+layer_order = ['app', 'view', 'product', 'core', 'core/services', 'core/repositories', 'core/models', 'other']
+nodes = [layer for layer in layer_order if any(layer in flow for flow in flows)]
+nodes += [package for package in top_packages + ['other packages'] if any(package in flow for flow in flows)]
+node_layers = [tiers.get(node, 'External') for node in nodes]
 
 node_colors = [layer_colors[layer] for layer in node_layers]
 
 # Helper to get index
 idx = {name: i for i, name in enumerate(nodes)}
 
-links = []
-vals = []
-
-# External -> Data Src
-for src in ['OpenAIGemini']:
-    links.append((src, 'AIDataSrc'))
-for src in ['Firebase', 'CloudStore']:
-    links.append((src, 'LocalDataSrc'))
-for src in ['CameraAPI', 'CanvasAPI', 'PaySys']:
-    links.append((src, 'APIDataSrc'))
-
-# Data Src -> Repo Impl
-for ds in ['AIDataSrc', 'LocalDataSrc', 'APIDataSrc']:
-    for impl in ['GarmentImpl', 'CustomerImpl', 'OrderImpl']:
-        links.append((ds, impl))
-
-# Repo Impl -> Domain Repo
-repo_pairs = [
-    ('GarmentImpl', 'GarmentRepo'),
-    ('CustomerImpl', 'CustomerRepo'),
-    ('OrderImpl', 'OrderRepo')
-]
-links.extend(repo_pairs)
-
-# Domain Repo -> UseCases
-for repo in ['GarmentRepo', 'CustomerRepo', 'OrderRepo']:
-    for uc in ['GenDesignUC', 'ProcessFitUC', 'CreateOrderUC']:
-        links.append((repo, uc))
-
-# UseCases -> Entities
-for uc in ['GenDesignUC', 'ProcessFitUC', 'CreateOrderUC']:
-    links.append((uc, 'Entities'))
-
-# UseCases -> ViewModels
-vm_map = {
-    'GenDesignUC': 'DesignVM',
-    'ProcessFitUC': 'FittingVM',
-    'CreateOrderUC': 'OrderVM'
-}
-for uc, vm in vm_map.items():
-    links.append((uc, vm))
-
-# ViewModel -> View
-view_pairs = [
-    ('HomeVM', 'HomeView'),
-    ('DesignVM', 'DesignCanvas'),
-    ('FittingVM', 'VirtualFit'),
-    ('OrderVM', 'OrdersView')
-]
-links.extend(view_pairs)
-
-# View -> Widgets
-for view in ['HomeView', 'DesignCanvas', 'VirtualFit', 'OrdersView']:
-    links.append((view, 'Widgets'))
+links = list(flows)
 
 # Build link dicts
 source_indices = [idx[s] for s, t in links]
 target_indices = [idx[t] for s, t in links]
-values = [1]*len(links)
+values = [flows[link] for link in links]
 
 fig = go.Figure(data=go.Sankey(
     valueformat="d",
@@ -117,7 +85,7 @@ fig = go.Figure(data=go.Sankey(
     )
 ))
 
-# Title and legend (legend via dummy scatter)  
+# Title and legend (legend via dummy scatter)
 fig.update_layout(title_text='Flutter AI Tailor Arch',
                   legend=dict(orientation='h', yanchor='bottom', y=1.05, xanchor='center', x=0.5))
 
@@ -133,4 +101,4 @@ fig.add_trace(go.Scatter(x=legend_x, y=legend_y,
                          showlegend=False,
                          hoverinfo='text'))
 
-fig.write_image('flutter_architecture.png')
\ No newline at end of file
+fig.write_image('flutter_architecture.png')
@@ -0,0 +1,273 @@
+"""
+Label placement without overlaps for the docs diagrams.
+
+Labels placed at fixed offsets collide as soon as the generated data
+changes. Here every label gets a few candidate positions (around its node,
+or along and beside its edge) and is placed against a uniform grid index
+of everything already on the canvas:
+
+- greedy: labels in order of priority take their first candidate that
+  overlaps nothing, else the one with the least overlap. With labels of
+  similar size each grid query only touches neighbouring cells, so n labels
+  cost O(n log n) for the ordering plus O(n * candidates) placement.
+- annealing (optional): random single-label moves accepted by the
+  Metropolis rule on a cooling schedule, which untangles clusters the
+  greedy pass locked in, then one descent step per label. The random
+  generator is seeded, so the same input always gives the same picture
+  (and the same render cache key).
+
+The code has no y direction: names like "N" only mean "towards larger y"
+unless y_down is passed to the candidate generators.
+"""
+
+import math
+import random
+import statistics
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+Point = Tuple[float, float]
+
+# Unit offsets of the positions around a point, y up
+POSITIONS = {
+    'C': (0, 0),
+    'N': (0, 1), 'S': (0, -1), 'E': (1, 0), 'W': (-1, 0),
+    'NE': (1, 1), 'SE': (1, -1), 'NW': (-1, 1), 'SW': (-1, -1),
+}
+# Preferred order around a node: beside, then above/below, then diagonal
+DEFAULT_POSITIONS = ('E', 'S', 'N', 'W', 'SE', 'NE', 'SW', 'NW')
+# Fractions along an edge, the middle first
+DEFAULT_STEPS = (0.5, 0.4, 0.6, 0.3, 0.7)
+
+
+class Box(NamedTuple):
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+    @classmethod
+    def around(cls, x: float, y: float, width: float, height: float) -> "Box":
+        """Box of the given size centered on (x, y)"""
+        return cls(x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+
+    def overlap(self, other: "Box") -> float:
+        """Area shared with another box"""
+        width = min(self.x1, other.x1) - max(self.x0, other.x0)
+        height = min(self.y1, other.y1) - max(self.y0, other.y0)
+        return width * height if width > 0 and height > 0 else 0.0
+
+    @property
+    def area(self) -> float:
+        return (self.x1 - self.x0) * (self.y1 - self.y0)
+
+
+class Label(NamedTuple):
+    candidates: List[Point]  # label centers, most preferred first
+    width: float
+    height: float
+    priority: float = 0.0  # higher is placed first
+
+
+class Placement(NamedTuple):
+    x: float  # label center
+    y: float
+    box: Box
+    candidate: int  # index into Label.candidates
+    overlap: float  # area shared with obstacles and other labels
+
+
+class GridIndex:
+    """
+    Uniform grid over boxes (a spatial hash)
+
+    Each box is registered in every cell it touches, so a query visits the
+    cells of the query box and finds every box that could intersect it.
+    """
+
+    def __init__(self, cell: float):
+        self.cell = cell
+        self.boxes: Dict[int, Box] = {}
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+
+    def _cells(self, box: Box) -> Iterator[Tuple[int, int]]:
+        cell = self.cell
+        for i in range(math.floor(box.x0 / cell), math.floor(box.x1 / cell) + 1):
+            for j in range(math.floor(box.y0 / cell), math.floor(box.y1 / cell) + 1):
+                yield i, j
+
+    def insert(self, item: int, box: Box):
+        self.boxes[item] = box
+        for key in self._cells(box):
+            self.cells.setdefault(key, set()).add(item)
+
+    def remove(self, item: int):
+        box = self.boxes.pop(item)
+        for key in self._cells(box):
+            self.cells[key].discard(item)
+
+    def query(self, box: Box) -> Set[int]:
+        """Items whose boxes may intersect box"""
+        found: Set[int] = set()
+        for key in self._cells(box):
+            found.update(self.cells.get(key, ()))
+        return found
+
+    def overlap(self, box: Box, skip: Optional[int] = None) -> float:
+        """Total area box shares with the indexed boxes"""
+        return sum(box.overlap(self.boxes[item]) for item in self.query(box) if item != skip)
+
+
+def point_candidates(x: float, y: float, width: float, height: float, radius: float = 0.0,
+                     gap: float = 2.0, positions: Sequence[str] = DEFAULT_POSITIONS,
+                     y_down: bool = False) -> List[Point]:
+    """
+    Centers for a width x height label around a point marker
+
+    Args:
+        radius: Half size of the marker the label must clear
+        gap: Space between marker and label
+        positions: Names from POSITIONS, most preferred first
+        y_down: Coordinates grow downwards (pixels), so "N" is smaller y
+    """
+    centers = []
+    for name in positions:
+        dx, dy = POSITIONS[name]
+        if y_down:
+            dy = -dy
+        # Diagonal labels sit off the corner of the marker's bounding box
+        centers.append((x + dx * (radius + gap + width / 2),
+                        y + dy * (radius + gap + height / 2)))
+    return centers
+
+
+def segment_candidates(start: Point, end: Point, width: float, height: float, gap: float = 2.0,
+                       steps: Sequence[float] = DEFAULT_STEPS, on_line: bool = True) -> List[Point]:
+    """
+    Centers for a label beside a straight edge, on both sides, middle first
+
+    Each center is pushed off the line just far enough for the label box
+    to clear it; with on_line the centers on the line itself come last.
+    """
+    (x0, y0), (x1, y1) = start, end
+    length = math.hypot(x1 - x0, y1 - y0) or 1.0
+    nx, ny = -(y1 - y0) / length, (x1 - x0) / length
+    # Half extent of the box along the normal, plus the gap
+    push = abs(nx) * width / 2 + abs(ny) * height / 2 + gap
+    centers = []
+    for t in steps:
+        x, y = x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+        centers.append((x + nx * push, y + ny * push))
+        centers.append((x - nx * push, y - ny * push))
+    if on_line:
+        centers.extend((x0 + (x1 - x0) * t, y0 + (y1 - y0) * t) for t in steps)
+    return centers
+
+
+def polyline_boxes(points: Sequence[Point], thickness: float, step: Optional[float] = None) -> List[Box]:
+    """Small boxes covering a polyline, so lines can be label obstacles"""
+    step = step or max(thickness * 2, 1e-9)
+    boxes = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        count = max(1, math.ceil(math.hypot(x1 - x0, y1 - y0) / step))
+        for i in range(count + 1):
+            t = i / count
+            boxes.append(Box.around(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, thickness, thickness))
+    return boxes
+
+
+def place_labels(labels: Sequence[Label], obstacles: Iterable[Box] = (), bounds: Optional[Box] = None,
+                 anneal: int = 0, preference: float = 0.1, seed: int = 0,
+                 cell: Optional[float] = None) -> List[Placement]:
+    """
+    Choose a candidate position for every label
+
+    Args:
+        labels: Labels with their candidate centers
+        obstacles: Boxes labels should not cover (nodes, edges, fixed text)
+        bounds: Canvas; area outside it costs like an overlap
+        anneal: Simulated-annealing moves per label after the greedy pass
+            (0: greedy only)
+        preference: Cost of the least preferred candidate, as a fraction of
+            the label's area; earlier candidates cost proportionally less
+        seed: Random seed of the annealing
+        cell: Grid cell size (default: from the median label size)
+
+    Returns:
+        One Placement per label, in input order
+    """
+    if not labels:
+        return []
+    if cell is None:
+        cell = statistics.median(max(label.width, label.height) for label in labels) or 1.0
+    grid = GridIndex(cell)
+    # Obstacles and placed labels share the grid; labels use ids 0..n-1
+    offset = len(labels)
+    for i, box in enumerate(obstacles):
+        grid.insert(offset + i, box)
+
+    def cost(index: int, candidate: int) -> Tuple[float, float, Box]:
+        """(overlap with everything else, preference penalty, box) of one candidate"""
+        label = labels[index]
+        x, y = label.candidates[candidate]
+        box = Box.around(x, y, label.width, label.height)
+        overlap = grid.overlap(box, skip=index)
+        if bounds is not None:
+            outside = box.area - box.overlap(bounds)
+            overlap += outside if outside > 1e-9 else 0.0
+        penalty = preference * box.area * candidate / max(1, len(label.candidates) - 1)
+        return overlap, penalty, box
+
+    chosen = [0] * len(labels)
+    order = sorted(range(len(labels)), key=lambda i: -labels[i].priority)
+    for index in order:
+        best = None
+        for candidate in range(len(labels[index].candidates)):
+            overlap, penalty, box = cost(index, candidate)
+            if best is None or overlap + penalty < best[0]:
+                best = (overlap + penalty, candidate, box)
+            if overlap <= 1e-9:
+                break  # later candidates only cost more
+        chosen[index] = best[1]
+        grid.insert(index, best[2])
+
+    movable = [i for i in range(len(labels)) if len(labels[i].candidates) > 1]
+    if anneal and movable:
+        rng = random.Random(seed)
+        moves = anneal * len(movable)
+        # Start hot enough to accept a move costing a tenth of a typical label,
+        # end a thousand times cooler
+        temperature = 0.1 * statistics.median(label.width * label.height for label in labels) or 1.0
+        cooling = 0.001 ** (1.0 / moves)
+        for _ in range(moves):
+            index = rng.choice(movable)
+            candidate = rng.randrange(len(labels[index].candidates) - 1)
+            if candidate >= chosen[index]:
+                candidate += 1
+            # A label's overlaps are its share of the total energy, so
+            # comparing them for this label alone gives the exact change
+            current = sum(cost(index, chosen[index])[:2])
+            overlap, penalty, box = cost(index, candidate)
+            delta = overlap + penalty - current
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                grid.remove(index)
+                grid.insert(index, box)
+                chosen[index] = candidate
+            temperature *= cooling
+
+        # The random walk can end on a needlessly worse candidate: finish
+        # with one descent step per label
+        for index in movable:
+            current = sum(cost(index, chosen[index])[:2])
+            best = min(range(len(labels[index].candidates)), key=lambda c: sum(cost(index, c)[:2]))
+            overlap, penalty, box = cost(index, best)
+            if overlap + penalty < current:
+                grid.remove(index)
+                grid.insert(index, box)
+                chosen[index] = best
+
+    placements = []
+    for index, label in enumerate(labels):
+        x, y = label.candidates[chosen[index]]
+        box = grid.boxes[index]
+        placements.append(Placement(x, y, box, chosen[index], grid.overlap(box, skip=index)))
+    return placements
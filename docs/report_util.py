@@ -0,0 +1,34 @@
+"""
+Report output shared by the docs scripts.
+
+Every script with an --output/--report option writes a flat table as CSV,
+or a JSON document when the path ends in .json.
+"""
+
+import csv
+import json
+from typing import Any, List, Optional, Sequence
+
+
+def write_report(path: str, rows: List[dict], document: Any = None,
+                 fieldnames: Optional[Sequence[str]] = None):
+    """
+    Write rows as CSV, or as JSON when path ends in .json
+
+    Args:
+        path: Output file
+        rows: One dict per CSV row
+        document: What to write as JSON instead of the bare rows
+        fieldnames: CSV columns, in order (default: the keys of the first
+            row); keys of a row that are not columns are left out
+    """
+    if path.lower().endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows if document is None else document, f, indent=2)
+        return
+    if fieldnames is None:
+        fieldnames = list(rows[0]) if rows else []
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
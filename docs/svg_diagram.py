@@ -0,0 +1,636 @@
+"""
+Minimal diagram backend for box-and-arrow charts.
+
+The architecture diagrams only need boxes, circles, lines, arrows and text,
+yet drawing them with plotly means importing plotly (plus pandas and numpy
+in some scripts) and starting a headless browser for every export. A
+Diagram is laid out in data coordinates like a plotly figure and renders
+itself:
+
+- SVG directly, standard library only, so importing this module and
+  writing an SVG takes milliseconds
+- PNG, JPEG, WebP and PDF by rasterizing the same marks with Pillow, when
+  it is installed (PDF is a raster page)
+- HTML as the SVG in a bare page
+
+Both outputs are painted from one list of pixel-space marks, so the SVG
+and the PNG of a diagram agree. Edge labels and node labels with
+label_position='auto' are placed by label_layout against everything else
+drawn, so they stay clear of each other when the data changes.
+
+Diagram.write_image takes plotly's arguments, and to_dict()/from_dict()
+round-trip a diagram, so chart_build.py captures and caches diagrams
+exactly like figures.
+"""
+
+import html
+import math
+import re
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from label_layout import Box, Label, place_labels, point_candidates, polyline_boxes, segment_candidates
+
+# Pillow is imported by the first raster export, so SVG output never pays for it
+Image = ImageColor = ImageDraw = ImageFont = None
+
+Point = Tuple[float, float]
+
+# Brand palette shared with the plotly charts
+BRAND_COLORS = ('#1FB8CD', '#FFC185', '#ECEBD5', '#5D878F', '#D2BA4C',
+                '#B4413C', '#964325', '#944454', '#13343B', '#DB4545')
+TEXT_COLOR = '#13343B'
+FONT_FAMILY = 'Arial, Helvetica, sans-serif'
+
+# Tried in order for raster text; the first one Pillow can open wins
+FONT_FILES = {
+    False: ('DejaVuSans.ttf', 'LiberationSans-Regular.ttf', 'Arial.ttf', 'arial.ttf'),
+    True: ('DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf'),
+}
+
+SHAPES = ('square', 'rect', 'circle', 'diamond', 'hexagon')
+
+# Dash patterns in multiples of the line width
+DASHES = {'dot': (1.0, 2.0), 'dash': (4.0, 2.0), 'dashdot': (4.0, 2.0, 1.0, 2.0)}
+
+RASTER_FORMATS = {'png': 'PNG', 'jpeg': 'JPEG', 'webp': 'WEBP', 'pdf': 'PDF'}
+
+# Clearance around automatically placed labels, and around lines they should not cross
+LABEL_PADDING = 2.0
+LINE_HALO = 3.0
+
+# Raster marks are drawn up to this many times larger, then downsampled
+# (antialiasing); exports at scale 2 and up need less of it
+SUPERSAMPLE = 3
+
+_TEXT_ANCHORS = {'start': 'lm', 'middle': 'mm', 'end': 'rm'}
+
+
+def _load_pillow():
+    global Image, ImageColor, ImageDraw, ImageFont
+    if Image is None:
+        try:
+            from PIL import Image, ImageColor, ImageDraw, ImageFont
+        except ImportError:
+            raise RuntimeError("Pillow is required for raster export (pip install Pillow); "
+                               "SVG and HTML need nothing") from None
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """
+    Approximate width of one line of sans-serif text in pixels
+
+    Measured on DejaVu Sans, the raster font, which runs a little wider than
+    Arial in the SVG, so boxes from it cover the text in both outputs.
+    """
+    return len(text) * size * (0.66 if bold else 0.58)
+
+
+def text_lines(text: str) -> List[str]:
+    """Lines of a label; '<br>' breaks lines as in plotly"""
+    return re.split(r'<br\s*/?>|\n', str(text))
+
+
+class Mark(NamedTuple):
+    """One primitive in pixel coordinates, as painted by both backends"""
+    kind: str  # "rect", "circle", "polygon", "line" or "text"
+    points: Tuple[Point, ...]  # rect: two corners, circle and text: one anchor
+    fill: Optional[str] = None
+    stroke: Optional[str] = None
+    width: float = 0.0  # stroke width
+    dash: Optional[Tuple[float, ...]] = None  # pixels on, off, ...
+    radius: float = 0.0  # circle radius, rect corner radius
+    text: str = ''
+    size: float = 0.0  # font size
+    bold: bool = False
+    anchor: str = 'middle'  # start, middle or end
+    opacity: float = 1.0
+    hover: Optional[str] = None
+
+
+class Diagram:
+    """
+    Shapes, lines and text in data coordinates, rendered without plotly
+
+    Items are drawn in the order they are added, so add edges first to keep
+    them under the nodes. Edges find their nodes by key when drawn, so the
+    nodes may be added later.
+
+    Example:
+        diagram = Diagram('Flow', x_range=(0, 2), y_range=(0, 1))
+        diagram.node(0.5, 0.5, 'App', shape='rect', width=90, height=40, fill=BRAND_COLORS[0])
+        diagram.node(1.5, 0.5, 'API', shape='circle', size=50, fill=BRAND_COLORS[1])
+        diagram.edge('App', 'API', arrow=True)
+        diagram.write_image('flow.svg')
+    """
+
+    # Bump when the drawing of an unchanged spec changes (render cache key)
+    VERSION = 2
+
+    def __init__(self, title: str = '', width: int = 1000, height: int = 700,
+                 x_range: Sequence[float] = (0.0, 1.0), y_range: Sequence[float] = (0.0, 1.0),
+                 margin: Optional[Dict[str, float]] = None, font_size: float = 12,
+                 background: str = 'white', anneal: int = 0):
+        """
+        Args:
+            title: Title drawn top left
+            width: Image width in pixels (at scale 1)
+            height: Image height in pixels
+            x_range: Data x shown from the left to the right edge of the plot area
+            y_range: Data y shown from the bottom to the top of the plot area
+            margin: Plot area margins in pixels, any of l, r, t, b
+            font_size: Default size of labels, legend and tick text
+            background: Page color
+            anneal: Simulated-annealing moves per automatic label after the
+                greedy placement (0: greedy only); seeded, so deterministic
+        """
+        self.title = title
+        self.width = width
+        self.height = height
+        self.x_range = (float(x_range[0]), float(x_range[1]))
+        self.y_range = (float(y_range[0]), float(y_range[1]))
+        self.margin = dict(l=60, r=40, t=90, b=40)
+        self.margin.update(margin or {})
+        self.font_size = font_size
+        self.background = background
+        self.anneal = anneal
+        self.items: List[dict] = []
+        self.legend_items: List[dict] = []
+        self.ticks: Optional[dict] = None
+        self._nodes: Dict[str, dict] = {}
+
+    # Building
+
+    def node(self, x: float, y: float, label: str = '', shape: str = 'square', size: float = 40,
+             width: Optional[float] = None, height: Optional[float] = None,
+             fill: str = BRAND_COLORS[0], stroke: Optional[str] = 'white', stroke_width: float = 2,
+             radius: float = 0, font_size: Optional[float] = None, text_color: str = TEXT_COLOR,
+             bold: bool = False, label_position: str = 'center', hover: Optional[str] = None,
+             key: Optional[str] = None) -> str:
+        """
+        Add a node: a shape with its label on it or beside it
+
+        Args:
+            x, y: Center in data coordinates
+            label: Text on the node ('<br>' for line breaks)
+            shape: square, rect, circle, diamond or hexagon
+            size: Diameter in pixels, like a plotly marker size
+            width, height: Pixel size of a rect (default: size)
+            radius: Corner radius of a square or rect
+            label_position: 'center' on the shape, or 'auto' beside it where
+                it overlaps the least
+            hover: Tooltip (SVG <title>)
+            key: Name for edge() (default: the label)
+
+        Returns:
+            The node's key
+        """
+        if shape not in SHAPES:
+            raise ValueError(f"Unknown shape {shape!r}, expected one of {', '.join(SHAPES)}")
+        if label_position not in ('center', 'auto'):
+            raise ValueError(f"Unknown label position {label_position!r}")
+        key = key if key is not None else label
+        item = dict(kind='node', key=key, x=x, y=y, label=label, shape=shape,
+                    width=width or size, height=height or size, fill=fill, stroke=stroke,
+                    stroke_width=stroke_width if stroke else 0, radius=radius,
+                    font_size=font_size or self.font_size, text_color=text_color, bold=bold,
+                    label_position=label_position, hover=hover)
+        self.items.append(item)
+        self._nodes[key] = item
+        return key
+
+    def line(self, x0: float, y0: float, x1: float, y1: float, color: str = TEXT_COLOR, width: float = 2,
+             dash: Optional[str] = None, arrow: bool = False, arrow_size: Optional[float] = None,
+             opacity: float = 1.0, hover: Optional[str] = None):
+        """
+        Add a straight line between two data points
+
+        Args:
+            dash: None (solid), 'dot', 'dash' or 'dashdot'
+            arrow: Draw an arrowhead at (x1, y1)
+            arrow_size: Arrowhead length in pixels (default: from the line width)
+        """
+        self.items.append(dict(kind='line', x0=x0, y0=y0, x1=x1, y1=y1, color=color, width=width,
+                               dash=dash, arrow=arrow, arrow_size=arrow_size, opacity=opacity, hover=hover))
+
+    def edge(self, source: str, target: str, color: str = TEXT_COLOR, width: float = 2,
+             dash: Optional[str] = None, arrow: bool = True, arrow_size: Optional[float] = None,
+             opacity: float = 1.0, hover: Optional[str] = None, label: str = '',
+             label_size: Optional[float] = None, label_color: Optional[str] = None, label_bold: bool = False):
+        """
+        Add a line between two nodes (by key), clipped to their outlines
+
+        Takes the same styling arguments as line(); the arrowhead touches
+        the target's outline instead of hiding under it. A label is placed
+        beside the edge, near its middle, where it overlaps the least.
+        """
+        self.items.append(dict(kind='edge', source=source, target=target, color=color, width=width,
+                               dash=dash, arrow=arrow, arrow_size=arrow_size, opacity=opacity, hover=hover,
+                               label=label, label_size=label_size or self.font_size,
+                               label_color=label_color or color, label_bold=label_bold))
+
+    def text(self, x: float, y: float, text: str, size: Optional[float] = None, color: str = TEXT_COLOR,
+             bold: bool = False, anchor: str = 'middle', hover: Optional[str] = None):
+        """Add free text; anchor (start, middle, end) is where (x, y) sits on the line"""
+        if anchor not in _TEXT_ANCHORS:
+            raise ValueError(f"Unknown anchor {anchor!r}")
+        self.items.append(dict(kind='text', x=x, y=y, text=text, size=size or self.font_size,
+                               color=color, bold=bold, anchor=anchor, hover=hover))
+
+    def legend(self, label: str, color: str, shape: str = 'square'):
+        """Add a legend entry; entries are centered in one row above the plot area"""
+        self.legend_items.append(dict(label=label, color=color, shape=shape))
+
+    def y_ticks(self, values: Sequence[float], labels: Sequence[str], title: str = ''):
+        """Label data y values left of the plot area, like a categorical y axis"""
+        self.ticks = dict(values=list(values), labels=list(labels), title=title)
+
+    # Serialization
+
+    def to_dict(self) -> dict:
+        """Everything that determines the drawing, as JSON-ready data"""
+        return {
+            'diagram': self.VERSION,
+            'title': self.title,
+            'width': self.width,
+            'height': self.height,
+            'x_range': list(self.x_range),
+            'y_range': list(self.y_range),
+            'margin': dict(self.margin),
+            'font_size': self.font_size,
+            'background': self.background,
+            'anneal': self.anneal,
+            'items': [dict(item) for item in self.items],
+            'legend': [dict(item) for item in self.legend_items],
+            'ticks': dict(self.ticks) if self.ticks else None,
+        }
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "Diagram":
+        diagram = cls(spec['title'], spec['width'], spec['height'], spec['x_range'], spec['y_range'],
+                      spec['margin'], spec['font_size'], spec['background'], spec['anneal'])
+        diagram.items = [dict(item) for item in spec['items']]
+        diagram.legend_items = [dict(item) for item in spec['legend']]
+        diagram.ticks = dict(spec['ticks']) if spec['ticks'] else None
+        diagram._nodes = {item['key']: item for item in diagram.items if item['kind'] == 'node'}
+        return diagram
+
+    # Geometry
+
+    def to_pixels(self, x: float, y: float, width: Optional[int] = None, height: Optional[int] = None) -> Point:
+        """Pixel position of a data point (y grows downwards)"""
+        width, height = width or self.width, height or self.height
+        left, top = self.margin['l'], self.margin['t']
+        plot_width = width - left - self.margin['r']
+        plot_height = height - top - self.margin['b']
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        return (left + (x - x0) / ((x1 - x0) or 1.0) * plot_width,
+                top + (y1 - y) / ((y1 - y0) or 1.0) * plot_height)
+
+    @staticmethod
+    def _outline_distance(node: dict, dx: float, dy: float) -> float:
+        """Distance from a node's center to its outline along the unit vector (dx, dy)"""
+        half_w, half_h = node['width'] / 2, node['height'] / 2
+        shape = node['shape']
+        if shape in ('square', 'rect'):
+            distance = min(half_w / abs(dx) if dx else math.inf, half_h / abs(dy) if dy else math.inf)
+        elif shape == 'diamond':
+            distance = 1.0 / (abs(dx) / half_w + abs(dy) / half_h)
+        else:
+            distance = half_w
+        return distance + node['stroke_width'] / 2
+
+    def marks(self, width: Optional[int] = None, height: Optional[int] = None) -> List[Mark]:
+        """Everything to paint, in pixel coordinates, back to front"""
+        width, height = width or self.width, height or self.height
+
+        def px(x, y):
+            return self.to_pixels(x, y, width, height)
+
+        marks: List[Mark] = []
+        # Labels to place once everything else is drawn: (label, text mark arguments)
+        pending: List[Tuple[Label, tuple]] = []
+        for item in self.items:
+            kind = item['kind']
+            if kind == 'node':
+                center = px(item['x'], item['y'])
+                marks.extend(self._node_marks(item, center))
+                if item['label'] and item['label_position'] == 'auto':
+                    label_width, label_height = _text_size(item['label'], item['font_size'], item['bold'])
+                    radius = max(item['width'], item['height']) / 2 + item['stroke_width'] / 2
+                    candidates = point_candidates(*center, label_width, label_height, radius=radius,
+                                                  gap=1, y_down=True)
+                    pending.append((Label(candidates, label_width, label_height, priority=1),
+                                    (item['label'], item['font_size'], item['text_color'], item['bold'],
+                                     'middle', item['hover'])))
+            elif kind == 'line':
+                marks.extend(self._line_marks(item, px(item['x0'], item['y0']), px(item['x1'], item['y1'])))
+            elif kind == 'edge':
+                for key in (item['source'], item['target']):
+                    if key not in self._nodes:
+                        raise KeyError(f"Edge to unknown node {key!r}")
+                source, target = self._nodes[item['source']], self._nodes[item['target']]
+                (x0, y0), (x1, y1) = px(source['x'], source['y']), px(target['x'], target['y'])
+                length = math.hypot(x1 - x0, y1 - y0)
+                if length == 0:
+                    continue
+                dx, dy = (x1 - x0) / length, (y1 - y0) / length
+                start = self._outline_distance(source, dx, dy)
+                end = length - self._outline_distance(target, -dx, -dy)
+                if end > start:
+                    start_point, end_point = (x0 + dx * start, y0 + dy * start), (x0 + dx * end, y0 + dy * end)
+                    marks.extend(self._line_marks(item, start_point, end_point))
+                    if item['label']:
+                        label_width, label_height = _text_size(item['label'], item['label_size'],
+                                                               item['label_bold'])
+                        candidates = segment_candidates(start_point, end_point, label_width, label_height,
+                                                        gap=item['width'] / 2 + LINE_HALO)
+                        pending.append((Label(candidates, label_width, label_height),
+                                        (item['label'], item['label_size'], item['label_color'],
+                                         item['label_bold'], 'middle', item['hover'])))
+            else:
+                marks.extend(_text_marks(px(item['x'], item['y']), item['text'], item['size'],
+                                         item['color'], item['bold'], item['anchor'], item['hover']))
+
+        top, left = self.margin['t'], self.margin['l']
+        if self.ticks:
+            for value, label in zip(self.ticks['values'], self.ticks['labels']):
+                marks.extend(_text_marks((left - 10, px(0, value)[1]), label, self.font_size, TEXT_COLOR,
+                                         anchor='end'))
+            if self.ticks['title']:
+                marks.extend(_text_marks((left - 10, top - 16), self.ticks['title'], self.font_size,
+                                         TEXT_COLOR, bold=True, anchor='end'))
+        if self.legend_items:
+            marks.extend(self._legend_marks(width, top - 24))
+        if self.title:
+            marks.extend(_text_marks((left, 32), self.title, self.font_size * 1.5, TEXT_COLOR, anchor='start'))
+
+        if pending:
+            obstacles = [box for mark in marks for box in _mark_boxes(mark)]
+            placements = place_labels([label for label, _ in pending], obstacles,
+                                      bounds=Box(0, 0, width, height), anneal=self.anneal)
+            for placement, (_, arguments) in zip(placements, pending):
+                marks.extend(_text_marks((placement.x, placement.y), *arguments))
+        return marks
+
+    def _node_marks(self, node: dict, center: Point) -> List[Mark]:
+        cx, cy = center
+        half_w, half_h = node['width'] / 2, node['height'] / 2
+        style = dict(fill=node['fill'], stroke=node['stroke'], width=node['stroke_width'], hover=node['hover'])
+        shape = node['shape']
+        if shape in ('square', 'rect'):
+            marks = [Mark('rect', ((cx - half_w, cy - half_h), (cx + half_w, cy + half_h)),
+                          radius=node['radius'], **style)]
+        elif shape == 'circle':
+            marks = [Mark('circle', (center,), radius=half_w, **style)]
+        elif shape == 'diamond':
+            marks = [Mark('polygon', ((cx, cy - half_h), (cx + half_w, cy), (cx, cy + half_h), (cx - half_w, cy)),
+                          **style)]
+        else:
+            marks = [Mark('polygon', tuple((cx + half_w * math.cos(math.radians(angle)),
+                                            cy + half_h * math.sin(math.radians(angle)))
+                                           for angle in range(-90, 270, 60)), **style)]
+        if node['label'] and node['label_position'] == 'center':
+            marks.extend(_text_marks(center, node['label'], node['font_size'], node['text_color'],
+                                     node['bold'], hover=node['hover']))
+        return marks
+
+    @staticmethod
+    def _line_marks(item: dict, start: Point, end: Point) -> List[Mark]:
+        (x0, y0), (x1, y1) = start, end
+        width = item['width']
+        dash = tuple(step * width for step in DASHES[item['dash']]) if item['dash'] else None
+        style = dict(opacity=item['opacity'], hover=item['hover'])
+        length = math.hypot(x1 - x0, y1 - y0)
+        if not item['arrow'] or length == 0:
+            return [Mark('line', (start, end), stroke=item['color'], width=width, dash=dash, **style)]
+        # The shaft stops at the head's base so its butt end cannot poke through the tip
+        head = min(item['arrow_size'] or max(8.0, width * 3.5), length)
+        dx, dy = (x1 - x0) / length, (y1 - y0) / length
+        base = (x1 - dx * head, y1 - dy * head)
+        spread = head * 0.5
+        marks = []
+        if length > head:
+            marks.append(Mark('line', (start, base), stroke=item['color'], width=width, dash=dash, **style))
+        marks.append(Mark('polygon', ((x1, y1), (base[0] - dy * spread, base[1] + dx * spread),
+                                      (base[0] + dy * spread, base[1] - dx * spread)),
+                          fill=item['color'], **style))
+        return marks
+
+    def _legend_marks(self, width: float, y: float) -> List[Mark]:
+        size = self.font_size
+        swatch, gap, spacing = size, size * 0.5, size * 2
+        widths = [swatch + gap + text_width(entry['label'], size) for entry in self.legend_items]
+        x = (width - sum(widths) - spacing * (len(widths) - 1)) / 2
+        marks = []
+        for entry, entry_width in zip(self.legend_items, widths):
+            half = swatch / 2
+            if entry['shape'] == 'circle':
+                marks.append(Mark('circle', ((x + half, y),), fill=entry['color'], radius=half))
+            else:
+                marks.append(Mark('rect', ((x, y - half), (x + swatch, y + half)), fill=entry['color']))
+            marks.extend(_text_marks((x + swatch + gap, y), entry['label'], size, TEXT_COLOR, anchor='start'))
+            x += entry_width + spacing
+        return marks
+
+    # Output
+
+    def to_svg(self, width: Optional[int] = None, height: Optional[int] = None) -> str:
+        width, height = width or self.width, height or self.height
+        lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(width)}" height="{_num(height)}" '
+                 f'viewBox="0 0 {_num(width)} {_num(height)}" font-family="{FONT_FAMILY}">',
+                 f'<rect width="{_num(width)}" height="{_num(height)}" fill="{html.escape(self.background)}"/>']
+        lines.extend(_svg_element(mark) for mark in self.marks(width, height))
+        lines.append('</svg>')
+        return '\n'.join(lines) + '\n'
+
+    def to_html(self, width: Optional[int] = None, height: Optional[int] = None) -> str:
+        return (f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                f'<title>{html.escape(self.title)}</title>\n</head>\n<body style="margin:0">\n'
+                f'{self.to_svg(width, height)}</body>\n</html>\n')
+
+    def to_raster(self, scale: float = 1, width: Optional[int] = None, height: Optional[int] = None):
+        """The diagram as a Pillow RGB image, scale times the pixel size"""
+        _load_pillow()
+        width, height = width or self.width, height or self.height
+        size = (round(width * scale), round(height * scale))
+        oversample = max(1, math.ceil(SUPERSAMPLE / scale))
+        factor = scale * oversample
+        image = Image.new('RGB', (round(width * factor), round(height * factor)), self.background)
+        draw = ImageDraw.Draw(image, 'RGBA')
+        for mark in self.marks(width, height):
+            _paint(draw, mark, factor)
+        return image.resize(size, Image.LANCZOS) if oversample > 1 else image
+
+    def to_image(self, format: Optional[str] = None, width: Optional[int] = None,
+                 height: Optional[int] = None, scale: Optional[float] = None) -> bytes:
+        """Bytes of the diagram in svg, html, png, jpeg, webp or pdf (plotly's to_image arguments)"""
+        fmt = (format or 'png').lower()
+        fmt = 'jpeg' if fmt == 'jpg' else fmt
+        if fmt == 'svg':
+            return self.to_svg(width, height).encode('utf-8')
+        if fmt == 'html':
+            return self.to_html(width, height).encode('utf-8')
+        if fmt not in RASTER_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt!r}")
+        buffer = BytesIO()
+        self.to_raster(scale or 1, width, height).save(buffer, format=RASTER_FORMATS[fmt])
+        return buffer.getvalue()
+
+    def write_image(self, file, format: Optional[str] = None, scale: Optional[float] = None,
+                    width: Optional[int] = None, height: Optional[int] = None, validate: bool = True,
+                    engine: Optional[str] = None):
+        """
+        Write the diagram to a file, with plotly's write_image arguments
+
+        The format defaults to the file extension; validate and engine are
+        accepted for compatibility and ignored.
+        """
+        path = str(file)
+        fmt = format or (path.rsplit('.', 1)[-1] if '.' in path else 'png')
+        data = self.to_image(fmt, width, height, scale)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def _text_marks(anchor_point: Point, text: str, size: float, color: str, bold: bool = False,
+                anchor: str = 'middle', hover: Optional[str] = None) -> List[Mark]:
+    """One text mark per line, the block vertically centered on the anchor point"""
+    lines = text_lines(text)
+    line_height = size * 1.2
+    x, y = anchor_point
+    y -= line_height * (len(lines) - 1) / 2
+    return [Mark('text', ((x, y + i * line_height),), fill=color, text=line, size=size, bold=bold,
+                 anchor=anchor, hover=hover) for i, line in enumerate(lines)]
+
+
+def _text_size(text: str, size: float, bold: bool = False) -> Tuple[float, float]:
+    """Approximate (width, height) of a multi-line label, plus LABEL_PADDING all round"""
+    lines = text_lines(text)
+    return (max(text_width(line, size, bold) for line in lines) + 2 * LABEL_PADDING,
+            len(lines) * size * 1.2 + 2 * LABEL_PADDING)
+
+
+def _mark_boxes(mark: Mark) -> List[Box]:
+    """Boxes covering a mark, as obstacles for label placement"""
+    if mark.kind == 'line':
+        return polyline_boxes(mark.points, mark.width + 2 * LINE_HALO, step=mark.width + LINE_HALO)
+    if mark.kind == 'circle':
+        (x, y), radius = mark.points[0], mark.radius + mark.width / 2
+        return [Box(x - radius, y - radius, x + radius, y + radius)]
+    if mark.kind == 'text':
+        x, y = mark.points[0]
+        width, height = text_width(mark.text, mark.size, mark.bold), mark.size * 1.2
+        left = {'start': x, 'middle': x - width / 2, 'end': x - width}[mark.anchor]
+        return [Box(left, y - height / 2, left + width, y + height / 2)]
+    xs = [x for x, _ in mark.points]
+    ys = [y for _, y in mark.points]
+    half = mark.width / 2
+    return [Box(min(xs) - half, min(ys) - half, max(xs) + half, max(ys) + half)]
+
+
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def _svg_element(mark: Mark) -> str:
+    attrs = []
+    if mark.kind == 'rect':
+        (x0, y0), (x1, y1) = mark.points
+        tag = 'rect'
+        attrs += [('x', _num(x0)), ('y', _num(y0)), ('width', _num(x1 - x0)), ('height', _num(y1 - y0))]
+        if mark.radius:
+            attrs.append(('rx', _num(mark.radius)))
+    elif mark.kind == 'circle':
+        tag = 'circle'
+        attrs += [('cx', _num(mark.points[0][0])), ('cy', _num(mark.points[0][1])), ('r', _num(mark.radius))]
+    elif mark.kind in ('polygon', 'line'):
+        tag = 'polygon' if mark.kind == 'polygon' else 'polyline'
+        attrs.append(('points', ' '.join(f"{_num(x)},{_num(y)}" for x, y in mark.points)))
+    else:
+        tag = 'text'
+        attrs += [('x', _num(mark.points[0][0])), ('y', _num(mark.points[0][1])),
+                  ('font-size', _num(mark.size)), ('text-anchor', mark.anchor),
+                  ('dominant-baseline', 'central')]
+        if mark.bold:
+            attrs.append(('font-weight', 'bold'))
+    attrs.append(('fill', mark.fill or 'none'))
+    if mark.stroke and mark.width:
+        attrs += [('stroke', mark.stroke), ('stroke-width', _num(mark.width))]
+        if mark.dash:
+            attrs.append(('stroke-dasharray', ' '.join(_num(step) for step in mark.dash)))
+    if mark.opacity < 1:
+        attrs.append(('opacity', _num(mark.opacity)))
+    element = f"<{tag} " + ' '.join(f'{name}="{html.escape(str(value))}"' for name, value in attrs)
+    content = html.escape(mark.text, quote=False) if tag == 'text' else ''
+    if mark.hover:
+        content += f"<title>{html.escape(' '.join(text_lines(mark.hover)), quote=False)}</title>"
+    return f"{element}>{content}</{tag}>" if content else f"{element}/>"
+
+
+@lru_cache(maxsize=None)
+def _font(size: int, bold: bool):
+    for name in FONT_FILES[bold]:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 has a single bitmap size
+        return ImageFont.load_default()
+
+
+def _rgba(color: Optional[str], opacity: float = 1.0):
+    if not color or color == 'none':
+        return None
+    rgba = ImageColor.getrgb(color)
+    alpha = rgba[3] if len(rgba) == 4 else 255
+    return rgba[:3] + (round(alpha * opacity),)
+
+
+def _dashes(points: Sequence[Point], pattern: Tuple[float, ...]) -> List[Tuple[Point, Point]]:
+    """Split a polyline into the 'on' segments of a dash pattern"""
+    segments = []
+    index, remaining, on = 0, pattern[0], True
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        position = 0.0
+        while position < length:
+            step = min(remaining, length - position)
+            if on:
+                t0, t1 = position / length, (position + step) / length
+                segments.append(((x0 + (x1 - x0) * t0, y0 + (y1 - y0) * t0),
+                                 (x0 + (x1 - x0) * t1, y0 + (y1 - y0) * t1)))
+            position += step
+            remaining -= step
+            if remaining <= 1e-9:
+                index = (index + 1) % len(pattern)
+                remaining, on = pattern[index], not on
+    return segments
+
+
+def _paint(draw, mark: Mark, factor: float):
+    """Draw one mark with Pillow, all lengths multiplied by factor"""
+    points = [(x * factor, y * factor) for x, y in mark.points]
+    fill = _rgba(mark.fill, mark.opacity)
+    outline = _rgba(mark.stroke, mark.opacity) if mark.width else None
+    stroke_width = max(1, round(mark.width * factor)) if outline else 0
+    if mark.kind == 'rect':
+        draw.rounded_rectangle(points, radius=mark.radius * factor, fill=fill, outline=outline, width=stroke_width)
+    elif mark.kind == 'circle':
+        (cx, cy), radius = points[0], mark.radius * factor
+        draw.ellipse((cx - radius, cy - radius, cx + radius, cy + radius), fill=fill,
+                     outline=outline, width=stroke_width)
+    elif mark.kind == 'polygon':
+        draw.polygon(points, fill=fill, outline=outline, width=stroke_width)
+    elif mark.kind == 'line':
+        if mark.dash:
+            for segment in _dashes(points, tuple(step * factor for step in mark.dash)):
+                draw.line(segment, fill=outline, width=stroke_width)
+        else:
+            draw.line(points, fill=outline, width=stroke_width, joint='curve')
+    else:
+        draw.text(points[0], mark.text, fill=fill, font=_font(max(1, round(mark.size * factor)), mark.bold),
+                  anchor=_TEXT_ANCHORS[mark.anchor])
@@ -0,0 +1,105 @@
+import pytest
+
+from asset_manifest import AssetManifest, format_size, load_yaml_subset, parse_size
+
+PUBSPEC = """\
+name: tailorapp  # the package
+flutter:
+  uses-material-design: true
+  assets:
+    - assets/logo/
+    - assets/intro.json
+    - path: assets/audio/
+      flavors: [prod]
+  fonts:
+    - family: Poppins
+      fonts:
+        - asset: assets/fonts/Poppins-Regular.ttf
+        - asset: "assets/fonts/Poppins-Bold.ttf"
+          weight: 700
+flutter_native_splash:
+  image: assets/logo/splash.png
+"""
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2048', 2048), ('512KB', 512 * 1024), ('1.5M', 1536 * 1024), ('1 MiB', 1024 ** 2), ('2g', 2 * 1024 ** 3),
+])
+def test_parse_size(text, expected):
+    assert parse_size(text) == expected
+
+
+def test_parse_size_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_size('lots')
+
+
+def test_format_size():
+    assert format_size(100) == '100 B'
+    assert format_size(1536) == '1.5 KB'
+    assert format_size(5 * 1024 ** 3) == '5,120.0 MB'
+
+
+def test_yaml_subset_parses_pubspec():
+    pubspec = load_yaml_subset(PUBSPEC)
+    assert pubspec['name'] == 'tailorapp'
+    assert pubspec['flutter']['assets'] == [
+        'assets/logo/', 'assets/intro.json', {'path': 'assets/audio/', 'flavors': ['prod']}]
+    assert pubspec['flutter']['fonts'] == [{'family': 'Poppins', 'fonts': [
+        {'asset': 'assets/fonts/Poppins-Regular.ttf'},
+        {'asset': 'assets/fonts/Poppins-Bold.ttf', 'weight': '700'},
+    ]}]
+    assert pubspec['flutter_native_splash'] == {'image': 'assets/logo/splash.png'}
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    files = {
+        'assets/logo/app_logo.png': 300,
+        'assets/logo/2.0x/app_logo.png': 600,
+        'assets/logo/splash.png': 100,
+        'assets/logo/old_logo.png': 50,
+        'assets/logo/nested/deep.png': 10,
+        'assets/intro.json': 20,
+        'assets/audio/tap_1.mp3': 5,
+        'assets/audio/tap_2.mp3': 5,
+        'assets/fonts/Poppins-Regular.ttf': 1000,
+        'assets/stray.txt': 1,
+    }
+    for path, size in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_bytes(b'x' * size)
+    (tmp_path / 'pubspec.yaml').write_text(PUBSPEC)
+    (tmp_path / 'lib').mkdir()
+    (tmp_path / 'lib' / 'main.dart').write_text(
+        "// Image.asset('assets/logo/commented.png')\n"
+        "final logo = Image.asset('assets/logo/app_logo.png');\n"
+        "final tap = 'assets/audio/tap_$i.mp3';\n"
+        "final style = TextStyle(fontFamily: 'Poppins');\n"
+        "final gone = 'assets/logo/missing.png';\n")
+    return AssetManifest(tmp_path).load()
+
+
+def test_manifest_cross_check(manifest):
+    assert manifest.declared_dirs == ['assets/logo/', 'assets/audio/']
+    assert manifest.is_declared('assets/logo/2.0x/app_logo.png')
+    assert not manifest.is_declared('assets/logo/nested/deep.png')
+    assert manifest.missing() == [
+        ('assets/fonts/Poppins-Bold.ttf', 'font Poppins in pubspec.yaml'),
+        ('assets/logo/missing.png', 'referenced at lib/main.dart:5'),
+    ]
+    assert sorted(path for path, _ in manifest.undeclared()) == [
+        'assets/logo/nested/deep.png', 'assets/stray.txt']
+    assert manifest.unreferenced() == ['assets/intro.json', 'assets/logo/old_logo.png']
+    used = manifest.referenced_files()
+    assert used['assets/audio/tap_2.mp3'] == 'lib/main.dart:3'
+    assert used['assets/logo/splash.png'] == 'pubspec.yaml:flutter_native_splash:image'
+    assert used['assets/fonts/Poppins-Regular.ttf'] == 'lib/main.dart:4'
+
+
+def test_budgets(manifest):
+    assert manifest.totals(manifest.category)['logo'] == (5, 1060)
+    assert manifest.check_budgets({'logo': 1024, 'audio': 1024, 'total': 4096}, max_file_size=800) == [
+        'logo: 1.0 KB exceeds budget 1.0 KB',
+        'assets/fonts/Poppins-Regular.ttf: 1,000 B exceeds per-file limit 800 B',
+    ]
@@ -0,0 +1,127 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from chart_build import (CapturedFigure, ExportTarget, RenderCache, build_charts, build_figures,
+                         discover_chart_scripts, parse_targets, target_options, target_path)
+
+CHART = textwrap.dedent("""\
+    from svg_diagram import Diagram
+
+    print('drawing')
+    diagram = Diagram('Flow', width=200, height=100)
+    diagram.node(0.25, 0.5, 'App')
+    diagram.node(0.75, 0.5, 'API')
+    diagram.edge('App', 'API')
+    diagram.write_image('flow.svg')
+    diagram.write_image('flow.png', 'png', 2)
+""")
+
+
+@pytest.fixture
+def script(tmp_path):
+    (tmp_path / 'charts').mkdir()
+    path = tmp_path / 'charts' / 'chart_script.py'
+    path.write_text(CHART)
+    (tmp_path / 'charts' / 'helper.py').write_text('')
+    return path
+
+
+def test_discover_chart_scripts(script, tmp_path):
+    (tmp_path / 'chart_script_top.py').write_text('')
+    assert discover_chart_scripts(tmp_path) == [script]
+
+
+def test_build_figures_captures_instead_of_writing(script):
+    captured = build_figures(script)
+    assert [(item.path.name, item.options) for item in captured] == [
+        ('flow.svg', {}), ('flow.png', {'format': 'png', 'scale': 2})]
+    assert captured[0].path == script.parent / 'flow.svg'
+    assert not captured[0].path.exists()
+
+
+def test_build_charts_dry_run_and_export(script, capsys):
+    [result] = build_charts([script], dry_run=True, cache_dir=None)
+    assert result.error is None and result.log == 'drawing\n'
+    assert [output.status for output in result.outputs] == ['built', 'built']
+    assert not (script.parent / 'flow.svg').exists()
+
+    [result] = build_charts([script], cache_dir=None, targets=[ExportTarget('svg', None)])
+    assert result.error is None
+    assert [output.status for output in result.outputs] == ['rendered', 'rendered']
+    assert (script.parent / 'flow.svg').read_text().startswith('<svg')
+
+
+def test_build_charts_reports_script_errors(tmp_path):
+    path = tmp_path / 'chart_script_broken.py'
+    path.write_text("raise RuntimeError('no data')\n")
+    [result] = build_charts([path], dry_run=True, cache_dir=None)
+    assert 'RuntimeError: no data' in result.error
+    assert result.outputs == []
+
+
+def test_render_cache_keys():
+    cache = RenderCache()
+    assert RenderCache.figure_key({'a': 1, 'b': [1, 2]}) == RenderCache.figure_key({'b': [1, 2], 'a': 1})
+    figure_key = RenderCache.figure_key({'a': 1})
+    assert cache.key(figure_key, 'png', {'scale': 2}) == cache.key(figure_key, 'png', {'scale': 2})
+    assert cache.key(figure_key, 'png', {'scale': 2}) != cache.key(figure_key, 'png', {'scale': 3})
+    assert cache.key(figure_key, 'png', {}) != cache.key(figure_key, 'svg', {})
+    other = RenderCache()
+    other.renderer += ';plotly=0'
+    assert other.key(figure_key, 'png', {}) != cache.key(figure_key, 'png', {})
+
+
+def test_build_charts_through_the_cache(script, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    svg = script.parent / 'flow.svg'
+
+    def statuses(**kwargs):
+        [result] = build_charts([script], cache_dir=cache_dir, **kwargs)
+        assert result.error is None
+        return [output.status for output in result.outputs]
+
+    assert statuses() == ['rendered', 'rendered']
+    assert sorted(path.suffix for path in cache_dir.iterdir()) == ['.png', '.svg']
+    assert statuses() == ['hit', 'hit']
+    svg.unlink()
+    assert statuses() == ['restored', 'hit']
+    svg.write_text('stale')
+    assert statuses() == ['restored', 'hit']
+    assert svg.read_text().startswith('<svg')
+    assert statuses(force=True) == ['rendered', 'rendered']
+
+
+def test_parse_targets():
+    assert parse_targets('png, png@2x,JPG@1.5x,,svg') == [
+        ExportTarget('png', None), ExportTarget('png', 2.0), ExportTarget('jpeg', 1.5), ExportTarget('svg', None)]
+    assert [target.label for target in parse_targets('png@2x,html')] == ['png@2x', 'html']
+    with pytest.raises(ValueError):
+        parse_targets('png,gif')
+
+
+@pytest.mark.parametrize('target, name, options', [
+    (ExportTarget('', None), 'chart.png', {'width': 800, 'scale': 2}),
+    (ExportTarget('png', 1), 'chart.png', {'width': 800, 'scale': 1}),
+    (ExportTarget('png', 3), 'chart@3x.png', {'width': 800, 'scale': 3}),
+    (ExportTarget('jpeg', None), 'chart.jpg', {'width': 800, 'scale': 2}),
+    (ExportTarget('svg', 2), 'chart@2x.svg', {'width': 800}),
+    (ExportTarget('html', None), 'chart.html', {'width': 800}),
+])
+def test_target_path_and_options(target, name, options):
+    captured = CapturedFigure(None, Path('/charts/chart.png'),
+                              {'format': 'png', 'scale': 2, 'width': 800, 'engine': 'kaleido'})
+    assert target_path(captured, target).name == name
+    assert target_options(captured, target) == options
+
+
+def test_build_charts_export_matrix(script, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    [result] = build_charts([script], cache_dir=cache_dir, targets=parse_targets('png,png@2x,svg,html'))
+    assert result.error is None
+    names = [Path(output.path).name for output in result.outputs]
+    assert names == ['flow.png', 'flow@2x.png', 'flow.svg', 'flow.html'] * 2
+    # The second write is the same spec, but its plain png keeps the script's scale=2
+    assert [output.status for output in result.outputs[4:]] == ['rendered', 'hit', 'hit', 'hit']
+    assert len(list(cache_dir.iterdir())) == 5
@@ -0,0 +1,84 @@
+import os
+
+from dart_index import DartIndex, parse_declarations, parse_directives, strip_comments
+
+SOURCE = '''
+import 'package:flutter/material.dart';
+// import 'commented_out.dart';
+export "src/widgets.dart";
+part 'home_page.g.dart';
+
+/* class NotAClass {} /* nested */ still a comment */
+abstract class BasePage<T extends Object> extends StatefulWidget
+    with RouteAware, TickerProviderStateMixin implements Comparable<BasePage<T>> {
+  const BasePage();
+}
+
+class HomePage extends BasePage<int> {
+  final String title = "class Fake { }";
+  Widget build(BuildContext context) => Scaffold(body: OrderCard(order: Order.empty()));
+}
+
+mixin Logging on Cubit<int> {}
+enum Status { idle, busy }
+class Alias = Base with Logging;
+'''
+
+
+def test_strip_comments_keeps_length_lines_and_strings():
+    stripped = strip_comments(SOURCE)
+    assert len(stripped) == len(SOURCE)
+    assert stripped.count('\n') == SOURCE.count('\n')
+    assert 'NotAClass' not in stripped and 'commented_out' not in stripped
+    assert '"class Fake { }"' in stripped
+    assert 'Fake' not in strip_comments(SOURCE, blank_strings=True)
+
+
+def test_parse_declarations():
+    declarations = {d.name: d for d in parse_declarations(SOURCE, 'home.dart')}
+    assert list(declarations) == ['BasePage', 'HomePage', 'Logging', 'Status', 'Alias']
+    base = declarations['BasePage']
+    assert base.abstract and base.kind == 'class' and base.line == 8
+    assert base.superclass == 'StatefulWidget'
+    assert base.mixins == ('RouteAware', 'TickerProviderStateMixin')
+    assert base.interfaces == ('Comparable',)
+    home = declarations['HomePage']
+    assert home.superclass == 'BasePage'
+    # Constructed or accessed names only: not type annotations, not strings
+    assert home.uses == ('Scaffold', 'OrderCard', 'Order')
+    assert declarations['Logging'].kind == 'mixin'
+    assert declarations['Status'].kind == 'enum'
+    assert (declarations['Alias'].superclass, declarations['Alias'].mixins) == ('Base', ('Logging',))
+
+
+def test_parse_directives():
+    assert [(d.kind, d.uri, d.line) for d in parse_directives(SOURCE)] == [
+        ('import', 'package:flutter/material.dart', 2),
+        ('export', 'src/widgets.dart', 4),
+        ('part', 'home_page.g.dart', 5),
+    ]
+
+
+def test_index_caches_unchanged_files_and_resolves_roles(tmp_path):
+    lib = tmp_path / 'lib'
+    (lib / 'view').mkdir(parents=True)
+    (lib / 'view' / 'home.dart').write_text(SOURCE)
+    (lib / 'view' / 'home.g.dart').write_text('class Generated {}')
+    (lib / 'cubit.dart').write_text('class OrderCubit extends Cubit<int> {}\n')
+    cache = tmp_path / 'cache.json'
+
+    index = DartIndex(lib, cache, workers=1).build()
+    assert (index.parsed, index.cached) == (2, 0)
+    assert sorted(index.files) == ['cubit.dart', 'view/home.dart']
+    assert index.role('HomePage') == 'stateful'
+    assert index.role('OrderCubit') == 'cubit'
+    assert [d.name for d in index.with_role(['stateful'])] == ['BasePage', 'HomePage']
+
+    again = DartIndex(lib, cache, workers=1).build()
+    assert (again.parsed, again.cached) == (0, 2)
+    assert again.files == index.files
+
+    (lib / 'cubit.dart').write_text('class OrderCubit extends Cubit<String> {}\n')
+    os.utime(lib / 'cubit.dart', ns=(1, 1))
+    third = DartIndex(lib, cache, workers=1).build()
+    assert (third.parsed, third.cached) == (1, 1)
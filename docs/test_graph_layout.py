@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from graph_layout import _count_crossings, _isotonic, layered_layout, tree_layout
+
+
+def _check_tidy(parents, positions, separation=1.0):
+    levels = {}
+    for node, (x, depth) in positions.items():
+        levels.setdefault(depth, []).append(x)
+    for xs in levels.values():
+        xs.sort()
+        assert all(b - a >= separation - 1e-9 for a, b in zip(xs, xs[1:]))
+    children = {}
+    for node, parent in parents.items():
+        if parent is not None:
+            children.setdefault(parent, []).append(node)
+    for parent, kids in children.items():
+        xs = [positions[kid][0] for kid in kids]
+        assert xs == sorted(xs)
+        assert positions[parent][0] == pytest.approx((xs[0] + xs[-1]) / 2)
+        assert all(positions[kid][1] == positions[parent][1] + 1 for kid in kids)
+
+
+def test_tree_layout_centres_parents_and_keeps_order():
+    parents = {'root': None, 'a': 'root', 'b': 'root', 'c': 'root', 'a1': 'a', 'a2': 'a', 'c1': 'c'}
+    positions = tree_layout(parents)
+    _check_tidy(parents, positions)
+    assert positions['root'][1] == 0 and positions['a1'][1] == 2
+
+
+def test_tree_layout_draws_identical_subtrees_identically():
+    parents = {'r': None, 'x': 'r', 'y': 'r', 'x1': 'x', 'x2': 'x', 'y1': 'y', 'y2': 'y'}
+    positions = tree_layout(parents)
+    shift = positions['y'][0] - positions['x'][0]
+    assert positions['y1'][0] - positions['x1'][0] == pytest.approx(shift)
+    assert positions['y2'][0] - positions['x2'][0] == pytest.approx(shift)
+
+
+def test_tree_layout_random_trees_are_tidy():
+    rng = random.Random(7)
+    parents = {0: None}
+    for node in range(1, 300):
+        parents[node] = rng.randrange(node)
+    _check_tidy(parents, tree_layout(parents))
+
+
+def test_tree_layout_deep_chain_and_forest():
+    chain = {0: None, **{i: i - 1 for i in range(1, 5000)}}
+    positions = tree_layout(chain)
+    assert positions[4999] == (positions[0][0], 4999)
+    forest = tree_layout({'a': None, 'b': None}, tree_gap=3.0)
+    assert forest['b'][0] - forest['a'][0] == pytest.approx(3.0)
+
+
+def test_tree_layout_rejects_cycles():
+    with pytest.raises(ValueError):
+        tree_layout({'a': 'b', 'b': 'a'})
+
+
+def test_layered_layout_layers_follow_edges_and_break_cycles():
+    edges = [('a', 'b'), ('b', 'c'), ('a', 'c'), ('c', 'a'), ('c', 'c')]
+    layout = layered_layout(['a', 'b', 'c'], edges)
+    layer = {node: y for node, (_, y) in layout.positions.items()}
+    assert layer['a'] < layer['b'] < layer['c']
+    assert layout.reversed_edges == {('c', 'a')}
+    # The long edge a -> c bends through a dummy node in b's layer
+    assert len(layout.edges[('a', 'c')]) == 3
+    assert ('c', 'c') not in layout.edges
+
+
+def test_layered_layout_removes_avoidable_crossings():
+    # Drawn in input order, the edges to x and y would cross
+    layout = layered_layout(['a', 'b', 'y', 'x'], [('a', 'x'), ('b', 'y')])
+    assert layout.crossings == 0
+    xs = {node: x for node, (x, _) in layout.positions.items()}
+    assert (xs['a'] < xs['b']) == (xs['x'] < xs['y'])
+
+
+def test_layered_layout_spaces_nodes_by_width():
+    widths = {'root': 1, 'wide': 10, 'narrow': 2}
+    layout = layered_layout(widths, [('root', 'wide'), ('root', 'narrow')], width=widths.get, node_gap=1)
+    left, right = sorted(layout.layers[1], key=lambda node: layout.positions[node][0])
+    gap = layout.positions[right][0] - layout.positions[left][0]
+    assert gap >= (widths[left] + widths[right]) / 2 + 1 - 1e-9
+
+
+def test_count_crossings_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(50):
+        upper = list(range(6))
+        lower_pos = rng.sample(range(6), 6)
+        down = [rng.sample(range(6), rng.randrange(4)) for _ in upper]
+        pairs = [(u, lower_pos[v]) for u in upper for v in down[u]]
+        expected = sum(1 for i, (a, b) in enumerate(pairs) for c, d in pairs[i + 1:]
+                       if (a - c) * (b - d) < 0)
+        assert _count_crossings(upper, lower_pos, down, 6) == expected
+
+
+def test_isotonic_keeps_offsets_and_fits_desired():
+    # Offsets are cumulative distances from the first position
+    result = _isotonic([5.0, 0.0, 10.0], [0.0, 2.0, 4.0])
+    assert result[1] - result[0] >= 2 - 1e-9 and result[2] - result[1] >= 2 - 1e-9
+    assert result[:2] == pytest.approx([1.5, 3.5])
+    assert result[2] == pytest.approx(10.0)
+    assert _isotonic([0.0, 5.0], [0.0, 1.0]) == pytest.approx([0.0, 5.0])
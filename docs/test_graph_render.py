@@ -0,0 +1,56 @@
+import plotly.graph_objects as go
+
+from graph_render import aggregate, edge_trace, merge_polylines, node_trace
+
+
+def test_merge_polylines():
+    xs, ys, texts = merge_polylines([[(0, 0), (1, 1)], [(2, 2), (3, 3), (4, 4)]], ['a', 'b'])
+    assert xs == [0, 1, None, 2, 3, 4, None]
+    assert ys == xs
+    assert texts == ['a', 'a', None, 'b', 'b', 'b', None]
+    assert merge_polylines([[(0, 0), (1, 1)]])[2] is None
+
+
+def test_edge_trace_is_one_trace_and_switches_to_webgl():
+    trace = edge_trace([[(0, 0), (1, 1)]] * 3, line=dict(width=2))
+    assert isinstance(trace, go.Scatter)
+    assert len(trace.x) == 9 and trace.hoverinfo == 'none' and trace.line.width == 2
+    labelled = edge_trace([[(0, 0), (1, 1)]], hovertext=['A -> B'])
+    assert labelled.hoverinfo == 'text' and labelled.hovertext == ('A -> B', 'A -> B', None)
+    assert isinstance(edge_trace([[(0, 0), (1, 1)]] * 3, threshold=8), go.Scattergl)
+    assert isinstance(node_trace(range(5), range(5), threshold=4), go.Scattergl)
+    assert isinstance(node_trace(range(4), range(4), threshold=4), go.Scatter)
+
+
+def test_aggregate_small_graph_keeps_every_node():
+    result = aggregate({'a': (0, 0), 'b': (0.1, 0), 'c': (5, 5)}, [('a', 'b'), ('b', 'c')], max_nodes=3)
+    assert result.members == [['a'], ['b'], ['c']]
+    assert result.edges == {(0, 1): 1, (1, 2): 1}
+    assert result.label(2) == 'c'
+
+
+def test_aggregate_merges_cells_and_bundles_edges():
+    positions = {f"n{i}": (i % 10 * 0.1, i // 10 * 0.1) for i in range(100)}
+    positions['far'] = (100, 100)
+    edges = [(node, 'far') for node in positions if node != 'far'] + [('n0', 'n1')]
+    result = aggregate(positions, edges, max_nodes=10)
+    # The far node stretches the bounding box, so the grid merges the rest into one cell
+    assert [len(group) for group in result.members] == [100, 1]
+    assert result.members[1] == ['far']
+    # Edges between the same pair of clusters are bundled, edges inside one are dropped
+    assert result.edges == {(0, 1): 100}
+    assert result.label(0) == '100 nodes' and result.label(1) == 'far'
+
+
+def test_aggregate_doubles_the_cell_until_clusters_fit():
+    positions = {(i, j): (float(i), float(j)) for i in range(20) for j in range(20)}
+    result = aggregate(positions, max_nodes=50)
+    assert 12 < len(result.members) <= 50
+    assert sorted(node for group in result.members for node in group) == sorted(positions)
+
+
+def test_aggregate_fixed_cell_and_centroids():
+    result = aggregate({'a': (0.1, 0.1), 'b': (0.3, 0.5), 'c': (1.5, 0.2)}, cell=1.0)
+    assert result.members == [['a', 'b'], ['c']]
+    assert result.positions[0] == (0.2, 0.3)
+    assert result.label(0, 'screens') == '2 screens'
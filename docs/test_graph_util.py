@@ -0,0 +1,23 @@
+from graph_util import strongly_connected
+
+
+def test_components_in_reverse_topological_order():
+    # 0 -> 1 <-> 2 -> 3, 4 alone
+    scc_ids, sccs = strongly_connected([[1], [2], [1, 3], [], []])
+    assert sorted(sccs) == [[0], [1, 2], [3], [4]]
+    assert scc_ids[1] == scc_ids[2]
+    for source, targets in enumerate([[1], [2], [1, 3], [], []]):
+        for target in targets:
+            assert scc_ids[target] <= scc_ids[source]
+
+
+def test_self_loop_and_empty_graph():
+    assert strongly_connected([[0]]) == ([0], [[0]])
+    assert strongly_connected([]) == ([], [])
+
+
+def test_long_chain_does_not_recurse():
+    n = 50_000
+    successors = [[i + 1] for i in range(n - 1)] + [[0]]
+    scc_ids, sccs = strongly_connected(successors)
+    assert len(sccs) == 1 and len(sccs[0]) == n
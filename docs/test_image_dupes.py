@@ -0,0 +1,62 @@
+import random
+
+from image_dupes import BKTree, ImageHash, density_variant, exact_groups, find_images, near_groups
+
+
+def _image(path, dhash, digest=None):
+    return ImageHash(path, 100, digest or path, dhash, (8, 8))
+
+
+def test_bk_tree_matches_brute_force():
+    rng = random.Random(1)
+    values = [rng.getrandbits(64) for _ in range(300)]
+    tree = BKTree()
+    for i, value in enumerate(values):
+        tree.add(value, i)
+    for query in values[:20] + [rng.getrandbits(64) for _ in range(20)]:
+        for radius in (0, 8, 24):
+            expected = {i for i, value in enumerate(values) if bin(query ^ value).count('1') <= radius}
+            assert {i for _, i in tree.search(query, radius)} == expected
+
+
+def test_near_groups_do_not_chain():
+    # a-b and b-c are 4 bits apart, a-c is 8 bits apart
+    a, b, c = _image('a.png', 0), _image('b.png', 0xF), _image('c.png', 0xFF)
+    assert near_groups([a, b, c], radius=5) == [[a, b]]
+    assert near_groups([a, b, c], radius=8) == [[a, b, c]]
+
+
+def test_near_groups_keep_density_variants_apart():
+    hdpi = _image('res/drawable-hdpi/logo.png', 0)
+    xhdpi = _image('res/drawable-xhdpi/logo.png', 1)
+    other = _image('assets/logo.png', 3)
+    assert near_groups([hdpi, xhdpi, other], radius=4) == [[hdpi, other]]
+
+
+def test_exact_groups_share_digest():
+    one, two, three = _image('1.png', 0, 'd'), _image('2.png', 0, 'd'), _image('3.png', 0, 'e')
+    assert exact_groups([one, two, three]) == [[one, two]]
+    assert near_groups([one, two, three], radius=0) == [[one, three]]
+
+
+def test_density_variant_keys():
+    assert density_variant('android/app/src/main/res/drawable-night-xhdpi/splash.png') == (
+        ('android/app/src/main/res', 'drawable-night', 'splash.png'), 2.0)
+    assert density_variant('assets/logo/3.0x/logo.png') == (('assets/logo', 'logo.png'), 3.0)
+    assert density_variant('assets/logo/logo.png') == (('assets/logo', 'logo.png'), 1.0)
+    assert density_variant('res/drawable-hdpi-xhdpi/x.png') is None
+
+
+def test_default_roots_resolve_against_the_project(tmp_path, monkeypatch):
+    project = tmp_path / 'app'
+    for path in ('assets/icon/icon.png', 'assets/logo/logo.png', 'android/app/src/main/res/mipmap-hdpi/ic.png',
+                 'docs/assets/diagram.png'):
+        (project / path).parent.mkdir(parents=True, exist_ok=True)
+        (project / path).write_bytes(b'png')
+    # docs/ has its own assets/, which must not shadow the project's
+    monkeypatch.chdir(project / 'docs')
+    assert [key for _, key in find_images(project)] == [
+        'assets/icon/icon.png', 'assets/logo/logo.png', 'android/app/src/main/res/mipmap-hdpi/ic.png']
+    assert [key for _, key in find_images(project, ['assets'])] == ['docs/assets/diagram.png']
+    assert [key for _, key in find_images(project, ['android'])] == [
+        'android/app/src/main/res/mipmap-hdpi/ic.png']
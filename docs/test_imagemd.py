@@ -0,0 +1,375 @@
+import io
+import os
+import time
+
+import pytest
+
+import imagemd
+from imagemd import Image, JpegImagePlugin
+
+needs_pillow = pytest.mark.skipif(Image is None, reason="Pillow is not installed")
+
+
+def _jpeg(quality=75, subsampling=2) -> bytes:
+    image = Image.effect_mandelbrot((128, 96), (-2, -1.2, 1, 1.2), 50).convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality, subsampling=subsampling)
+    return buffer.getvalue()
+
+
+@needs_pillow
+def test_optimize_jpeg_keeps_quantization_and_subsampling():
+    raw = _jpeg()
+    data = imagemd._encode_optimized(raw, '.jpg', imagemd.OptimizeOptions())
+    with Image.open(io.BytesIO(raw)) as source, Image.open(io.BytesIO(data)) as result:
+        assert result.format == 'JPEG'
+        assert result.size == source.size
+        assert result.quantization == source.quantization
+        assert JpegImagePlugin.get_sampling(result) == JpegImagePlugin.get_sampling(source)
+    assert len(data) < len(raw)
+
+
+@needs_pillow
+def test_optimize_image_replaces_jpeg_download(tmp_path):
+    (tmp_path / 'photo.jpg').write_bytes(_jpeg())
+    result = imagemd._optimize_image(tmp_path, 'photo.jpg', imagemd.OptimizeOptions())
+    assert result.error is None
+    assert result.output == 'photo.jpg'
+    assert result.bytes_after < result.bytes_before
+    assert (tmp_path / 'photo.jpg').stat().st_size == result.bytes_after
+
+
+class _Response:
+    def __init__(self, status_code, location=None):
+        self.status_code = status_code
+        self.headers = {'Location': location} if location else {}
+        self.is_redirect = location is not None
+        self.request = type('Request', (), {'method': 'HEAD'})()
+
+
+def test_link_check_fails_redirect_loop():
+    checker = imagemd.LinkChecker(downloader=None)
+    checker._request = lambda method, url: _Response(302, url)
+    result = checker.check_url('https://example.com/loop.png')
+    assert result['ok'] is False
+    assert result['status'] == 302
+    assert 'too many redirects' in result['error']
+    assert len(result['redirects']) == checker.MAX_REDIRECTS + 1
+
+
+def test_link_check_follows_redirect_chain():
+    responses = {
+        'https://example.com/a.png': _Response(301, '/b.png'),
+        'https://example.com/b.png': _Response(200),
+    }
+    checker = imagemd.LinkChecker(downloader=None)
+    checker._request = lambda method, url: responses[url]
+    result = checker.check_url('https://example.com/a.png')
+    assert result['ok'] is True
+    assert result['status'] == 200
+    assert result['redirects'] == ['https://example.com/a.png', 'https://example.com/b.png']
+
+
+def test_link_check_transient_errors_expire_early():
+    checker = imagemd.LinkChecker(downloader=None, ttl=24 * 3600)
+    now = time.time()
+    checked_at = now - checker.ERROR_TTL - 1
+    checker.cache = {
+        'https://example.com/timeout.png': {'status': None, 'error': 'timed out', 'checked_at': checked_at},
+        'https://example.com/gone.png': {'status': 404, 'error': None, 'checked_at': checked_at},
+        'https://example.com/ok.png': {'status': 200, 'error': None, 'checked_at': checked_at},
+    }
+    assert checker.is_stale('https://example.com/timeout.png', now)
+    assert not checker.is_stale('https://example.com/gone.png', now)
+    assert not checker.is_stale('https://example.com/ok.png', now)
+    assert checker.is_stale('https://example.com/new.png', now)
+
+
+def test_run_counts_repeated_urls_as_cache_hits(tmp_path, monkeypatch):
+    url = 'https://example.com/logo.png'
+    for name in ('a.md', 'b.md', 'c.md'):
+        (tmp_path / name).write_text(f'![Logo]({url})\n')
+    downloader = imagemd.MarkdownImageDownloader(str(tmp_path), str(tmp_path / 'images'), workers=1,
+                                                 rate_limit=0)
+
+    def download_image(url, filename):
+        downloader.images_dir.mkdir(exist_ok=True)
+        (downloader.images_dir / filename).write_bytes(b'png')
+        downloader.metrics.record(url, 'miss', status=200, bytes=3)
+        return True
+
+    monkeypatch.setattr(downloader, 'download_image', download_image)
+    downloader.run()
+    summary = downloader.metrics.summary()
+    assert summary['fetched'] == 1
+    assert summary['cache_hits'] == 2
+    assert url not in (tmp_path / 'c.md').read_text()
+
+
+def test_metrics_summary_per_host(tmp_path):
+    metrics = imagemd.DownloadMetrics()
+    for i, total_ms in enumerate([40, 90, 300, 700, 20000]):
+        metrics.record(f'https://A.example/{i}.png', 'miss', 200, bytes=100, total_ms=total_ms + 10, wait_ms=10)
+    metrics.record('https://b.example/x.png', 'miss', error='timeout', total_ms=5, retries=2)
+    metrics.record('https://a.example/0.png', 'hit')
+
+    summary = metrics.summary()
+    assert (summary['fetched'], summary['cache_hits'], summary['errors'], summary['retries']) == (6, 1, 1, 2)
+    assert summary['bytes'] == 500
+    host = summary['hosts']['a.example']
+    assert (host['requests'], host['bytes'], host['wait_ms']) == (5, 500, 50.0)
+    assert host['histogram_ms'] == {'<=50': 1, '<=100': 1, '<=250': 0, '<=500': 1, '<=1000': 1,
+                                    '<=2500': 0, '<=5000': 0, '<=10000': 0, '>10000': 1}
+    assert (host['p50_ms'], host['p90_ms'], host['p99_ms']) == (300, 20000, 20000)
+    assert summary['hosts']['b.example']['errors'] == 1
+
+    metrics.write(str(tmp_path / 'metrics.csv'))
+    lines = (tmp_path / 'metrics.csv').read_text().splitlines()
+    assert lines[0] == 'url,host,cache,status,bytes,total_ms,wait_ms,ttfb_ms,transfer_ms,retries,error'
+    assert len(lines) == 8
+
+
+def test_process_markdown_file_uses_the_run_phases(tmp_path, monkeypatch):
+    page = tmp_path / 'docs' / 'page.md'
+    page.parent.mkdir()
+    page.write_text('![Logo](https://example.com/logo.png "Logo") ![](https://example.com/logo.png)\n')
+    downloader = imagemd.MarkdownImageDownloader(str(tmp_path), str(tmp_path / 'images'), workers=1,
+                                                 rate_limit=0)
+
+    def download_image(url, filename):
+        downloader.images_dir.mkdir(exist_ok=True)
+        (downloader.images_dir / filename).write_bytes(b'png')
+        downloader.metrics.record(url, 'miss', status=200, bytes=3)
+        return True
+
+    monkeypatch.setattr(downloader, 'download_image', download_image)
+    assert downloader.process_markdown_file(page) == 2
+    name = downloader.downloaded_images['https://example.com/logo.png']
+    assert page.read_text() == f'![Logo](../images/{name} "Logo") ![](../images/{name})\n'
+    assert downloader.process_markdown_file(page) == 0
+
+
+def test_warm_benchmark_pass_skips_migrated_files(tmp_path):
+    import argparse
+    import imagemd_bench
+
+    args = argparse.Namespace(latency=0, bandwidth=None, error_rate=0, redirect_rate=0, image_size=256,
+                              seed=0, files=3, images=6, distinct=4, workers=1, rate=0, verbose=False,
+                              trace_memory=True)
+    result = imagemd_bench.run_benchmark(args, download_workers=2)
+    assert (result['images'], result['requests']) == (4, 4)
+    assert (result['warm_requests'], result['warm_bytes']) == (0, 0)
+    # The traced pass runs on its own fresh tree, after the timed ones
+    assert result['peak_traced_mb'] > 0
+
+def test_walk_does_not_follow_symlink_loops(tmp_path):
+    (tmp_path / 'guide').mkdir()
+    (tmp_path / 'guide' / 'intro.md').write_text('# Intro\n')
+    (tmp_path / 'guide' / 'loop').symlink_to(tmp_path, target_is_directory=True)
+    assert imagemd.walk_markdown_files(tmp_path) == [tmp_path / 'guide' / 'intro.md']
+
+
+def test_gc_keeps_images_referenced_from_ignored_trees(tmp_path):
+    images = tmp_path / 'images'
+    images.mkdir()
+    for name in ('used.png', 'ignored-only.png', 'orphan.png'):
+        (images / name).write_bytes(b'png')
+    (tmp_path / '.gitignore').write_text('build/\n')
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'README.md').write_text('![used](images/used.png)\n')
+    (tmp_path / 'build' / 'page.md').write_text('![old](../images/ignored-only.png)\n')
+
+    downloader = imagemd.MarkdownImageDownloader(str(tmp_path), str(images), workers=1)
+    audit = imagemd.ImageAudit(downloader)
+    audit.build_index()
+    assert [path.name for path, _ in audit.orphans] == ['ignored-only.png', 'orphan.png']
+    assert audit.collect_garbage('delete') == 3
+    assert sorted(path.name for path in images.iterdir()) == ['ignored-only.png', 'used.png']
+
+
+DOC = """# Guide
+
+![Logo](https://cdn.example.com/logo.png "Title") and ![](https://cdn.example.com/logo.png)
+
+<p><img class="wide" alt="Shot" src='https://cdn.example.com/shot.jpg' width="300"></p>
+
+  [diagram]: https://cdn.example.com/diagram.svg
+See https://example.com/page.
+"""
+
+
+def test_scan_finds_every_form_in_source_order():
+    refs = list(imagemd.scan_image_references(DOC))
+    assert [(ref.kind, ref.alt_text) for ref in refs] == [
+        ('markdown', 'Logo'), ('markdown', ''), ('html', 'Shot'), ('reference', 'diagram')]
+    for ref in refs:
+        assert DOC[ref.start:ref.end] == ref.full_match
+        assert DOC[ref.url_start:ref.url_end] == ref.url
+    assert refs[0].url == 'https://cdn.example.com/logo.png'
+    assert refs[2].url == 'https://cdn.example.com/shot.jpg'
+
+
+def test_splice_round_trip_only_touches_urls():
+    refs = list(imagemd.scan_image_references(DOC))
+    replacements = {ref.url: f'images/{i}.png' for i, ref in enumerate(refs)}
+    content, count = imagemd.splice_image_urls(DOC, refs, replacements)
+    assert count == 4
+    assert 'cdn.example.com' not in content
+    assert '<img class="wide" alt="Shot" src=\'images/2.png\' width="300">' in content
+    # Mapping the new URLs back restores the document exactly
+    reverse = {new: old for old, new in replacements.items()}
+    restored, _ = imagemd.splice_image_urls(content, list(imagemd.scan_image_references(content)), reverse)
+    assert restored == DOC
+
+
+@pytest.mark.parametrize('markdown, url', [
+    ('![a](https://x.example/y.png "A title")', 'https://x.example/y.png'),
+    ("![a](https://x.example/y.png 'A title')", 'https://x.example/y.png'),
+    ('![a](<https://x.example/y.png> "t")', 'https://x.example/y.png'),
+    ('![a]( images/y.png )', 'images/y.png'),
+])
+def test_markdown_title_is_not_part_of_the_url(markdown, url):
+    [ref] = imagemd.scan_image_references(markdown)
+    assert ref.url == url
+    content, count = imagemd.splice_image_urls(markdown, [ref], {url: 'images/new.png'})
+    assert count == 1
+    assert content == markdown.replace(url, 'images/new.png')
+
+
+def test_splice_without_replacements_returns_content_unchanged():
+    refs = list(imagemd.scan_image_references(DOC))
+    assert imagemd.splice_image_urls(DOC, refs, {}) == (DOC, 0)
+
+
+def test_scan_remote_urls_strips_trailing_punctuation():
+    assert list(imagemd.scan_remote_urls(DOC))[-1] == 'https://example.com/page'
+
+
+@pytest.mark.parametrize('patterns, path, is_dir, expected', [
+    (['build/'], 'build', True, True),
+    (['build/'], 'build', False, None),
+    (['build/'], 'docs/build', True, True),
+    (['/build'], 'docs/build', True, None),
+    (['docs/*.md'], 'docs/a.md', False, True),
+    (['docs/*.md'], 'docs/sub/a.md', False, None),
+    (['**/draft-*.md'], 'a/b/draft-1.md', False, True),
+    (['notes/**'], 'notes/x/y.md', False, True),
+    (['ch?.md'], 'ch1.md', False, True),
+    (['ch[!0-4].md'], 'ch5.md', False, True),
+    (['ch[!0-4].md'], 'ch3.md', False, None),
+    (['*.md', '!README.md'], 'README.md', False, False),
+    (['# comment', '', '*.markdown'], 'a.markdown', False, True),
+])
+def test_ignore_rules_match(patterns, path, is_dir, expected):
+    assert imagemd.IgnoreRules(patterns).match(path, is_dir) is expected
+
+
+def test_walk_applies_nested_gitignore_and_default_patterns(tmp_path):
+    for path in ('README.md', 'build/out.md', 'docs/keep.md', 'docs/drafts/wip.md',
+                 'docs/drafts/final.md', 'node_modules/pkg/README.md'):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text('# x\n')
+    (tmp_path / 'docs' / '.gitignore').write_text('drafts/*\n!drafts/final.md\n')
+    found = [path.relative_to(tmp_path).as_posix() for path in imagemd.walk_markdown_files(tmp_path)]
+    assert found == ['README.md', 'docs/drafts/final.md', 'docs/keep.md']
+    everything = imagemd.walk_markdown_files(tmp_path, (), use_gitignore=False)
+    assert len(everything) == 6
+
+
+def test_incremental_state_round_trip(tmp_path):
+    page = tmp_path / 'page.md'
+    page.write_text('# Page\n')
+    _, fingerprint = imagemd._read_markdown(page)
+    state = imagemd.IncrementalState(tmp_path / 'state.json', tmp_path)
+    state.record(page, fingerprint, ['https://example.com/b.png', 'https://example.com/a.png'])
+    state.save()
+
+    loaded = imagemd.IncrementalState(tmp_path / 'state.json', tmp_path)
+    assert loaded.files['page.md']['remote_urls'] == ['https://example.com/a.png', 'https://example.com/b.png']
+    # Outstanding remote images keep the file from being skipped
+    assert not loaded.is_fresh(page, os.stat(page))
+    loaded.record(page, fingerprint, ())
+    assert loaded.is_fresh(page, os.stat(page))
+    assert loaded.is_migrated(page, fingerprint.digest)
+    loaded.retain([])
+    assert loaded.files == {}
+
+
+def test_incremental_state_ignores_unreadable_file(tmp_path):
+    (tmp_path / 'state.json').write_text('{not json')
+    assert imagemd.IncrementalState(tmp_path / 'state.json', tmp_path).files == {}
+
+
+def test_incremental_run_skips_files_without_remote_images(tmp_path, monkeypatch):
+    (tmp_path / 'plain.md').write_text('# Nothing remote\n')
+    state_file = str(tmp_path / 'state.json')
+    imagemd.MarkdownImageDownloader(str(tmp_path), str(tmp_path / 'images'), workers=1,
+                                    state_file=state_file).run()
+    scanned = []
+    monkeypatch.setattr(imagemd, '_scan_markdown_file', lambda path: scanned.append(path))
+    imagemd.MarkdownImageDownloader(str(tmp_path), str(tmp_path / 'images'), workers=1,
+                                    state_file=state_file).run()
+    assert scanned == []
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(imagemd.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(imagemd.time, 'sleep', fake.sleep)
+    return fake
+
+
+def test_token_bucket_allows_burst_then_paces(clock):
+    bucket = imagemd.TokenBucket(rate=4, burst=2)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_token_bucket_aimd(clock):
+    bucket = imagemd.TokenBucket(rate=8, burst=1, max_rate=10)
+    bucket.penalize()
+    bucket.penalize()
+    assert bucket.rate == 2
+    for _ in range(100):
+        bucket.reward()
+    assert bucket.rate == 10
+    for _ in range(20):
+        bucket.penalize()
+    assert bucket.rate == bucket.min_rate == 0.1
+
+
+def test_token_bucket_honours_retry_after(clock):
+    bucket = imagemd.TokenBucket(rate=100, burst=5)
+    bucket.penalize(retry_after=3)
+    bucket.acquire()
+    assert clock.sleeps[0] == 3
+    assert clock.now >= 103
+
+
+def test_host_rate_limiter_shares_bucket_per_host():
+    limiter = imagemd.HostRateLimiter(rate=5, burst=2)
+    assert limiter.bucket('https://A.example.com/x.png') is limiter.bucket('https://a.example.com/y.png')
+    assert limiter.bucket('https://a.example.com/') is not limiter.bucket('https://b.example.com/')
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None), ('', None), ('7', 7.0), ('-3', 0.0), ('3600', 60.0), ('soon', None),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),
+])
+def test_parse_retry_after(value, expected):
+    assert imagemd.parse_retry_after(value) == expected
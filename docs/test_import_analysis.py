@@ -0,0 +1,61 @@
+import random
+from types import SimpleNamespace
+
+from import_analysis import ImportAnalysis
+
+
+def _graph(imports, lines=None):
+    files = list(imports)
+    edges = [(source, target) for source, targets in imports.items() for target in targets]
+    return SimpleNamespace(files=files, imports=imports, edges=edges, lines=lines or {})
+
+
+def _reach(imports, start):
+    seen, stack = set(), list(imports[start])
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(imports[node])
+    seen.discard(start)
+    return seen
+
+
+def test_bitset_closure_matches_graph_search():
+    rng = random.Random(4)
+    names = [f'f{i}.dart' for i in range(80)]
+    imports = {name: sorted(set(rng.sample(names, rng.randrange(4))) - {name}) for name in names}
+    analysis = ImportAnalysis(_graph(imports))
+    importers = {name: [source for source in names if name in imports[source]] for name in names}
+    for name in names:
+        assert set(analysis.blast_radius(name)) == _reach(importers, name)
+        assert set(analysis._paths(analysis.dependencies[names.index(name)])) == _reach(imports, name)
+
+
+def test_cycles_and_shortest_cycle_path():
+    imports = {
+        'a.dart': ['b.dart'], 'b.dart': ['c.dart', 'd.dart'], 'c.dart': ['a.dart'],
+        'd.dart': ['b.dart'], 'e.dart': ['a.dart'],
+    }
+    analysis = ImportAnalysis(_graph(imports))
+    assert analysis.cycles() == [['a.dart', 'b.dart', 'c.dart', 'd.dart']]
+    assert analysis.cycle_path(['a.dart', 'b.dart', 'c.dart', 'd.dart']) == [
+        'a.dart', 'b.dart', 'c.dart', 'a.dart']
+    # Members of a cycle reach each other but not themselves
+    assert sorted(analysis.blast_radius('a.dart')) == ['b.dart', 'c.dart', 'd.dart', 'e.dart']
+    rows = {row['path']: row for row in analysis.rows()}
+    assert rows['e.dart']['cycle'] == '' and rows['a.dart']['cycle'] == rows['d.dart']['cycle']
+
+
+def test_violations():
+    imports = {
+        'view/home.dart': ['core/services/api.dart', 'core/models/order.dart'],
+        'core/models/order.dart': ['view/widgets/card.dart'],
+        'core/services/api.dart': [],
+        'view/widgets/card.dart': [],
+    }
+    analysis = ImportAnalysis(_graph(imports, {('view/home.dart', 'core/services/api.dart'): 3}))
+    assert [(v.source, v.target, v.line) for v in analysis.violations()] == [
+        ('view/home.dart', 'core/services/api.dart', 3),
+        ('core/models/order.dart', 'view/widgets/card.dart', 0),
+    ]
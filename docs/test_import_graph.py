@@ -0,0 +1,58 @@
+import pytest
+
+from dart_index import DartIndex
+from import_graph import ImportGraph, layer_of
+
+FILES = {
+    'main.dart': "import 'package:app/view/home.dart';\nimport 'package:flutter/material.dart';\n",
+    'view/home.dart': ("import '../core/services/api.dart';\nimport 'package:app/core/models/order.dart';\n"
+                       "import 'dart:async';\nimport 'home.g.dart';\nimport 'missing.dart';\n"),
+    'core/services/api.dart': "import '/core/models/order.dart';\nimport 'package:http/http.dart' as http;\n",
+    'core/models/order.dart': "part 'order.freezed.dart';\n",
+}
+
+
+@pytest.fixture
+def graph(tmp_path):
+    for path, source in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(source)
+    return ImportGraph(DartIndex(tmp_path, None, workers=1).build(), package='app').build()
+
+
+@pytest.mark.parametrize('path, layer', [
+    ('main.dart', 'app'), ('view/home/home_view.dart', 'view'), ('core/services/api.dart', 'core/services'),
+    ('core/models/order.dart', 'core/models'), ('core/theme.dart', 'core'), ('utils/x.dart', 'other'),
+])
+def test_layer_of(path, layer):
+    assert layer_of(path) == layer
+
+
+def test_resolve(graph):
+    assert graph.resolve('package:app/core/x.dart', 'view/a.dart') == ('core/x.dart', None)
+    assert graph.resolve('package:provider/provider.dart', 'a.dart') == (None, 'provider')
+    assert graph.resolve('dart:ui', 'a.dart') == (None, 'dart:ui')
+    assert graph.resolve('../b/c.dart', 'view/a/a.dart') == ('view/b/c.dart', None)
+
+
+def test_build_edges_externals_and_unresolved(graph):
+    assert sorted(graph.edges) == [
+        ('core/services/api.dart', 'core/models/order.dart'),
+        ('main.dart', 'view/home.dart'),
+        ('view/home.dart', 'core/models/order.dart'),
+        ('view/home.dart', 'core/services/api.dart'),
+    ]
+    assert graph.external['view/home.dart'] == ['dart:async']
+    assert graph.external['core/services/api.dart'] == ['http']
+    assert graph.lines[('view/home.dart', 'core/models/order.dart')] == 2
+    # Generated parts are not reported missing
+    assert [(u.path, u.uri) for u in graph.unresolved] == [('view/home.dart', 'missing.dart')]
+
+
+def test_layer_counts(graph):
+    counts = graph.layer_counts()
+    assert counts[('view', 'core/services')] == 1
+    assert counts[('app', 'view')] == 1
+    with_packages = graph.layer_counts(include_external=True)
+    assert with_packages[('app', 'flutter')] == 1
+    assert ('view', 'dart:async') not in with_packages
@@ -0,0 +1,85 @@
+import math
+import random
+
+import pytest
+
+from label_layout import (Box, GridIndex, Label, place_labels, point_candidates, polyline_boxes,
+                          segment_candidates)
+
+
+def test_grid_index_overlap_matches_brute_force():
+    rng = random.Random(2)
+    boxes = [Box.around(rng.uniform(0, 100), rng.uniform(0, 100), rng.uniform(1, 15), rng.uniform(1, 15))
+             for _ in range(200)]
+    grid = GridIndex(cell=8)
+    for i, box in enumerate(boxes):
+        grid.insert(i, box)
+    grid.remove(0)
+    for probe in boxes[:30]:
+        expected = sum(probe.overlap(box) for box in boxes[1:])
+        assert grid.overlap(probe) == pytest.approx(expected)
+
+
+def test_point_candidates_clear_the_marker():
+    for x, y in point_candidates(0, 0, 10, 4, radius=3, gap=1):
+        box = Box.around(x, y, 10, 4)
+        assert box.overlap(Box(-3, -3, 3, 3)) == 0
+    east, south = point_candidates(0, 0, 10, 4, positions=('E', 'S'))
+    assert east == (7, 0) and south == (0, -4)
+    assert point_candidates(0, 0, 10, 4, positions=('S',), y_down=True) == [(0, 4)]
+
+
+def test_segment_candidates_do_not_touch_the_line():
+    start, end = (0, 0), (40, 30)
+    boxes = polyline_boxes([start, end], thickness=0.5, step=0.5)
+    centers = segment_candidates(start, end, 8, 3, gap=1, on_line=False)
+    assert len(centers) == 10
+    for x, y in centers:
+        label = Box.around(x, y, 8, 3)
+        assert all(label.overlap(box) == 0 for box in boxes)
+
+
+def test_polyline_boxes_cover_every_segment():
+    boxes = polyline_boxes([(0, 0), (10, 0), (10, 10)], thickness=2)
+    centers = {((b.x0 + b.x1) / 2, (b.y0 + b.y1) / 2) for b in boxes}
+    assert {(0, 0), (10, 0), (10, 10)} <= centers
+    assert max(math.dist(a, b) for a, b in zip(sorted(centers), sorted(centers)[1:])) <= 4
+
+
+def test_place_labels_avoids_obstacles_and_each_other():
+    obstacles = [Box(-1, -1, 1, 1), Box(1, -1, 11, 1)]  # marker and the label's favourite spot
+    labels = [Label(point_candidates(0, 0, 10, 2, radius=1), 10, 2),
+              Label(point_candidates(0, 0, 10, 2, radius=1), 10, 2)]
+    placements = place_labels(labels, obstacles)
+    assert all(p.overlap <= 1e-9 for p in placements)
+    assert placements[0].box.overlap(placements[1].box) == 0
+    assert placements[0].candidate == 1  # 'E' is blocked, 'S' is next
+
+
+def test_place_labels_respects_priority_and_bounds():
+    spot = [(0, 0), (0, 10)]
+    labels = [Label(spot, 4, 4, priority=0), Label(spot, 4, 4, priority=1)]
+    low, high = place_labels(labels)
+    assert high.candidate == 0 and low.candidate == 1
+    outside = Label([(100, 100), (5, 5)], 4, 4)
+    assert place_labels([outside], bounds=Box(0, 0, 10, 10))[0].candidate == 1
+
+
+def test_annealing_is_deterministic_and_no_worse_than_greedy():
+    rng = random.Random(5)
+    labels = []
+    for _ in range(60):
+        x, y = rng.uniform(0, 60), rng.uniform(0, 60)
+        labels.append(Label(point_candidates(x, y, 8, 3, radius=1), 8, 3))
+
+    def total(placements):
+        return sum(p.overlap for p in placements)
+
+    greedy = place_labels(labels)
+    annealed = place_labels(labels, anneal=30, seed=1)
+    assert annealed == place_labels(labels, anneal=30, seed=1)
+    assert total(annealed) <= total(greedy) + 1e-9
+
+
+def test_place_labels_empty():
+    assert place_labels([]) == []
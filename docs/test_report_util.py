@@ -0,0 +1,34 @@
+import csv
+import json
+
+from report_util import write_report
+
+ROWS = [{'name': 'a', 'count': 1, 'extra': 'x'}, {'name': 'b', 'count': 2, 'extra': 'y'}]
+
+
+def test_csv_columns_default_to_first_row(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    write_report(path, ROWS)
+    with open(path, newline='', encoding='utf-8') as f:
+        assert list(csv.DictReader(f)) == [{'name': 'a', 'count': '1', 'extra': 'x'},
+                                           {'name': 'b', 'count': '2', 'extra': 'y'}]
+
+
+def test_csv_fieldnames_select_columns(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    write_report(path, ROWS, fieldnames=['count', 'name'])
+    with open(path, encoding='utf-8') as f:
+        assert f.read().splitlines() == ['count,name', '1,a', '2,b']
+
+
+def test_json_writes_document_or_rows(tmp_path):
+    write_report(str(tmp_path / 'rows.json'), ROWS)
+    write_report(str(tmp_path / 'doc.JSON'), ROWS, {'rows': ROWS, 'total': 3})
+    assert json.loads((tmp_path / 'rows.json').read_text()) == ROWS
+    assert json.loads((tmp_path / 'doc.JSON').read_text()) == {'rows': ROWS, 'total': 3}
+
+
+def test_empty_csv(tmp_path):
+    path = tmp_path / 'empty.csv'
+    write_report(str(path), [])
+    assert path.read_text().strip() == ''
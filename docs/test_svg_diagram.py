@@ -0,0 +1,78 @@
+import io
+import json
+import math
+
+import pytest
+from PIL import Image
+
+from svg_diagram import Diagram
+
+
+def _diagram():
+    diagram = Diagram('Flow & more', width=400, height=200, x_range=(0, 2), y_range=(0, 1),
+                      margin=dict(l=0, r=0, t=0, b=0))
+    diagram.edge('App', 'API', label='calls', hover='App -> API')
+    diagram.node(0.5, 0.5, 'App', shape='rect', width=80, height=40, stroke=None)
+    diagram.node(1.5, 0.5, 'API', shape='circle', size=40, stroke=None)
+    diagram.text(1, 0.1, 'note', anchor='start')
+    diagram.legend('Service', '#1FB8CD', shape='circle')
+    return diagram
+
+
+def test_to_pixels():
+    diagram = Diagram(width=400, height=200, x_range=(0, 2), y_range=(0, 1), margin=dict(l=0, r=0, t=0, b=0))
+    assert diagram.to_pixels(0, 0) == (0, 200)
+    assert diagram.to_pixels(2, 1) == (400, 0)
+    assert diagram.to_pixels(1, 0.5, width=800, height=400) == (400, 200)
+
+
+def test_round_trip_through_json():
+    diagram = _diagram()
+    spec = json.loads(json.dumps(diagram.to_dict()))
+    assert Diagram.from_dict(spec).to_dict() == spec
+    assert Diagram.from_dict(spec).to_svg() == diagram.to_svg()
+
+
+def test_edges_are_clipped_to_node_outlines():
+    marks = _diagram().marks()
+    shaft = next(mark for mark in marks if mark.kind == 'line')
+    head = next(mark for mark in marks if mark.kind == 'polygon')
+    # App is a 80 px wide rect centered at x=100, API a 40 px circle centered at x=300
+    assert shaft.points[0] == pytest.approx((140, 100))
+    assert head.points[0] == pytest.approx((280, 100))
+    assert math.isclose(shaft.points[1][0], 280 - 8)
+
+
+def test_svg_output():
+    svg = _diagram().to_svg()
+    assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg" width="400" height="200"')
+    assert '>Flow &amp; more</text>' in svg
+    assert '<title>App -&gt; API</title>' in svg
+    assert '>calls<' in svg and '>note<' in svg
+    assert svg.count('<circle') == 2  # API node and the legend swatch
+    assert _diagram().to_svg(width=800).startswith('<svg xmlns="http://www.w3.org/2000/svg" width="800"')
+
+
+def test_raster_output_size_and_formats(tmp_path):
+    diagram = _diagram()
+    assert diagram.to_raster(scale=2).size == (800, 400)
+    png = Image.open(io.BytesIO(diagram.to_image('png', scale=1.5)))
+    assert (png.format, png.size) == ('PNG', (600, 300))
+    assert Image.open(io.BytesIO(diagram.to_image('jpg'))).format == 'JPEG'
+    assert diagram.to_image('html').startswith(b'<!DOCTYPE html>')
+    with pytest.raises(ValueError):
+        diagram.to_image('gif')
+
+    diagram.write_image(tmp_path / 'flow.webp', scale=0.5)
+    assert Image.open(tmp_path / 'flow.webp').size == (200, 100)
+
+
+def test_invalid_input():
+    diagram = Diagram()
+    with pytest.raises(ValueError):
+        diagram.node(0, 0, 'A', shape='star')
+    with pytest.raises(ValueError):
+        diagram.text(0, 0, 'A', anchor='left')
+    diagram.edge('A', 'B')
+    with pytest.raises(KeyError):
+        diagram.to_svg()
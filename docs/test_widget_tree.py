@@ -0,0 +1,82 @@
+from dart_index import DartIndex
+from widget_tree import WidgetTree
+
+FILES = {
+    'main.dart': '''
+class MyApp extends StatelessWidget {
+  Widget build(BuildContext context) => MaterialApp.router(routerConfig: NavigationRouters.router);
+}
+class NavigationRouters {
+  static final router = GoRouter(routes: [
+    GoRoute(builder: (context, state) => HomePage()),
+    GoRoute(builder: (context, state) => LoginPage()),
+  ]);
+}
+''',
+    'view/home/home_page.dart': '''
+class HomePage extends StatefulWidget {
+  State<HomePage> createState() => _HomePageState();
+}
+class _HomePageState extends State<HomePage> {
+  Widget build(BuildContext context) => Scaffold(body: Column(children: [_header(), OrderCard()]));
+  Widget _header() => AppHeader();
+}
+''',
+    'view/auth/login_page.dart': '''
+class LoginPage extends BasePage {
+  Widget body() => Center(child: PrimaryButton());
+}
+''',
+    'product/widgets.dart': '''
+abstract class BasePage extends StatelessWidget {
+  Widget build(BuildContext context) => Scaffold(appBar: AppHeader(), body: body());
+}
+class AppHeader extends StatelessWidget {
+  Widget build(BuildContext context) => Text('Tailor');
+}
+class OrderCard extends StatelessWidget {
+  Widget build(BuildContext context) => Card(child: AppHeader());
+}
+class PrimaryButton extends StatelessWidget {
+  Widget build(BuildContext context) => ElevatedButton(child: Text('Go'));
+}
+class UnusedBanner extends StatelessWidget {
+  Widget build(BuildContext context) => SizedBox();
+}
+''',
+}
+
+
+def _tree(tmp_path):
+    lib = tmp_path / 'lib'
+    for path, source in FILES.items():
+        (lib / path).parent.mkdir(parents=True, exist_ok=True)
+        (lib / path).write_text(source)
+    return WidgetTree(DartIndex(lib, None, workers=1).build()).build()
+
+
+def test_children_follow_state_classes_routers_and_base_classes(tmp_path):
+    tree = _tree(tmp_path)
+    assert sorted(tree.widgets) == ['AppHeader', 'HomePage', 'LoginPage', 'MyApp',
+                                    'OrderCard', 'PrimaryButton', 'UnusedBanner']
+    assert tree.children['MyApp'] == ['HomePage', 'LoginPage']
+    assert tree.children['HomePage'] == ['OrderCard', 'AppHeader']
+    assert tree.children['LoginPage'] == ['PrimaryButton', 'AppHeader']
+    assert sorted(tree.parents['AppHeader']) == ['HomePage', 'LoginPage', 'OrderCard']
+    assert tree.roots() == ['MyApp', 'UnusedBanner']
+
+
+def test_depths_categories_and_report(tmp_path):
+    tree = _tree(tmp_path)
+    assert tree.depths('MyApp') == {'MyApp': 0, 'HomePage': 1, 'LoginPage': 1,
+                                    'OrderCard': 2, 'AppHeader': 2, 'PrimaryButton': 2}
+    assert [tree.category(name) for name in ('MyApp', 'HomePage', 'LoginPage', 'OrderCard')] == [
+        'App Root', 'Main App', 'Authentication', 'Shared Components']
+    assert tree.role('HomePage') == 'stateful'
+
+    rows = {row['widget']: row for row in tree.rows()}
+    assert rows['UnusedBanner']['depth'] == 0
+    assert rows['LoginPage']['path'] == 'lib/view/auth/login_page.dart:2'
+    report = tmp_path / 'tree.csv'
+    tree.write_report(str(report))
+    assert report.read_text().splitlines()[0] == 'widget,role,category,depth,parents,children,path'
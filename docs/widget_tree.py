@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Widget hierarchy of the Flutter app, extracted from the Dart sources.
+
+A widget's children are the project widgets its class constructs: in
+build(), in the helper methods build() is split into and, for a
+StatefulWidget, in its State class. Non-widget project classes on the way
+(State classes, the GoRouter table in NavigationRouters, helpers) are
+followed through to the widgets they construct, so MyApp reaches the routed
+pages. Framework widgets (Scaffold, Column, ...) are left out.
+
+The classes come from a DartIndex build, so its parse cache applies.
+
+Example:
+    python widget_tree.py --output flutter_widget_tree.json
+"""
+
+import argparse
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from dart_index import DEFAULT_CACHE, LIB_DIR, WIDGET_ROLES, DartClass, DartIndex
+import report_util
+
+# lib/view/<feature>/ -> diagram category
+FEATURE_CATEGORIES = {
+    'auth': 'Authentication',
+    'home': 'Main App',
+    'introduction': 'Onboarding',
+    'language_selection': 'Onboarding',
+    'design': 'Design Studio',
+    'fitting': 'Virtual Fitting',
+    'virtual_fitting': 'Virtual Fitting',
+    'measurements': 'Virtual Fitting',
+    'orders': 'Order Management',
+    'profile': 'Profile',
+    'settings': 'Profile',
+}
+
+
+class WidgetTree:
+    """
+    Parent -> child graph of the project's widget classes
+
+    Attributes:
+        widgets: widget class name -> declaration
+        children: widget -> widgets it constructs, in source order
+        parents: widget -> widgets constructing it
+    """
+
+    def __init__(self, index: DartIndex):
+        """
+        Args:
+            index: Built index of the lib/ sources
+        """
+        self.index = index
+        self.widgets: Dict[str, DartClass] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.parents: Dict[str, List[str]] = {}
+
+    def build(self) -> "WidgetTree":
+        """Resolve every widget's children from the indexed class bodies"""
+        declarations = [declaration for declaration in self.index.classes
+                        if declaration.kind == 'class' and not declaration.abstract and declaration.superclass
+                        and self.index.role(declaration.superclass) in WIDGET_ROLES]
+        self.widgets = {}
+        for declaration in declarations:
+            self.widgets.setdefault(declaration.name, declaration)
+
+        # Same-named widgets in different files share one node
+        self.children = {name: [] for name in self.widgets}
+        for declaration in declarations:
+            children = self.children[declaration.name]
+            children.extend(child for child in self._constructed(declaration) if child not in children)
+        self.parents = {name: [] for name in self.widgets}
+        for parent, children in self.children.items():
+            for child in children:
+                self.parents[child].append(parent)
+        return self
+
+    def _constructed(self, widget: DartClass) -> List[str]:
+        """Widgets reached from a widget's body through non-widget project classes"""
+        # Widgets extending a project base class inherit its build helpers
+        uses = list(widget.uses)
+        superclass, seen_supers = widget.superclass, {widget.name}
+        while superclass in self.index.classes_by_name and superclass not in seen_supers:
+            seen_supers.add(superclass)
+            base = self.index.classes_by_name[superclass][0]
+            uses.extend(base.uses)
+            superclass = base.superclass
+
+        children: List[str] = []
+        seen = {widget.name}
+        pending = deque(uses)
+        while pending:
+            name = pending.popleft()
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in self.widgets:
+                children.append(name)
+            elif name in self.index.classes_by_name:
+                for declaration in self.index.classes_by_name[name]:
+                    pending.extend(declaration.uses)
+        return children
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        return [(parent, child) for parent, children in self.children.items() for child in children]
+
+    def roots(self) -> List[str]:
+        """Widgets no other widget constructs (the app root, unused widgets)"""
+        return [name for name in self.widgets if not self.parents[name]]
+
+    def depths(self, root: Optional[str] = None) -> Dict[str, int]:
+        """Breadth-first depth of every widget reachable from root (default: all roots)"""
+        depth = {name: 0 for name in ([root] if root else self.roots())}
+        queue = deque(depth)
+        while queue:
+            name = queue.popleft()
+            for child in self.children[name]:
+                if child not in depth:
+                    depth[child] = depth[name] + 1
+                    queue.append(child)
+        return depth
+
+    def category(self, name: str) -> str:
+        """Diagram category of a widget, from where it lives under lib/"""
+        parts = self.widgets[name].path.split('/')
+        if len(parts) == 1:
+            return 'App Root'
+        if parts[0] == 'view' and len(parts) > 2:
+            return FEATURE_CATEGORIES.get(parts[1], parts[1].replace('_', ' ').title())
+        return 'Shared Components'
+
+    def role(self, name: str) -> str:
+        return self.index.role(self.widgets[name].superclass) or 'widget'
+
+    def rows(self) -> List[dict]:
+        depth = self.depths()
+        return [{
+            'widget': name,
+            'role': self.role(name),
+            'category': self.category(name),
+            'depth': depth.get(name, ''),
+            'parents': ', '.join(self.parents[name]),
+            'children': ', '.join(self.children[name]),
+            'path': f"lib/{declaration.path}:{declaration.line}",
+        } for name, declaration in self.widgets.items()]
+
+    def write_report(self, path: str):
+        """Write the widgets as CSV, or widgets and parent -> child edges as JSON"""
+        rows = self.rows()
+        report_util.write_report(path, rows, {'widgets': rows, 'edges': self.edges})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the widget hierarchy from the Dart sources")
+    parser.add_argument('--lib', default=str(LIB_DIR), help="Flutter lib/ directory")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help="Dart index cache (JSON)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse every file")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size")
+    parser.add_argument('--output', help="Write the hierarchy as .csv or .json")
+    args = parser.parse_args()
+
+    index = DartIndex(args.lib, None if args.no_cache else args.cache, args.workers).build()
+    tree = WidgetTree(index).build()
+    print(f"🔍 {len(index.files)} Dart files ({index.parsed} parsed, {index.cached} cached)")
+    print(f"📊 {len(tree.widgets)} widgets, {len(tree.edges)} parent -> child links")
+
+    # Indented outline from each root; a widget already printed is not expanded again
+    printed = set()
+    for root in tree.roots():
+        stack = [(root, 0)]
+        while stack:
+            name, depth = stack.pop()
+            repeat = name in printed
+            print(f"{'  ' * depth}- {name} [{tree.category(name)}]{' ...' if repeat and tree.children[name] else ''}")
+            if repeat:
+                continue
+            printed.add(name)
+            stack.extend((child, depth + 1) for child in reversed(tree.children[name]))
+
+    if args.output:
+        tree.write_report(args.output)
+        print(f"✓ Hierarchy written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()